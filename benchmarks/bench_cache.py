@@ -0,0 +1,62 @@
+# Compares parsing a GEDCOM file with loading it from the parse cache
+#
+# To run, type
+#     python bench_cache.py
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import os
+import tempfile
+import time
+import Cache
+from main import load_tree
+
+
+def write_file(path, families):
+    """Writes a GEDCOM file of couples with two children each
+
+    Args:
+        path (string): Where to write the file
+        families (int): How many families to write
+    """
+    with open(path, "w") as file:
+        file.write("0 HEAD\n")
+        for f in range(families):
+            people = [4 * f + k for k in range(4)]
+            for k, person in enumerate(people):
+                file.write("0 @I" + str(person) + "@ INDI\n1 NAME Person" + str(person) + " /Smith/\n")
+                file.write("1 SEX " + ("M" if k % 2 == 0 else "F") + "\n1 BIRT\n2 DATE " +
+                           str(k + 1) + " JAN " + str(1900 + 20 * (k // 2)) + "\n")
+                file.write(("1 FAMS @F" if k < 2 else "1 FAMC @F") + str(f) + "@\n")
+            file.write("0 @F" + str(f) + "@ FAM\n1 HUSB @I" + str(people[0]) + "@\n1 WIFE @I" +
+                       str(people[1]) + "@\n1 MARR\n2 DATE 1 JUN 1920\n")
+            file.write("1 CHIL @I" + str(people[2]) + "@\n1 CHIL @I" + str(people[3]) + "@\n")
+        file.write("0 TRLR\n")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for families in [10000, 50000]:
+            path = os.path.join(directory, "tree.ged")
+            write_file(path, families)
+            cache_dir = os.path.join(directory, "cache")
+
+            timings = []
+            for run in ["parse", "first run", "cached"]:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if run == "parse":
+                        load_tree(path)
+                    else:
+                        Cache.cached(path, load_tree, cache_dir)
+                timings.append(time.perf_counter() - start)
+
+            print("{:>7} individuals  parse {:.3f} s  first run {:.3f} s  cached {:.3f} s  ({:.1f}x faster)".format(
+                4 * families, timings[0], timings[1], timings[2], timings[0] / timings[2]))
+
+
+if __name__ == '__main__':
+    main()
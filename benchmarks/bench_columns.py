@@ -0,0 +1,72 @@
+# Compares the per individual checks looping over Individuals with the same checks run on a
+# columnar IndividualTable. Needs numpy
+#
+# To run, type
+#     python bench_columns.py
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import datetime
+import random
+import time
+from Individual import Individual
+from Columns import build_table
+import Checks
+import Registry
+
+CHECKS = [Checks.dates_before_current_date, Checks.birth_before_death, Checks.age_less_than_150,
+          Checks.list_recent_births, Checks.list_recent_deaths, Checks.living_single, Checks.list_deceased]
+
+
+def make_individuals(count):
+    """Builds individuals with random birthdays, a few of them dead
+
+    Args:
+        count (int): How many individuals to build
+
+    Returns:
+        list: list of Individuals
+    """
+    rng = random.Random(1)
+    first = datetime.date(1850, 1, 1).toordinal()
+    individuals = []
+    for i in range(count):
+        born = datetime.date.fromordinal(first + rng.randrange(60000))
+        lines = ["0 @I" + str(i) + "@ INDI", "1 NAME Person" + str(i) + " /B/", "1 SEX F",
+                 "1 BIRT", "2 DATE " + born.strftime("%d %b %Y").upper()]
+        if rng.random() < 0.3:
+            died = born + datetime.timedelta(days=rng.randrange(40000))
+            lines += ["1 DEAT", "2 DATE " + died.strftime("%d %b %Y").upper()]
+        if rng.random() < 0.5:
+            lines.append("1 FAMS @F" + str(i) + "@")
+        individuals.append(Individual(lines))
+    return individuals
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    for count in [10000, 100000]:
+        individuals = make_individuals(count)
+        start = time.perf_counter()
+        table = build_table(individuals)
+        if table is None:
+            print("numpy is not installed")
+            return
+        print("{} individuals, table built in {:.4f} s".format(count, time.perf_counter() - start))
+
+        inputs = dict((spec.function, spec.inputs) for spec in Registry.CHECKS)
+        for check in CHECKS:
+            args = [individuals] if inputs[check] == Registry.INDIVIDUALS else [individuals, []]
+            looped = timed(check, *args)
+            columns = timed(check, *args, table=table)
+            print("  {:<28} loop {:>8.4f} s  table {:>8.4f} s".format(check.__name__, looped, columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Compares the throughput of Utils.date_ordinal against datetime.strptime
+#
+# To run, type
+#     python bench_dates.py [number of dates]
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import random
+import time
+from datetime import datetime
+from Utils import date_ordinal, MONTHS
+
+
+def make_dates(count, seed=555):
+    """Builds a list of random GEDCOM dates
+
+    Args:
+        count (int): How many dates to make
+        seed (int): Seed for the random number generator so runs are repeatable
+
+    Returns:
+        list: list of strings in the format DD MON YYYY
+    """
+    rng = random.Random(seed)
+    months = list(MONTHS)
+    return [str(rng.randint(1, 28)) + " " + rng.choice(months) + " " + str(rng.randint(1700, 2018))
+            for _ in range(count)]
+
+
+def time_parser(name, parser, dates):
+    """Times one parser over every date and prints its throughput
+
+    Args:
+        name (string): Name to print for the parser
+        parser (function): Function that takes a date string
+        dates (list): Dates to parse
+
+    Returns:
+        float: Seconds taken to parse all the dates
+    """
+    start = time.perf_counter()
+    for d in dates:
+        parser(d)
+    elapsed = time.perf_counter() - start
+    print("{:<14} {:>8.3f} s {:>12,.0f} dates/s".format(name, elapsed, len(dates) / elapsed))
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    dates = make_dates(count)
+
+    # make sure both parsers agree before timing them
+    for d in dates[:10000]:
+        assert date_ordinal(d) == datetime.strptime(d, "%d %b %Y").toordinal(), d
+
+    print("Parsing " + "{:,}".format(count) + " dates")
+    slow = time_parser("strptime", lambda d: datetime.strptime(d, "%d %b %Y").toordinal(), dates)
+    fast = time_parser("date_ordinal", date_ordinal, dates)
+    print("date_ordinal is {:.1f}x faster".format(slow / fast))
+
+
+if __name__ == '__main__':
+    main()
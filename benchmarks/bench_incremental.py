@@ -0,0 +1,120 @@
+# Compares running every check on a GEDCOM file from scratch with incremental runs after one
+# record was edited, both from the stored state like main.py --incremental and by refreshing a
+# run kept in memory
+#
+# To run, type
+#     python bench_incremental.py
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import os
+import tempfile
+import time
+# importing Checks registers every check with the Registry
+import Checks
+import Registry
+from Columns import build_table
+from Incremental import IncrementalRun
+from main import load_tree
+from bench_cache import write_file
+
+
+def full_run(path):
+    """Parses the file and runs every check
+
+    Args:
+        path (string): Path to the GEDCOM file
+    """
+    individuals, families, index = load_tree(path)
+    table = build_table(individuals)
+    for spec, result in Registry.run_checks(Registry.CHECKS, individuals, families, index, 1, table):
+        pass
+
+
+def incremental_run(path, state_dir):
+    """Runs every check using the state of the last run and stores the new state
+
+    Args:
+        path (string): Path to the GEDCOM file
+        state_dir (string): Directory of the incremental state
+
+    Returns:
+        IncrementalRun: The finished run
+    """
+    run = IncrementalRun(path, state_dir)
+    check(run)
+    run.save()
+    return run
+
+
+def refreshed_run(run):
+    """Reads the file again into a run kept in memory and runs every check
+
+    Args:
+        run (IncrementalRun): The run to refresh
+
+    Returns:
+        IncrementalRun: The same run
+    """
+    run.refresh()
+    check(run)
+    return run
+
+
+def check(run):
+    """Runs every check whose result is out of date
+
+    Args:
+        run (IncrementalRun): The run to check
+    """
+    table = build_table(run.individuals)
+    for spec, result in run.run_checks(Registry.CHECKS, table):
+        pass
+
+
+def edit(path, number):
+    """Adds a death to one person of a file from write_file
+
+    Args:
+        path (string): Path to the GEDCOM file
+        number (int): Number of the person
+    """
+    name = "1 NAME Person" + str(number) + " /Smith/\n"
+    with open(path) as file:
+        text = file.read()
+    with open(path, "w") as file:
+        file.write(text.replace(name, name + "1 DEAT Y\n2 DATE 1 JAN 2000\n"))
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for families in [5000, 50000]:
+            path = os.path.join(directory, "tree.ged")
+            state_dir = os.path.join(directory, "state" + str(families))
+            write_file(path, families)
+
+            full, _ = timed(full_run, path)
+            timed(incremental_run, path, state_dir)
+            unchanged, _ = timed(incremental_run, path, state_dir)
+            edit(path, 7)
+            edited, run = timed(incremental_run, path, state_dir)
+            edit(path, 11)
+            refreshed, run = timed(refreshed_run, run)
+
+            print("{:>7} individuals  full {:.2f} s  unchanged {:.2f} s  one edit {:.2f} s  "
+                  "one edit in memory {:.2f} s  ({} records parsed, {} checks rerun)".format(
+                      4 * families, full, unchanged, edited, refreshed, run.changes.reparsed, run.rerun))
+
+
+if __name__ == '__main__':
+    main()
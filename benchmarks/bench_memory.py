@@ -0,0 +1,63 @@
+# Measures how much memory each parsed Individual and Family takes, including their strings
+#
+# To run, type
+#     python bench_memory.py
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import gc
+import tracemalloc
+from Individual import Individual
+from Family import Family
+
+# bytes per record we want to stay under. Before __slots__ and interning these were
+# about 680 bytes per individual and 630 bytes per family
+INDIVIDUAL_TARGET = 500
+FAMILY_TARGET = 450
+
+
+def measure(build, count):
+    """Builds count records and measures the memory they hold on to
+
+    Args:
+        build (function): Makes the i-th record
+        count (int): How many records to build
+
+    Returns:
+        tuple: (records, bytes per record)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return records, used / count
+
+
+def individual(i):
+    return Individual(["0 @I" + str(i) + "@ INDI", "1 NAME Person" + str(i) + " /Smith/", "1 SEX M",
+                       "1 BIRT", "2 DATE 7 JUL 1996", "1 FAMC @F" + str(i // 3) + "@",
+                       "1 FAMS @F" + str(i // 2) + "@"])
+
+
+def family(i):
+    return Family(["0 @F" + str(i) + "@ FAM", "1 HUSB @I" + str(2 * i) + "@", "1 WIFE @I" + str(2 * i + 1) + "@",
+                   "1 MARR", "2 DATE 1 JAN 1990"] + ["1 CHIL @I" + str(3 * i + k) + "@" for k in range(2)])
+
+
+def main():
+    count = 50000
+    # families are measured while the individuals are still around, like after parsing, so
+    # the IDs they link to are already interned
+    individuals, individual_size = measure(individual, count)
+    families, family_size = measure(family, count // 2)
+    for name, size, target in [("Individual", individual_size, INDIVIDUAL_TARGET),
+                               ("Family", family_size, FAMILY_TARGET)]:
+        print("{:<10} {:>6.0f} bytes per record  target {}  {}".format(
+            name, size, target, "ok" if size <= target else "OVER"))
+
+
+if __name__ == '__main__':
+    main()
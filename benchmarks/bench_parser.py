@@ -0,0 +1,45 @@
+# Compares reading GEDCOM records line by line as text with reading them from a memory map,
+# and parsing in one process with parsing in one process per CPU
+#
+# To run, type
+#     python bench_parser.py
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import os
+import tempfile
+import time
+from Parser import iter_records, map_records, parse
+from bench_cache import write_file
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for families in [10000, 50000]:
+            path = os.path.join(directory, "tree.ged")
+            write_file(path, families)
+
+            timings = []
+            for reader in [iter_records, map_records]:
+                start = time.perf_counter()
+                for tag, tokens in reader(path):
+                    pass
+                timings.append(time.perf_counter() - start)
+
+            print("{:>7} individuals  text {:.3f} s  mapped {:.3f} s  ({:.1f}x faster)".format(
+                4 * families, timings[0], timings[1], timings[0] / timings[1]))
+
+            workers = os.cpu_count() or 1
+            timings = []
+            for count in [1, workers]:
+                start = time.perf_counter()
+                parse(path, count)
+                timings.append(time.perf_counter() - start)
+
+            print("{:>7} individuals  parse {:.3f} s  {} workers {:.3f} s  ({:.1f}x faster)".format(
+                4 * families, timings[0], workers, timings[1], timings[0] / timings[1]))
+
+
+if __name__ == '__main__':
+    main()
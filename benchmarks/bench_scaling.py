@@ -0,0 +1,251 @@
+# Measures how parsing, building the shared index and every check scale with the size of the
+# tree, on generated trees of increasing size. For each stage it records the time and the peak
+# memory at every size and fits the exponent k of time ~ size^k, so a check that went quadratic
+# stands out with k close to 2. Results can be saved as JSON and compared against a saved run
+#
+# To run, type
+#     python bench_scaling.py --save results.json
+# in the benchmarks directory, and later
+#     python bench_scaling.py --baseline results.json
+# to fail (exit status 1) if any stage got more than 25% slower at 100k people. Compare runs
+# made on the same machine, timings from different machines are not comparable
+import sys
+sys.path.append("../src")
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+# importing Checks registers every check with the Registry
+import Checks
+import Generator
+import Registry
+from Columns import build_table, numpy
+from EventIndex import EventIndex
+from Index import GenealogyIndex
+from Parser import parse
+
+SIZES = [1000, 3000, 10000, 30000, 100000]
+
+# stages below this many seconds are too short for their exponent or slow downs to mean much
+MIN_SECONDS = 0.01
+
+# a check declared LINEAR or LOG_LINEAR whose fitted exponent is above this has gone quadratic
+MAX_EXPONENT = 1.7
+
+
+def stages(path):
+    """Lists the stages of a run on one file, in the order they run
+
+    Each stage is a (name, cost, function) where function takes what the earlier stages
+    returned so far and returns its own result
+
+    Args:
+        path (string): Path to the GEDCOM file
+
+    Returns:
+        list: The stages
+    """
+    def load(tree):
+        individuals, families = parse(path)
+        individuals.sort(key=lambda x: x.ID)
+        families.sort(key=lambda x: x.ID)
+        tree["individuals"], tree["families"] = individuals, families
+
+    def index(tree):
+        tree["index"] = GenealogyIndex(tree["individuals"], tree["families"])
+
+    def table(tree):
+        tree["table"] = build_table(tree["individuals"])
+
+    def run(spec):
+        def check(tree):
+            # each calendar is sorted by the one check that asks it, so every repeat pays for it like main does
+            events = EventIndex(tree["individuals"], tree["families"]) if spec.takes_events else None
+            return Registry.run_check(spec, tree["individuals"], tree["families"], tree["index"],
+                                      tree["table"], events=events).render()
+        return check
+
+    return [("parse", Registry.LINEAR, load), ("index", Registry.LINEAR, index),
+            ("table", Registry.LINEAR, table)] + \
+        [(spec.story, spec.cost, run(spec)) for spec in Registry.CHECKS]
+
+
+def measure(path, repeat=3):
+    """Times every stage on one file, then runs them again under tracemalloc for their peak memory
+
+    Args:
+        path (string): Path to the GEDCOM file
+        repeat (int): How many times to time each stage, the fastest time is kept
+
+    Returns:
+        dict: (seconds, peak MB) of each stage by name
+    """
+    results = {}
+    tree = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, cost, function in stages(path):
+            best = None
+            for _ in range(repeat):
+                gc.collect()
+                start = time.perf_counter()
+                function(tree)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = [best, None]
+
+        tree = {}
+        for name, cost, function in stages(path):
+            gc.collect()
+            tracemalloc.start()
+            function(tree)
+            results[name][1] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+    return results
+
+
+def fit_exponent(sizes, seconds):
+    """Fits time = c * size^k with least squares on the logs
+
+    Args:
+        sizes (list): Sizes of the trees
+        seconds (list): Time taken at each size
+
+    Returns:
+        float: The exponent k, or None if fewer than two sizes took long enough to measure
+    """
+    points = [(math.log(size), math.log(time)) for size, time in zip(sizes, seconds)
+              if time is not None and time >= MIN_SECONDS / 10]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, y in points) / len(points)
+    mean_y = sum(y for x, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, y in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run(sizes, seed, repeat):
+    """Measures every stage on generated trees of each size
+
+    Args:
+        sizes (list): How many people to generate for each tree
+        seed (int): Seed of the generated trees
+        repeat (int): How many times to time each stage
+
+    Returns:
+        dict: The results, ready to be saved as JSON
+    """
+    costs = dict((name, cost) for name, cost, function in stages(None))
+    report = {
+        "seed": seed,
+        "sizes": sizes,
+        "python": platform.python_version(),
+        "numpy": numpy is not None,
+        "stages": dict((name, {"cost": cost, "seconds": [], "peak_mb": []}) for name, cost in costs.items()),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tree.ged")
+        for size in sizes:
+            Generator.generate(path, size, seed, {"US11": 0.01, "US13": 0.01, "US23": 0.001})
+            for name, (seconds, peak) in measure(path, repeat).items():
+                report["stages"][name]["seconds"].append(seconds)
+                report["stages"][name]["peak_mb"].append(peak)
+            print("measured {} people".format(size), file=sys.stderr)
+
+    for stage in report["stages"].values():
+        stage["exponent"] = fit_exponent(sizes, stage["seconds"])
+    return report
+
+
+def print_report(report):
+    """Prints the time of every stage at each size and its fitted exponent"""
+    sizes = report["sizes"]
+    print("{:<6}".format("stage") + "".join("{:>11}".format(size) for size in sizes) +
+          "{:>10}{:>10}  cost".format("peak MB", "exponent"))
+    for name, stage in report["stages"].items():
+        exponent = stage["exponent"]
+        print("{:<6}".format(name) + "".join("{:>10.4f}s".format(seconds) for seconds in stage["seconds"]) +
+              "{:>10.1f}{:>10}  {}".format(stage["peak_mb"][-1],
+                                           "-" if exponent is None else "{:.2f}".format(exponent), stage["cost"]))
+
+
+def compare(report, baseline, at, threshold):
+    """Finds the stages that got slower than in a saved run
+
+    A stage regressed if its time at the given size grew by more than the threshold (and by
+    at least MIN_SECONDS), or if it is declared LINEAR or LOG_LINEAR but now scales worse
+    than MAX_EXPONENT
+
+    Args:
+        report (dict): Results of this run
+        baseline (dict): Results of the saved run
+        at (int): Size to compare the times at, the largest size both runs share if they
+        did not both measure it
+        threshold (float): Allowed slow down, e.g. 0.25 for 25%
+
+    Returns:
+        list: A message for every regression
+    """
+    shared = [size for size in report["sizes"] if size in baseline["sizes"]]
+    if at not in shared:
+        if len(shared) == 0:
+            return ["the runs have no size in common"]
+        at = max(shared)
+
+    regressions = []
+    for name, stage in report["stages"].items():
+        seconds = stage["seconds"][report["sizes"].index(at)]
+        old = baseline["stages"].get(name)
+        if old is not None:
+            before = old["seconds"][baseline["sizes"].index(at)]
+            if seconds > before * (1 + threshold) and seconds - before >= MIN_SECONDS:
+                regressions.append("{} at {} people: {:.4f} s, was {:.4f} s ({:+.0%})".format(
+                    name, at, seconds, before, seconds / before - 1))
+        exponent = stage["exponent"]
+        if stage["cost"] != Registry.QUADRATIC and exponent is not None and exponent > MAX_EXPONENT \
+                and seconds >= MIN_SECONDS:
+            regressions.append("{} scales as size^{:.2f} but is declared {}".format(name, exponent, stage["cost"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measures how every stage scales with the size of the tree")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="comma separated numbers of people to generate")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the generated trees")
+    parser.add_argument("--repeat", type=int, default=3, help="time each stage this many times and keep the fastest")
+    parser.add_argument("--save", metavar="PATH", help="write the results to PATH as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved with --save")
+    parser.add_argument("--at", type=int, default=100000, help="size to compare the times at")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slow down, 0.25 is 25%%")
+    args = parser.parse_args(argv)
+
+    report = run([int(size) for size in args.sizes.split(",")], args.seed, args.repeat)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.at, args.threshold)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            sys.exit(1)
+        print("No regressions against " + args.baseline)
+
+
+if __name__ == '__main__':
+    main()
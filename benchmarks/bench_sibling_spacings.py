@@ -0,0 +1,59 @@
+# Shows how Checks.sibling_spacings scales with the number of siblings in a family
+#
+# To run, type
+#     python bench_sibling_spacings.py
+# in the benchmarks directory
+import sys
+sys.path.append("../src")
+
+import datetime
+import math
+import time
+from Family import Family
+from Individual import Individual
+import Checks
+
+
+def make_family(kids, days_apart):
+    """Builds one family with evenly spaced children
+
+    Args:
+        kids (int): How many children the family has
+        days_apart (int): Days between each child's birthday
+
+    Returns:
+        tuple: (individuals, families) ready to pass to the checks
+    """
+    first = datetime.date(1000, 1, 1)
+    individuals = []
+    for i in range(kids):
+        born = first + datetime.timedelta(days=i * days_apart)
+        individuals.append(Individual(["0 @I" + str(i) + "@ INDI", "1 NAME Kid" + str(i) + " /B/",
+                                       "1 SEX M", "1 BIRT", "2 DATE " + born.strftime("%d %b %Y").upper(),
+                                       "1 FAMC @F1@"]))
+    lines = ["0 @F1@ FAM", "1 HUSB @D@", "1 WIFE @M@", "1 MARR", "2 DATE 1 JAN 0999"]
+    lines += ["1 CHIL @I" + str(i) + "@" for i in range(len(individuals))]
+    return individuals, [Family(lines)]
+
+
+def main():
+    # 300 days apart is a realistic family, 1 day apart puts every sibling in the same window
+    for days_apart in [300, 1]:
+        print("Siblings born " + str(days_apart) + " day(s) apart")
+        previous = None
+        for kids in [250, 500, 1000, 2000, 4000]:
+            individuals, families = make_family(kids, days_apart)
+            start = time.perf_counter()
+            Checks.sibling_spacings(individuals, families)
+            elapsed = time.perf_counter() - start
+
+            # slope of log(time) against log(kids) between this size and the last
+            exponent = ""
+            if previous is not None:
+                exponent = "{:.2f}".format(math.log(elapsed / previous[1]) / math.log(kids / previous[0]))
+            print("{:>6} kids {:>9.4f} s  exponent {}".format(kids, elapsed, exponent))
+            previous = (kids, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# Compares printing the tables of individuals and families with PrettyTable against the
+# streaming table writer, in time and peak memory
+#
+# To run, type
+#     python bench_table.py
+# in the benchmarks directory (prettytable has to be installed for the comparison)
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import os
+import tempfile
+import time
+import tracemalloc
+from prettytable import PrettyTable
+from main import load_tree
+from Utils import pretty_print, INDIVIDUAL_FIELDS, FAMILY_FIELDS, individual_row, family_row
+from bench_cache import write_file
+
+
+class NullOutput(io.TextIOBase):
+    """Throws away everything written to it, like redirecting the output to /dev/null"""
+
+    def write(self, text):
+        return len(text)
+
+
+def prettytable_print(individuals, families):
+    """How the tables were printed before, building each one fully before printing it
+
+    Args:
+        individuals (list): list of Individual objects
+        families (list): list of Family objects
+    """
+    for field_names, items, row in [(INDIVIDUAL_FIELDS, individuals, individual_row),
+                                    (FAMILY_FIELDS, families, family_row)]:
+        table = PrettyTable()
+        table.field_names = field_names
+        for item in items:
+            table.add_row(row(item))
+        print(table)
+
+
+def measure(function, individuals, families):
+    """Times one way of printing the tables and tracks the most memory it used at once
+
+    Returns:
+        tuple: (seconds, peak MB)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(NullOutput()):
+        function(individuals, families)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for families in [5000, 50000]:
+            path = os.path.join(directory, "tree.ged")
+            write_file(path, families)
+            with contextlib.redirect_stdout(io.StringIO()):
+                individuals, fams, index = load_tree(path)
+
+            old = measure(prettytable_print, individuals, fams)
+            new = measure(pretty_print, individuals, fams)
+            print("{:>7} individuals  PrettyTable {:.2f} s {:.0f} MB  streaming {:.2f} s {:.1f} MB  ({:.1f}x faster)".format(
+                len(individuals), old[0], old[1], new[0], new[1], old[0] / new[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# On disk cache of parsed GEDCOM files, so running the checks on the same file again skips
+# parsing. Entries are pickles, so only point the cache at a directory you trust
+import contextlib
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+
+# bump when the layout of a cache file changes
+CACHE_VERSION = 1
+
+# the cached objects are instances of classes from these modules, so changing any of them
+# invalidates every entry
+SOURCES = ["Cache.py", "Family.py", "Index.py", "Individual.py", "Parser.py", "Utils.py"]
+
+
+def source_fingerprint(sources=SOURCES):
+    """Hashes the source of the modules whose objects end up in the cache
+
+    Args:
+        sources (list): File names of the modules, relative to this one
+
+    Returns:
+        string: hex digest of the sources
+    """
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in sources:
+        with open(os.path.join(here, name), "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """Hashes the content of a file without reading all of it into memory
+
+    Args:
+        path (string): Path to the file
+
+    Returns:
+        string: hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def entry_path(cache_dir, path, suffix=".pickle"):
+    """Finds where the cache entry for a file lives
+
+    Args:
+        cache_dir (string): Directory holding the cache
+        path (string): Path to the GEDCOM file
+        suffix (string): Extension of the entry, so different kinds of entries can share a directory
+
+    Returns:
+        string: Path of the entry, one per GEDCOM file
+    """
+    name = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, name + suffix)
+
+
+def load_payload(file):
+    """Unpickles the body of a cache entry
+
+    Unpickling creates millions of objects that hold no reference cycles, so the cyclic
+    garbage collector is paused while it runs instead of scanning them over and over
+
+    Args:
+        file (file): Cache entry positioned after its header
+
+    Returns:
+        tuple: (printed output, payload)
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.load(file)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def cached(path, build, cache_dir):
+    """Loads what build(path) returned for this file last time, or builds and stores it
+
+    An entry is used if the cache version and module sources match and the file has the same
+    size and either the same modification time or the same content hash. Anything build
+    prints is stored with the entry and printed again when the entry is loaded, so parse
+    errors still show up
+
+    Args:
+        path (string): Path to the GEDCOM file
+        build (function): Takes the path and returns the objects to cache
+        cache_dir (string): Directory holding the cache, created if needed
+
+    Returns:
+        object: What build returned, either now or on an earlier run
+    """
+    stat = os.stat(path)
+    key = (CACHE_VERSION, source_fingerprint())
+    entry = entry_path(cache_dir, path)
+
+    try:
+        with open(entry, "rb") as file:
+            # the header is a separate pickle so a stale entry is rejected without loading the rest
+            header = pickle.load(file)
+            if header["key"] == key and header["size"] == stat.st_size and \
+                    (header["mtime"] == stat.st_mtime_ns or header["digest"] == file_digest(path)):
+                output, payload = load_payload(file)
+                sys.stdout.write(output)
+                return payload
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError):
+        # missing, unreadable or outdated entries are rebuilt
+        pass
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            payload = build(path)
+    finally:
+        sys.stdout.write(output.getvalue())
+
+    header = {"key": key, "size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": file_digest(path)}
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first so a crash never leaves half an entry behind
+        temporary = entry + "." + str(os.getpid()) + ".tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(header, file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump((output.getvalue(), payload), file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, entry)
+    except OSError as e:
+        print("Could not write parse cache: " + str(e), file=sys.stderr)
+
+    return payload
@@ -1,10 +1,94 @@
 # This file stores all the various checks for Errors and Anomalies
-from collections import Counter
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from datetime import date
 from dateutil.relativedelta import relativedelta
-from Utils import calculate_age_at_spec_date, get_children, get_siblings, get_spouses
+from EventIndex import EventIndex
+from Index import GenealogyIndex
+from Registry import check, BOTH, FAMILIES, INDIVIDUALS, LOG_LINEAR
+from Results import CheckResult, Finding, Group, ERROR, INFO, NOTE
+from Utils import today_ordinal, years_between
 
 
+def _get_index(individuals, families, index):
+    """Returns the shared index or builds one for callers that did not pass it in
+
+    Args:
+        individuals (list): List of Individual objects
+        families (list): List of Family objects
+        index (GenealogyIndex): Prebuilt index or None
+
+    Returns:
+        GenealogyIndex: An index over individuals and families
+    """
+    if index is None:
+        index = GenealogyIndex(individuals, families)
+    return index
+
+
+def _get_table(individuals, table):
+    """Returns the columnar table if it can stand in for looping over individuals
+
+    Args:
+        individuals (list): List of Individual objects the check was called with
+        table (IndividualTable): Prebuilt table or None
+
+    Returns:
+        IndividualTable: The table or None if the check should loop over individuals instead
+    """
+    if table is not None and table.covers(individuals):
+        return table
+    return None
+
+
+def _get_events(individuals, families, events):
+    """Returns the shared event calendars or builds them for callers that did not pass them in
+
+    Args:
+        individuals (list): List of Individual objects the check was called with
+        families (list): List of Family objects the check was called with, None if it was only
+        called with individuals
+        events (EventIndex): Prebuilt index or None
+
+    Returns:
+        EventIndex: An index over the events of individuals and families
+    """
+    if events is None or not events.covers(individuals, families):
+        events = EventIndex(individuals, [] if families is None else families)
+    return events
+
+
+def _get_as_of(as_of):
+    """Returns the day the date relative checks are measured at
+
+    Args:
+        as_of (int): Day ordinal of the as-of date or None
+
+    Returns:
+        int: as_of, or today's day ordinal for callers that did not pass it in
+    """
+    if as_of is None:
+        as_of = today_ordinal()
+    return as_of
+
+
+@check("US27", "Print Age", INDIVIDUALS,
+       reads=())
+def print_age(individuals):
+    """US 27: Print age
+
+    Args:
+        individuals (list): A list of individuals
+
+    Returns:
+        CheckResult: Unpacks to (bool, output). Bool is always True. Output is the first individual,
+        whose printout includes their age, or an empty string if there are no individuals
+    """
+    findings = [Finding("US27", INFO, "{0}\n", indi) for indi in individuals[:1]]
+    return CheckResult("US27", findings, ok=True)
+
+
+@check("US22", "Unique IDs", BOTH,
+       reads=())
 def unique_IDs(individuals, families):
     """US 22
     Checks to make sure all individual IDs are unique and all
@@ -15,43 +99,38 @@ def unique_IDs(individuals, families):
         families (list): List of Family objects
 
     Returns:
-        tuple: Tuple in the form (result, output). If all IDs are unique, this returns
+        CheckResult: Unpacks to (result, output). If all IDs are unique, this returns
         (True, "All IDs are unique"). If the IDs are not all unique, this returns
         (False, <a string to output that lists errors>)
     """
 
-    # pull the IDs from the individuals and families
-    indi_IDs = [indi.ID for indi in individuals]
-    fam_IDs = [fam.ID for fam in families]
+    # group the individuals and families by ID
+    indis_by_ID = {}
+    for indi in individuals:
+        indis_by_ID.setdefault(indi.ID, []).append(indi)
+    fams_by_ID = {}
+    for fam in families:
+        fams_by_ID.setdefault(fam.ID, []).append(fam)
 
     # get a list of the duplicate IDs
-    duplicate_indi_IDs = [ID for ID, count in Counter(
-        indi_IDs).items() if count > 1]
-    duplicate_fam_IDs = [ID for ID, count in Counter(
-        fam_IDs).items() if count > 1]
+    duplicate_indi_IDs = [ID for ID, indis in indis_by_ID.items() if len(indis) > 1]
+    duplicate_fam_IDs = [ID for ID, fams in fams_by_ID.items() if len(fams) > 1]
 
     # if both duplicate lists are empty then everything is unique
-    if len(duplicate_indi_IDs) == 0 and len(duplicate_fam_IDs) == 0:
-        return (True, "All IDs are unique")
-    else:
-        output = ""
+    findings = []
+    for ID in duplicate_indi_IDs:
+        for indi in indis_by_ID[ID]:
+            findings.append(Finding("US22", ERROR, "Error: {0} has a non-unique ID\n", indi))
 
-        # generate error messages
-        for ID in duplicate_indi_IDs:
-            duplicated_indis = [indi for indi in individuals if indi.ID == ID]
+    for ID in duplicate_fam_IDs:
+        for fam in fams_by_ID[ID]:
+            findings.append(Finding("US22", ERROR, "Error: {0} has a non-unique ID\n", fam))
 
-            for indi in duplicated_indis:
-                output += "Error: " + str(indi) + " has a non-unique ID\n"
-
-        for ID in duplicate_fam_IDs:
-            duplicated_fams = [fam for fam in families if fam.ID == ID]
-
-            for fam in duplicated_fams:
-                output += "Error: " + str(fam) + " has a non-unique ID\n"
-
-        return (False, output)
+    return CheckResult("US22", findings, "All IDs are unique")
 
 
+@check("US04", "Marriage Before Divorce", FAMILIES,
+       reads=("family.married", "family.divorced"))
 def marriage_before_divorce(families):
     """US 04
     Checks to make sure that a marriage occurs before a divorce
@@ -60,71 +139,65 @@ def marriage_before_divorce(families):
         families (list): List of Family objects
 
     Returns:
-        tuple: Tuple in the form (result, output). If all divorces exist after a marriage,
+        CheckResult: Unpacks to (result, output). If all divorces exist after a marriage,
         this returns (True, "All families are married before they are divorced\n"). If the divorces
         are not all preceeded by a marriage, this returns (False, <a string to output that lists errors>).
     """
-    flag = True
-    output = ""
+    findings = []
     for family in families:
-        if family.divorced is not None:
-            married_date = datetime.strptime(family.married, '%d %b %Y')
-            divorced_date = datetime.strptime(family.divorced, '%d %b %Y')
-            if married_date > divorced_date:
-                flag = False
-                output += "Error: " + str(family) + \
-                    " has a divorce before a marriage\n"
-    if flag:
-        output += "All families are married before they are divorced\n"
-    return (flag, output)
+        if family.divorced_ordinal is not None:
+            if family.married_ordinal > family.divorced_ordinal:
+                findings.append(Finding("US04", ERROR, "Error: {0} has a divorce before a marriage\n", family))
+    return CheckResult("US04", findings, "All families are married before they are divorced\n")
 
 
-def dates_before_current_date(individuals, families):
+@check("US01", "Dates Before Current Date", BOTH,
+       reads=("today", "individual.birthday", "individual.death", "family.married", "family.divorced"))
+def dates_before_current_date(individuals, families, table=None, as_of=None):
     """
     US01
     Checks all dates are before the current date
     Args:
         individuals (list): List of Individual objects
         families (list): List of Family objects
+        table (IndividualTable): Columns over individuals to check them all at once, optional
+        as_of (int): Day ordinal to use as the current date, today if not given
 
     Returns:
-        tuple: Tuple in the form (result, output). If all dates are before current date, this returns
+        CheckResult: Unpacks to (result, output). If all dates are before current date, this returns
         (True, "All dates are after current date."). If the dates are not all before current date, this returns
         (False, <a string to output that lists errors>)
     """
-    flag = True
-    output = ""
-    curr = datetime.now()
-    for individual in individuals:
-        birth_date = datetime.strptime(individual.birthday, '%d %b %Y')
-        if birth_date > curr:
-            flag = False
-            output += "Error: " + str(individual) + \
-                " has a birth after current date.\n"
-        if individual.death is not None:
-            death_date = datetime.strptime(individual.death, '%d %b %Y')
-            if death_date > curr:
-                flag = False
-                output += "Error: " + \
-                    str(individual) + " has a death after current date.\n"
+    findings = []
+    curr = _get_as_of(as_of)
+    table = _get_table(individuals, table)
+    if table is not None and table.all_births:
+        late_births = table.birth > curr
+        late_deaths = table.has_death_date & (table.death > curr)
+        either = late_births | late_deaths
+        late = zip(table.select(either), late_births[either], late_deaths[either])
+    else:
+        late = ((individual, individual.birth_ordinal > curr,
+                 individual.death_ordinal is not None and individual.death_ordinal > curr)
+                for individual in individuals)
+    for individual, late_birth, late_death in late:
+        if late_birth:
+            findings.append(Finding("US01", ERROR, "Error: {0} has a birth after current date.\n", individual))
+        if late_death:
+            findings.append(Finding("US01", ERROR, "Error: {0} has a death after current date.\n", individual))
     for family in families:
-        married_date = datetime.strptime(family.married, '%d %b %Y')
-        if married_date > curr:
-            flag = False
-            output += "Error: " + str(family) + \
-                " has a marriage after current date.\n"
-        if family.divorced is not None:
-            divorced_date = datetime.strptime(family.divorced, '%d %b %Y')
-            if divorced_date > curr:
-                flag = False
-                output += "Error: " + str(family) + \
-                    " has a divorce after current date.\n"
-    if flag:
-        output += "All dates are after current date."
-    return (flag, output)
-
-
-def birth_before_parents_death(individuals, families):
+        if family.married_ordinal > curr:
+            findings.append(Finding("US01", ERROR, "Error: {0} has a marriage after current date.\n", family))
+        if family.divorced_ordinal is not None:
+            if family.divorced_ordinal > curr:
+                findings.append(Finding("US01", ERROR, "Error: {0} has a divorce after current date.\n", family))
+    return CheckResult("US01", findings, "All dates are after current date.")
+
+
+@check("US09", "Birth Before the Death of Parents", BOTH,
+       reads=("individual.birthday", "individual.death", "family.husband_ID", "family.wife_ID",
+              "family.children"))
+def birth_before_parents_death(individuals, families, index=None):
     """
     US09
     Checks to make sure that a child's birth occurs before the parents' deaths
@@ -132,212 +205,259 @@ def birth_before_parents_death(individuals, families):
     Args:
         individuals (list): List of Individual objects
         families (list): List of Family objects
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple in the form (result, output). If all births occur before parents' deaths, this returns
+        CheckResult: Unpacks to (result, output). If all births occur before parents' deaths, this returns
         (True, "All children are born before the death of the mother or within nine months of the death of the father.")
         If the children are born after the death of the mother or more than nine months after the death of the father,
         this returns (False, <a string to output that lists errors>).
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
         mom_death = None
         dad_death = None
         children = {}
-        for individual in individuals:
-            if individual.ID == family.wife_ID:
-                if individual.death is not None:
-                    mom_death = datetime.strptime(individual.death, '%d %b %Y')
-            elif individual.ID == family.husband_ID:
-                if individual.death is not None:
-                    dad_death = datetime.strptime(individual.death, '%d %b %Y')
-            else:
-                if individual.ID in family.children:
-                    children[individual.ID] = individual
+        mom = index.wife(family)
+        dad = index.husband(family)
+        if mom is not None and mom.death_ordinal is not None:
+            mom_death = mom.death_ordinal
+        if dad is not None and dad.death_ordinal is not None and dad.ID != family.wife_ID:
+            # fathers get nine months of leeway after their death
+            dad_death = (date.fromordinal(dad.death_ordinal) +
+                         relativedelta(months=9)).toordinal()
+        for individual in index.children_by_family[family]:
+            if individual.ID != family.wife_ID and individual.ID != family.husband_ID:
+                children[individual.ID] = individual
         for c in children:
             child = children[c]
-            child_birthday = datetime.strptime(child.birthday, '%d %b %Y')
+            child_birthday = child.birth_ordinal
             if mom_death is not None and child_birthday > mom_death:
-                flag = False
-                output += "Error: " + \
-                    str(family) + " has a child " + str(child.ID) + \
-                    " born after the mother's death.\n"
-            if dad_death is not None and child_birthday > (dad_death + relativedelta(months=9)):
-                flag = False
-                output += "Error: " + str(family) + " has a child " + str(
-                    child.ID) + " born more than 9 months after the father's death.\n"
-    if flag:
-        output += "All children are born before the death of the mother or within nine months of the death of the father."
-    return (flag, output)
-
-
-def unique_first_names(individuals, families):
+                findings.append(Finding("US09", ERROR, "Error: {0} has a child {1.ID} born after the mother's death.\n",
+                                        family, child))
+            if dad_death is not None and child_birthday > dad_death:
+                findings.append(Finding("US09", ERROR,
+                                        "Error: {0} has a child {1.ID} born more than 9 months after the father's death.\n",
+                                        family, child))
+    return CheckResult("US09", findings, "All children are born before the death of the mother or within nine months of the death of the father.")
+
+
+@check("US25", "Unique First Names in Families", BOTH,
+       reads=("individual.name", "individual.birthday", "family.children"))
+def unique_first_names(individuals, families, index=None):
     """
     US25
     Checks that no more than one child with the same name and birth date should appear in a family
     Args:
         individuals (list): List of Individual objects
         families (list): List of Family objects
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple in the form (result, output). If all first names in families are unique, this returns
+        CheckResult: Unpacks to (result, output). If all first names in families are unique, this returns
         (True, "All first names are unique"). If the first names are not all unique, this returns
         (False, <a string to output that lists errors>)
     """
+    index = _get_index(individuals, families, index)
     flag = True
-    output = ""
+    findings = []
     for family in families:
-        if family.children == []:
+        if len(family.children) == 0:
             continue
         else:
             children = {}
             for child in family.children:
-                for individual in individuals:
-                    if individual.ID == child:
-                        if individual.name in children and children[individual.name][0] == individual.birthday:
-                            flag = False
-                            children[individual.name][1] += [str(individual)]
-                        else:
-                            children[individual.name] = [
-                                individual.birthday, [str(individual)]]
-                    else:
-                        continue
+                individual = index.individuals_by_ID.get(child)
+                if individual is None:
+                    continue
+                if individual.name in children and children[individual.name][0] == individual.birthday:
+                    flag = False
+                    children[individual.name][1] += [individual]
+                else:
+                    children[individual.name] = [
+                        individual.birthday, [individual]]
             for key in children.keys():
                 if len(children[key][1]) > 1:
-                    output += "Error: " + str(family) + " has children, ".join(
-                        children[key][1]) + ", with the same first name and birthday.\n"
-    if flag:
-        output += "All children in the all families do not have the same names and birth dates.\n"
-    return (flag, output)
+                    findings.append(Finding("US25", ERROR, "Error: {0}{1}, with the same first name and birthday.\n",
+                                            family, Group(children[key][1], " has children, ")))
+    # a repeat can be overwritten by a later child with the same name, so the flag is tracked separately
+    return CheckResult("US25", findings, "All children in the all families do not have the same names and birth dates.\n", flag)
 
 
-def age_less_than_150(individuals):
+@check("US07", "Less than 150 years old", INDIVIDUALS,
+       reads=("individual.alive", "individual.age"))
+def age_less_than_150(individuals, table=None):
     """US 07
     Checks to make sure that an individual is less than 150 years old
 
     Args:
         individuals (list): List of Individual objects
+        table (IndividualTable): Columns over individuals to check them all at once, optional
 
     Returns:
-        tuple: Tuple in the form (result, output). If all individuals are less than 150 years old,
+        CheckResult: Unpacks to (result, output). If all individuals are less than 150 years old,
         this returns (True, "All individuals are less than 150 years old\n"). If there are individuals
         over the age of 150, this returns (False, <a string to output that lists errors>).
     """
-    flag = True
-    output = ""
-    for individual in individuals:
-        if individual.alive:
-            # birth_date = datetime.strptime(individual.birthday, '%d %b %Y')
-            # age = curr_date - birth_date
-            if individual.age > 150:
-                flag = False
-                output += "Error: " + \
-                    str(individual.ID) + " is more than 150 years old.\n"
-    if flag:
-        output += "All individuals are less than 150 years old.\n"
-    return (flag, output)
+    table = _get_table(individuals, table)
+    if table is not None and table.all_ages:
+        too_old = table.select(table.alive & (table.age > 150))
+    else:
+        too_old = (individual for individual in individuals if individual.alive and individual.age > 150)
+    findings = [Finding("US07", ERROR, "Error: {0.ID} is more than 150 years old.\n", individual)
+                for individual in too_old]
+    return CheckResult("US07", findings, "All individuals are less than 150 years old.\n")
 
 
-def no_bigamy(individuals, families):
+@check("US11", "No bigamy", BOTH, LOG_LINEAR,
+       reads=("individual.alive", "individual.death", "family.husband_ID", "family.wife_ID",
+              "family.married", "family.divorced"))
+def no_bigamy(individuals, families, index=None):
     """
     US11
     Checks that each individual is only married to one partner at a time
     Args:
         individuals (list): List of Individual objects
         families (list): List of Family objects
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple in the form (result, output). If all individuals are married to one person at a time, this returns
+        CheckResult: Unpacks to (result, output). If all individuals are married to one person at a time, this returns
         (True, "No one is practicing polygamy"). If all individuals are not married to one person at a time, this returns
         (False, <a string to output that lists errors>)
     """
-    flag = True
-    output = ""
-    # Go through the familes
-    for f in families:
-        wife = next(x for x in individuals if x.ID == f.wife_ID)
-        husband = next(x for x in individuals if x.ID == f.husband_ID)
-        fMar = datetime.strptime(f.married, '%d %b %Y')
-        # Compare families
-        for f2 in families:
-            # Dont compare to itself
-            if(f == f2):
-                continue
-            f2Mar = datetime.strptime(f2.married, '%d %b %Y')
-            # Make sure second marriage happend after original
-            if(f2Mar > fMar):
-                if(wife.ID == f2.wife_ID):
-                    innerFlag, out = no_bigamy_spouse_checker(
-                        wife, husband, f, f2)
-                    flag = innerFlag and flag
-                    output += out
-                if(husband.ID == f2.husband_ID):
-                    innerFlag, out = no_bigamy_spouse_checker(
-                        husband, wife, f, f2)
-                    flag = innerFlag and flag
-                    output += out
-    if flag:
-        output += "No one is practicing polygamy\n"
-    return (flag, output)
+    index = _get_index(individuals, families, index)
+
+    # build a marriage timeline for every wife and every husband. Each marriage is stored as
+    # (marriage date, family position, person, end of marriage)
+    timelines = {}
+    for position, f in enumerate(families):
+        wife = index.wife(f)
+        husband = index.husband(f)
+        if wife is None or husband is None or f.married_ordinal is None:
+            continue
+        timelines.setdefault(("wife", f.wife_ID), []).append(
+            (f.married_ordinal, position, wife, marriage_end(f, husband)))
+        timelines.setdefault(("husband", f.husband_ID), []).append(
+            (f.married_ordinal, position, husband, marriage_end(f, wife)))
+
+    # sweep each timeline in date order. Every later marriage that starts before an earlier
+    # one ends is an overlap
+    overlaps = []
+    for (role, ID), marriages in timelines.items():
+        marriages.sort(key=lambda marriage: marriage[0])
+        dates = [marriage[0] for marriage in marriages]
+        for married, position, person, end in marriages:
+            first = bisect_right(dates, married)
+            last = bisect_left(dates, end, first)
+            for later in marriages[first:last]:
+                overlaps.append((position, later[1], role == "husband", person))
+
+    # report in family order with the wife before the husband for each pair of families
+    overlaps.sort(key=lambda overlap: overlap[:3])
+    findings = [Finding("US11", ERROR, "Error: {0} is/was married to multiple people at the same time\n", overlap[3])
+                for overlap in overlaps]
+    return CheckResult("US11", findings, "No one is practicing polygamy\n")
+
+
+def marriage_end(f, spouse):
+    """Helper for no_bigamy
+        Finds the day a marriage stops counting towards bigamy, which is the later of the
+        divorce and the spouse's death
 
+    Args:
+        f (Family): The family of the marriage
+        spouse (Individual): The spouse whose death ends the marriage
 
-def no_bigamy_spouse_checker(checked, spouse, f, f2):
-    flag = True
-    output = ""
-    fMar = datetime.strptime(f.married, '%d %b %Y')
-    f2Mar = datetime.strptime(f2.married, '%d %b %Y')
-    if (spouse.alive and f.divorced is None) or (f.divorced is not None and f2Mar < datetime.strptime(f.divorced, '%d %b %Y')) or ((spouse.death is not None and f2Mar < datetime.strptime(spouse.death, '%d %b %Y'))):
-        flag = False
-        output += "Error: " + \
-            str(checked) + " is/was married to multiple people at the same time\n"
-    return (flag, output)
+    Returns:
+        float: Day ordinal the marriage ends on, inf if it never ended or -inf if it ended on an unknown date
+    """
+    if spouse.alive and f.divorced is None:
+        return float("inf")
+    ends = [end for end in (f.divorced_ordinal, spouse.death_ordinal) if end is not None]
+    if len(ends) == 0:
+        return float("-inf")
+    return max(ends)
 
 
-def sibling_spacings(individuals, families):
+@check("US13", "Sibling spacings", BOTH, LOG_LINEAR,
+       reads=("individual.birthday", "family.children"))
+def sibling_spacings(individuals, families, index=None):
     """
     US13
     Checks that all siblings are born more than 8 months or less than 2 days apart
     Args:
         individuals (list): List of Individual objects
         families (list): List of Family objects
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple in the form (result, output). If all siblings are born more than 8 months or less than 2 days apart, this returns
+        CheckResult: Unpacks to (result, output). If all siblings are born more than 8 months or less than 2 days apart, this returns
         (True, "All siblings are born more than 8 months or less than 2 days apart"). If all siblings are born less than 8 months or more than 2 days apart, this returns
         (False, <a string to output that lists errors>)
     """
-    flag = True
-    output = ""
-    fam_children = [fam.children for fam in families]
-    checked = []
-    for kids in fam_children:
-        if(len(kids) < 2):
+    index = _get_index(individuals, families, index)
+    findings = []
+    checked = set()
+    for fam in families:
+        if(len(fam.children) < 2):
             continue
-        kid_indis = [kid for kid in individuals if kid.ID in kids]
-        for k in kid_indis:
-            k1_bday = datetime.strptime(k.birthday, '%d %b %Y')
-            for k2 in kid_indis:
-                k2_bday = datetime.strptime(k2.birthday, '%d %b %Y')
-                if(k == k2):
-                    continue
-                elif (k, k2) in checked or (k2, k) in checked:
-                    continue
-                bday_diff_months = abs(
-                    k1_bday.year - k2_bday.year) * 12 + k1_bday.month - k2_bday.month
-                bday_diff_days = abs(k1_bday - k2_bday)
-                if(bday_diff_days.days > 1 and bday_diff_months < 8):
-                    checked.append((k, k2))
-                    flag = False
-                    # Diff in days: " + str(bday_diff_days) + "\n" + "Diff in months: " + str(bday_diff_months) + "\n"
-                    output += "Error: " + \
-                        str(k) + " and " + str(k2) + \
-                        " are less than 8 months and more than 2 days apart.\n"
-    if(flag):
-        output += "All siblings are born more than 8 months or less than 2 days apart\n"
-    return (flag, output)
 
+        # (position in the family, kid, birthday) sorted by birthday
+        kids = [(position, kid, date.fromordinal(kid.birth_ordinal))
+                for position, kid in enumerate(index.children_by_family[fam])
+                if kid.birth_ordinal is not None]
+        kids.sort(key=lambda kid: kid[2])
+
+        too_close = []
+        for i in range(len(kids)):
+            # months are counted as abs(year difference) * 12 + month difference, so siblings
+            # born two or more calendar years apart can never be too close. Only scan the
+            # window of siblings born in the same or the next year
+            j = i + 1
+            while j < len(kids) and kids[j][2].year - kids[i][2].year <= 1:
+                pair = sibling_spacing_error(kids[i], kids[j])
+                if pair is not None:
+                    too_close.append(pair)
+                j += 1
+
+        # report the pairs in the order the all pairs loop over the family would find them
+        too_close.sort(key=lambda pair: (pair[0][0], pair[1][0]))
+        for (_, k, _), (_, k2, _) in too_close:
+            if (k, k2) in checked or (k2, k) in checked:
+                continue
+            checked.add((k, k2))
+            findings.append(Finding("US13", ERROR, "Error: {0} and {1} are less than 8 months and more than 2 days apart.\n",
+                                    k, k2))
+    return CheckResult("US13", findings, "All siblings are born more than 8 months or less than 2 days apart\n")
+
+
+def sibling_spacing_error(first, second):
+    """Helper for sibling_spacings
+        Checks if two siblings are born less than 8 months and more than 2 days apart
+
+    Args:
+        first (tuple): (position in family, Individual, birthday date) of one sibling
+        second (tuple): (position in family, Individual, birthday date) of the other sibling
+
+    Returns:
+        tuple: (first, second) ordered the way the error is reported or None if the spacing is fine
+    """
+    if abs(first[2] - second[2]).days <= 1:
+        return None
 
+    # the month difference isn't symmetric, the sibling earlier in the family is checked first
+    if first[0] > second[0]:
+        first, second = second, first
+    for k1, k2 in [(first, second), (second, first)]:
+        if abs(k1[2].year - k2[2].year) * 12 + k1[2].month - k2[2].month < 8:
+            return (k1, k2)
+    return None
+
+
+@check("US15", "Fewer than 15 siblings", FAMILIES,
+       reads=("family.children",))
 def fewer_than_15_siblings(families):
     """US 15: Fewer than 15 siblings
 
@@ -345,48 +465,44 @@ def fewer_than_15_siblings(families):
         families (list): A list of family objects
 
     Returns:
-        tuple: Tuple in the form (result, output). If all families have less than 15 siblings, output is
+        CheckResult: Unpacks to (result, output). If all families have less than 15 siblings, output is
         All families have less than 15 siblings. Else, output contains the families that have too many
         sibling
     """
-    flag = True
-    output = ""
+    findings = []
 
     for fam in families:
         if len(fam.children) >= 15:
-            flag = False
-            output += "Error: family " + \
-                str(fam) + " has 15 or more siblings\n"
+            findings.append(Finding("US15", ERROR, "Error: family {0} has 15 or more siblings\n", fam))
 
-    if flag:
-        output += "All families have less than 15 siblings\n"
-
-    return (flag, output)
+    return CheckResult("US15", findings, "All families have less than 15 siblings\n")
 
 
-def list_deceased(individuals):
+@check("US29", "List deceased", INDIVIDUALS,
+       reads=("individual.death",))
+def list_deceased(individuals, table=None):
     """US 29: List deceased. Doesnt return anything, just prints things
 
     Args:
         individuals (list): A list of individuals from the file
+        table (IndividualTable): Columns over individuals to check them all at once, optional
 
     Returns:
-        string: The deceased individuals as strings
+        CheckResult: Unpacks to (bool, output). Output is the deceased individuals as strings
     """
-    flag = True
-    output = ""
-    for indi in individuals:
-        if indi.death is not None:
-            flag = False
-            output += str(indi) + "\n"
-
-    if flag:
-        output = "No deceased individuals\n"
+    table = _get_table(individuals, table)
+    if table is not None:
+        deceased = table.select(table.has_death)
+    else:
+        deceased = (indi for indi in individuals if indi.death is not None)
+    findings = [Finding("US29", INFO, "{0}\n", indi) for indi in deceased]
 
-    return (flag, output)
+    return CheckResult("US29", findings, "No deceased individuals\n")
 
 
-def marriage_after_14(individuals, families):
+@check("US10", "Marriage after 14", BOTH,
+       reads=("individual.birthday", "family.husband_ID", "family.wife_ID", "family.married"))
+def marriage_after_14(individuals, families, index=None):
     """
     US10
     Checks to make sure that marriage occurs at least 14 years after birth of both spouses
@@ -396,31 +512,30 @@ def marriage_after_14(individuals, families):
     Args:
         individuals (list): List of Individual objects
         families (list): List of Family objects
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple in the form (result, output). If all marriages occur after the age of 14, this returns
+        CheckResult: Unpacks to (result, output). If all marriages occur after the age of 14, this returns
         (True, ""All individuals were married above the age of 14.") If individuals are less than 14 when a
         marriage occurs, this returns (False, <a string to output that lists errors>).
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
-        wedding_date = datetime.strptime(family.married, '%d %b %Y')
-        for individual in individuals:
-            birth_date = datetime.strptime(individual.birthday, '%d %b %Y')
-            if individual.ID == family.wife_ID or individual.ID == family.husband_ID:
-                wedding_age = wedding_date - birth_date
-                if wedding_age.days < (14 * 365):
-                    flag = False
-                    output += "Error: " + str(family.ID) + " is not a valid wedding. " + str(
-                        individual.ID) + " was not above the age of 14.\n"
-    if flag:
-        output += "All individuals were married above the age of 14.\n"
+        wedding_date = family.married_ordinal
+        for individual in index.spouses_by_family[family]:
+            wedding_age = wedding_date - individual.birth_ordinal
+            if wedding_age < (14 * 365):
+                findings.append(Finding("US10", ERROR,
+                                        "Error: {0.ID} is not a valid wedding. {1.ID} was not above the age of 14.\n",
+                                        family, individual))
 
-    return (flag, output)
+    return CheckResult("US10", findings, "All individuals were married above the age of 14.\n")
 
 
-def birth_before_death(individuals, families):
+@check("US03", "Birth before Death", BOTH,
+       reads=("individual.birthday", "individual.death"))
+def birth_before_death(individuals, families, table=None):
     """
     US03
     Checks to make sure birth of an individual is before their death
@@ -428,28 +543,27 @@ def birth_before_death(individuals, families):
     Args:
     individuals (list): List of Individual objects
     families (list): List of Family objects
+    table (IndividualTable): Columns over individuals to check them all at once, optional
 
     Returns:
-    tuple: Tuple in the form (result, output). If all births are before deaths, this returns
+    CheckResult: Unpacks to (result, output). If all births are before deaths, this returns
     (True, ""All individuals were born before their death.") If individuals have a death before
     their birthday, this returns (False, <a string to output that lists errors>).
     """
-    flag = True
-    output = ""
-    for individual in individuals:
-        if individual.death is not None:
-            death = datetime.strptime(individual.death, '%d %b %Y')
-            birth = datetime.strptime(individual.birthday, '%d %b %Y')
-            if death < birth:
-                flag = False
-                output += "Error: " + \
-                    str(individual) + " has a death date before their birthday.\n"
-    if flag:
-        output += "All individuals have death dates after birthdays.\n"
-    return (flag, output)
+    table = _get_table(individuals, table)
+    if table is not None and table.all_births:
+        early = table.select(table.has_death_date & (table.death < table.birth))
+    else:
+        early = (individual for individual in individuals
+                 if individual.death_ordinal is not None and individual.death_ordinal < individual.birth_ordinal)
+    findings = [Finding("US03", ERROR, "Error: {0} has a death date before their birthday.\n", individual)
+                for individual in early]
+    return CheckResult("US03", findings, "All individuals have death dates after birthdays.\n")
 
 
-def birth_before_marriage(individuals, families):
+@check("US02", "Birth before Marriage", BOTH,
+       reads=("individual.birthday", "family.husband_ID", "family.wife_ID", "family.married"))
+def birth_before_marriage(individuals, families, index=None):
     """
     US02
     Checks to make sure birth of an individual is before their marriage
@@ -457,223 +571,220 @@ def birth_before_marriage(individuals, families):
     Args:
     individuals (list): List of Individual objects
     families (list): List of Family objects
+    index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-    tuple: Tuple in the form (result, output). If all births are before marriage, this returns
+    CheckResult: Unpacks to (result, output). If all births are before marriage, this returns
     (True, ""All individuals were born before their marriage.") If individuals have a marriage before
     their birthday, this returns (False, <a string to output that lists errors>).
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
-        wedding_date = datetime.strptime(family.married, '%d %b %Y')
-        for individual in individuals:
-            birth_date = datetime.strptime(individual.birthday, '%d %b %Y')
-            if individual.ID == family.wife_ID or individual.ID == family.husband_ID:
-                if birth_date > wedding_date:
-                    flag = False
-                    output += "Error: " + \
-                        str(individual) + " has a marriage before their birth.\n"
-    if flag:
-        output += "All individuals have a birthday before their marriage date.\n"
-    return (flag, output)
+        wedding_date = family.married_ordinal
+        for individual in index.spouses_by_family[family]:
+            if individual.birth_ordinal > wedding_date:
+                findings.append(Finding("US02", ERROR, "Error: {0} has a marriage before their birth.\n", individual))
+    return CheckResult("US02", findings, "All individuals have a birthday before their marriage date.\n")
 
 
+@check("US24", "Unique family by spouses", FAMILIES,
+       reads=("family.husband_name", "family.wife_name", "family.married"))
 def unique_family_by_spouses(families):
     """
     US24
     Checks that All families have unique wife name, husband name, and marriage date
-        tuple: Tuple in the form (result, output). If All families have unique wife name, husband name, and marriage date, this returns
+        CheckResult: Unpacks to (result, output). If All families have unique wife name, husband name, and marriage date, this returns
         (True, "All families have unique wife name, husband name, and marriage date"). If familes have duplicate wife name, husband name, and marriage date, this returns
         (False, <a string to output that lists errors>)
     """
-    flag = True
-    output = ""
-    couples = [(fam.wife_name, fam.husband_name, fam.married)
-               for fam in families]
-    dup_couples = [fam for fam, count in Counter(couples).items() if count > 1]
-    if len(dup_couples) > 0:
-        flag = False
-        for c in dup_couples:
-            output += "Error: " + str(c) + " appear in multiple families\n"
-    if flag:
-        output += "All families have unique wife name, husband name, and marriage date\n"
-    return (flag, output)
+    couples = {}
+    for fam in families:
+        couples.setdefault((fam.wife_name, fam.husband_name, fam.married), []).append(fam)
+    # the duplicated couple is printed and its families are kept for the record IDs
+    findings = [Finding("US24", ERROR, "Error: {0} appear in multiple families\n", c, Group(fams))
+                for c, fams in couples.items() if len(fams) > 1]
+    return CheckResult("US24", findings, "All families have unique wife name, husband name, and marriage date\n")
 
 
-def list_large_age_difference(individuals, families):
+@check("US34", "List large age difference", BOTH,
+       reads=("individual.birthday", "family.husband_ID", "family.wife_ID", "family.married"))
+def list_large_age_difference(individuals, families, index=None):
     """
     US24
     List all couples who were married when the older spouse was more than twice as old as the younger spouse
-        tuple: Tuple in the form (result, output). If there are no couples with large age diff, this returns
+
+    Args:
+        individuals (list): List of Individual objects
+        families (list): List of Family objects
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
+
+    Returns:
+        CheckResult: Unpacks to (result, output). If there are no couples with large age diff, this returns
         (True, "No couples where the older spouse was twice as old as the younger spouse at the time of marriage\n").
         If there are couples with large age diff, this returns
         (False, <a string to output that lists couples>)
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for f in families:
-        wife = next(x for x in individuals if x.ID == f.wife_ID)
-        husband = next(x for x in individuals if x.ID == f.husband_ID)
-        wifeAgeMarr = calculate_age_at_spec_date(wife.birthday, f.married)
-        husbAgeMarr = calculate_age_at_spec_date(husband.birthday, f.married)
+        wife = index.individuals_by_ID[f.wife_ID]
+        husband = index.individuals_by_ID[f.husband_ID]
+        wifeAgeMarr = years_between(wife.birth_ordinal, f.married_ordinal)
+        husbAgeMarr = years_between(husband.birth_ordinal, f.married_ordinal)
         if wifeAgeMarr >= husbAgeMarr * 2:
-            flag = False
-            output += str(wife) + " and " + str(husband) + "\n"
+            findings.append(Finding("US34", INFO, "{0} and {1}\n", wife, husband))
         elif husbAgeMarr >= wifeAgeMarr * 2:
-            flag = False
-            output += str(husband) + " and " + str(wife) + "\n"
+            findings.append(Finding("US34", INFO, "{0} and {1}\n", husband, wife))
 
-    if flag:
-        output += "No couples where the older spouse was twice as old as the younger spouse at the time of marriage\n"
-    return (flag, output)
+    return CheckResult("US34", findings,
+                       "No couples where the older spouse was twice as old as the younger spouse at the time of marriage\n")
 
 
-def list_recent_births(individuals):
+@check("US35", "List recent births", INDIVIDUALS, LOG_LINEAR,
+       reads=("today", "individual.birthday"))
+def list_recent_births(individuals, table=None, as_of=None, events=None):
     """US 35: List recent births
 
     Args:
         individuals (list): A list of inidividuals
+        table (IndividualTable): Columns over individuals to check them all at once, optional
+        as_of (int): Day ordinal to use as today, today if not given
+        events (EventIndex): Shared calendars to look the births up in, optional
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if nobody has been born in the last 30 days,
+        CheckResult: Unpacks to (bool, output). Bool is True if nobody has been born in the last 30 days,
         False otherwise. Output is a string that describes which individuals were born in the last 30 days
     """
-    flag = True
-    output = ""
-    # todays datetime
-    today = datetime.now()
-    for indi in individuals:
-        # parse birthday into datetime
-        born = datetime.strptime(indi.birthday, "%d %b %Y")
-        # get difference
-        delta = today - born
-
+    # todays date
+    today = _get_as_of(as_of)
+    table = _get_table(individuals, table)
+    if events is not None and events.covers(individuals):
         # also need to make sure the baby isnt born in the future
-        if delta.days <= 30 and delta.days >= 0:
-            flag = False
-            output += str(indi) + " was born within the last 30 days\n"
-
-    if flag:
-        output = "No individuals born in the last 30 days\n"
+        recent = events.births.between(today - 30, today)
+    elif table is not None and table.all_births:
+        # also need to make sure the baby isnt born in the future
+        recent = table.select((table.birth <= today) & (table.birth >= today - 30))
+    else:
+        recent = (indi for indi in individuals if 0 <= today - indi.birth_ordinal <= 30)
+    findings = [Finding("US35", INFO, "{0} was born within the last 30 days\n", indi) for indi in recent]
 
-    return (flag, output)
+    return CheckResult("US35", findings, "No individuals born in the last 30 days\n")
 
 
-def list_recent_deaths(individuals):
+@check("US36", "List recent deaths", INDIVIDUALS, LOG_LINEAR,
+       reads=("today", "individual.alive", "individual.death"))
+def list_recent_deaths(individuals, table=None, as_of=None, events=None):
     """US 35: List recent deaths
 
     Args:
         individuals (list): A list of inidividuals
+        table (IndividualTable): Columns over individuals to check them all at once, optional
+        as_of (int): Day ordinal to use as today, today if not given
+        events (EventIndex): Shared calendars to look the deaths up in, optional
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if nobody has died in the last 30 days,
+        CheckResult: Unpacks to (bool, output). Bool is True if nobody has died in the last 30 days,
         False otherwise. Output is a string that describes which individuals died in the last 30 days
     """
-    flag = True
-    output = ""
-    # todays datetime
-    today = datetime.now()
-    for indi in individuals:
-        # check to make sure they are dead
-        if not indi.alive and indi.death is not None:
-            # parse birthday into datetime
-            death = datetime.strptime(indi.death, "%d %b %Y")
-            # get difference
-            delta = today - death
-
-            # also need to make sure the baby isnt born in the future
-            if delta.days <= 30 and delta.days >= 0:
-                flag = False
-                output += str(indi) + " died within the last 30 days\n"
-
-    if flag:
-        output = "No individuals died in the last 30 days\n"
+    # todays date
+    today = _get_as_of(as_of)
+    table = _get_table(individuals, table)
+    if events is not None and events.covers(individuals):
+        # only the dead are in the calendar, and they did not die in the future
+        recent = events.deaths.between(today - 30, today)
+    elif table is not None:
+        # check to make sure they are dead and did not die in the future
+        recent = table.select(~table.alive & table.has_death_date &
+                              (table.death <= today) & (table.death >= today - 30))
+    else:
+        recent = (indi for indi in individuals
+                  if not indi.alive and indi.death_ordinal is not None and 0 <= today - indi.death_ordinal <= 30)
+    findings = [Finding("US36", INFO, "{0} died within the last 30 days\n", indi) for indi in recent]
 
-    return (flag, output)
+    return CheckResult("US36", findings, "No individuals died in the last 30 days\n")
 
 
-def siblings_should_not_marry(individuals, families):
+@check("US18", "Siblings should not marry", BOTH,
+       reads=("individual.child", "family.husband_ID", "family.wife_ID"))
+def siblings_should_not_marry(individuals, families, index=None):
     """US 18: Siblings Should Not Marry
 
     Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if no siblings have married,
+        CheckResult: Unpacks to (bool, output). Bool is True if no siblings have married,
         False otherwise. Output is a string that describes which individuals married their siblings.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
-        husband = [indi for indi in individuals if indi.ID == family.husband_ID]
-        wife = [indi for indi in individuals if indi.ID == family.wife_ID]
-        if not set(husband[0].child).isdisjoint(wife[0].child):
-            flag = False
-            output += "Error: " + str(husband[0].ID) + " and " + str(
-                wife[0].ID) + " are siblings and should not marry.\n"
-    if flag:
-        output = "No siblings are married\n"
-    return (flag, output)
+        husband = index.individuals_by_ID[family.husband_ID]
+        wife = index.individuals_by_ID[family.wife_ID]
+        if index.share_birth_family(husband, wife):
+            findings.append(Finding("US18", ERROR, "Error: {0.ID} and {1.ID} are siblings and should not marry.\n",
+                                    husband, wife))
+    return CheckResult("US18", findings, "No siblings are married\n")
 
 
-def list_upcoming_anniversaries(individuals, families):
+@check("US39", "List upcoming anniversaries", BOTH, LOG_LINEAR,
+       reads=("today", "individual.alive", "family.husband_ID", "family.wife_ID", "family.married"))
+def list_upcoming_anniversaries(individuals, families, index=None, as_of=None, events=None):
     """US 39: List upcoming anniversaries
 
     Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
+        as_of (int): Day ordinal to use as today, today if not given
+        events (EventIndex): Shared calendars to look the marriages up in, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if there are no living couples with anniversaries in the next 30 days,
+        CheckResult: Unpacks to (bool, output). Bool is True if there are no living couples with anniversaries in the next 30 days,
         False otherwise. Output is a string that describes which living couples have anniversaries in the next 30 days.
     """
-    flag = True
-    output = ""
-    today = datetime.now()
-    for family in families:
-        husband = [indi for indi in individuals if indi.ID == family.husband_ID]
-        wife = [indi for indi in individuals if indi.ID == family.wife_ID]
-        marriage = datetime.strptime(family.married, "%d %b %Y")
-        # puts marriage into the current year to calculate anniversary
-        marriage = marriage.replace(year=today.year)
-        delta = marriage - today
-        if husband[0].alive and wife[0].alive and delta.days <= 30 and delta.days >= 0:
-            flag = False
-            output += "Note: " + \
-                str(family.ID) + " has an upcoming anniversary on " + \
-                str(family.married) + "\n"
-    if flag:
-        output = "No living couples have anniversaries in the next 30 days.\n"
-    return (flag, output)
-
-
-def list_living_married(individuals, families):
+    index = _get_index(individuals, families, index)
+    findings = []
+    events = _get_events(individuals, families, events)
+    today = _get_as_of(as_of)
+    # anniversaries today or in the next 30 days, also over new year and on 29 February
+    for family in events.marriages.recurring(today, today + 30):
+        husband = index.individuals_by_ID[family.husband_ID]
+        wife = index.individuals_by_ID[family.wife_ID]
+        if husband.alive and wife.alive:
+            findings.append(Finding("US39", NOTE, "Note: {0.ID} has an upcoming anniversary on {0.married}\n", family))
+    return CheckResult("US39", findings, "No living couples have anniversaries in the next 30 days.\n")
+
+
+@check("US30", "List living married", BOTH,
+       reads=("individual.alive", "family.husband_ID", "family.wife_ID"))
+def list_living_married(individuals, families, index=None):
     """US 30: List living married
 
         Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
         Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if there are no living married couples,
+        CheckResult: Unpacks to (bool, output). Bool is True if there are no living married couples,
         False otherwise. Output is a string that describes the living married couples.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
-        husband = [indi for indi in individuals if indi.ID == family.husband_ID]
-        wife = [indi for indi in individuals if indi.ID == family.wife_ID]
-        if husband != [] and wife != [] and husband[0].alive and wife[0].alive:
-            flag = False
-            output += "Husband: " + \
-                str(husband[0].ID) + ", Wife: " + str(wife[0].ID) + "\n"
-    if flag:
-        output = "No living married couples.\n"
-    return (flag, output)
+        husband = index.husband(family)
+        wife = index.wife(family)
+        if husband is not None and wife is not None and husband.alive and wife.alive:
+            findings.append(Finding("US30", INFO, "Husband: {0.ID}, Wife: {1.ID}\n", husband, wife))
+    return CheckResult("US30", findings, "No living married couples.\n")
 
 
+@check("US23", "Unique name and birth date", BOTH,
+       reads=("individual.name", "individual.birthday"))
 def unique_name_birth(individuals, families):
     """US 23: Unique name and birth date
 
@@ -682,303 +793,269 @@ def unique_name_birth(individuals, families):
         families (list): A list of families
 
         Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if all names and birth dates are unique.
+        CheckResult: Unpacks to (bool, output). Bool is True if all names and birth dates are unique.
         False otherwise. Output is a string that lists all individuals with non-unique names and birth dates.
     """
-    flag = True
-    output = ""
     everyone = {}
     for individual in individuals:
-        name = individual.name
-        birthday = individual.birthday
-        if (name, birthday) in everyone:
-            flag = False
-            everyone[(name, birthday)] += [individual.ID]
-        else:
-            everyone[(name, birthday)] = [individual.ID]
-    if flag:
-        output = "All unique names and birth dates.\n"
-    else:
-        for key in everyone:
-            if len(everyone[key]) > 1:
-                same = " ".join(everyone[key])
-                output += same + " have the same name and birth date.\n"
-    return (flag, output)
+        everyone.setdefault((individual.name, individual.birthday), []).append(individual)
+    findings = [Finding("US23", ERROR, "{0} have the same name and birth date.\n",
+                        Group([individual.ID for individual in same]), Group(same))
+                for same in everyone.values() if len(same) > 1]
+    return CheckResult("US23", findings, "All unique names and birth dates.\n")
 
 
-def aunts_and_uncles(individuals, families):
+@check("US20", "Aunts and Uncles", BOTH,
+       reads=("family.husband_ID", "family.wife_ID", "family.children"))
+def aunts_and_uncles(individuals, families, index=None):
     """US 20: Aunts and uncles
 
         Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
         Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if No aunts or uncles are married to nieces or nephews.
+        CheckResult: Unpacks to (bool, output). Bool is True if No aunts or uncles are married to nieces or nephews.
         False otherwise. Output is a string that lists all individuals who are married to a niece or nephew.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
 
+    # join the parent -> child edges with the child -> spouse edges and keep the spouses
+    # that are also siblings of the parent
     for i in individuals:
-        parent_siblings = get_siblings(i, individuals, families)
-        children = get_children(i, individuals, families)
+        children = index.children(i)
+        if len(children) == 0:
+            continue
+        parent_siblings = set(index.siblings(i))
         for c in children:
-            kid_spouses = get_spouses(c, individuals, families)
-            creeps = list(set(parent_siblings).intersection(set(kid_spouses)))
-            if(len(creeps) > 0):
-                for cr in creeps:
-                    flag = False
-                    output += "Error: " + \
-                        str(cr) + " is married to their niece or nephew.\n"
-    if flag:
-        output += "No aunts or uncles are married to nieces or nephews.\n"
-    return (flag, output)
+            for cr in index.spouses(c):
+                if cr in parent_siblings:
+                    findings.append(Finding("US20", ERROR, "Error: {0} is married to their niece or nephew.\n", cr))
+    return CheckResult("US20", findings, "No aunts or uncles are married to nieces or nephews.\n")
 
 
-def living_single(individuals):
+@check("US31", "Living Single", INDIVIDUALS,
+       reads=("individual.age", "individual.spouse"))
+def living_single(individuals, table=None):
     """US 31: Living single
 
         Args:
         individuals (list): A list of inidividuals
-        families (list): A list of families
+        table (IndividualTable): Columns over individuals to check them all at once, optional
 
         Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if No one is single and over 30.
+        CheckResult: Unpacks to (bool, output). Bool is True if No one is single and over 30.
         False otherwise. Output is a string that lists all individuals who single and over 30.
     """
-    flag = True
-    output = ""
-    for i in individuals:
-        if(i.age > 30 and len(i.spouse) == 0):
-            flag = False
-            output += str(i) + " is single and over 30.\n"
-    if flag:
-        output += "No one is single and over 30.\n"
-    return (flag, output)
+    table = _get_table(individuals, table)
+    if table is not None and table.all_ages:
+        single = table.select((table.age > 30) & (table.spouses == 0))
+    else:
+        single = (i for i in individuals if i.age > 30 and len(i.spouse) == 0)
+    findings = [Finding("US31", INFO, "{0} is single and over 30.\n", i) for i in single]
+    return CheckResult("US31", findings, "No one is single and over 30.\n")
 
 
-def list_upcoming_birthdays(individuals):
+@check("US38", "List Upcoming Birthdays", INDIVIDUALS, LOG_LINEAR,
+       reads=("today", "individual.birthday"))
+def list_upcoming_birthdays(individuals, as_of=None, events=None):
     """US 38: List upcoming birthdays
 
     Args:
         individuals (list): A list of inidividuals
+        as_of (int): Day ordinal to use as today, today if not given
+        events (EventIndex): Shared calendars to look the birthdays up in, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if nobody has upcoming birthdays in the next
+        CheckResult: Unpacks to (bool, output). Bool is True if nobody has upcoming birthdays in the next
         30 days, False otherwise. Output is a string that describes which individuals have birthdays
         in the next 30 days
     """
-    flag = True
-    output = ""
-    # todays datetime
-    today = datetime.now()
-    for indi in individuals:
-        # parse birthday into datetime and set year to current year so we can compare days only
-        born = datetime.strptime(
-            indi.birthday, "%d %b %Y").replace(year=today.year)
-
-        # get difference
-        delta = born - today
-
-        # also need to make sure the birthday is in the past
-        if delta.days <= 30 and delta.days >= 0:
-            flag = False
-            output += str(indi) + " has a birthday in the next 30 days\n"
+    events = _get_events(individuals, None, events)
+    # todays date
+    today = _get_as_of(as_of)
+    # birthdays today or in the next 30 days, also over new year and on 29 February
+    findings = [Finding("US38", INFO, "{0} has a birthday in the next 30 days\n", indi)
+                for indi in events.births.recurring(today, today + 30)]
 
-    if flag:
-        output = "No individuals have birthdays in the next 30 days\n"
-
-    return (flag, output)
+    return CheckResult("US38", findings, "No individuals have birthdays in the next 30 days\n")
 
 
-def correct_gender_for_role(individuals, families):
+@check("US21", "Correct Gender for Role", BOTH,
+       reads=("individual.gender", "family.husband_ID", "family.wife_ID"))
+def correct_gender_for_role(individuals, families, index=None):
     """US 38
 
     Args:
         individuals (list): A list of individuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if all roles have the correct gender in
+        CheckResult: Unpacks to (bool, output). Bool is True if all roles have the correct gender in
         every family, False otherwise. Output is a string that describes any families with incorrect roles.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
 
     for fam in families:
-        husband = next(
-            (indi for indi in individuals if indi.ID == fam.husband_ID), False)
-        wife = next(
-            (indi for indi in individuals if indi.ID == fam.wife_ID), False)
+        husband = index.individuals_by_ID.get(fam.husband_ID, False)
+        wife = index.individuals_by_ID.get(fam.wife_ID, False)
 
         if husband and wife:
             if husband.gender != "M":
-                flag = False
-                output += str(husband) + " is a husband but not a male\n"
+                findings.append(Finding("US21", ERROR, "{0} is a husband but not a male\n", husband))
             if wife.gender != "F":
-                flag = False
-                output += str(wife) + " is a wife but not a female\n"
+                findings.append(Finding("US21", ERROR, "{0} is a wife but not a female\n", wife))
 
-    if flag:
-        output = "All families have the correct gender for their roles\n"
+    return CheckResult("US21", findings, "All families have the correct gender for their roles\n")
 
-    return(flag, output)
 
-
-def marriage_before_death(individuals, families):
+@check("US05", "Marriage Before Death", BOTH,
+       reads=("individual.alive", "individual.death", "family.husband_ID", "family.wife_ID",
+              "family.married"))
+def marriage_before_death(individuals, families, index=None):
     """US 05
 
     Args:
         individuals (list): A list of individuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if all marriages happen before death of
+        CheckResult: Unpacks to (bool, output). Bool is True if all marriages happen before death of
         each spouse, False otherwise. Output is a string that describes any marriages that occur after death.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
-        for individual in individuals:
-            if (family.husband_ID == individual.ID or family.wife_ID == individual.ID) and not individual.alive:
-                marriage_date = datetime.strptime(family.married, "%d %b %Y")
-                death_date = datetime.strptime(individual.death, "%d %b %Y")
-                if marriage_date > death_date:
-                    flag = False
-                    output += "Error: " + individual.ID + \
-                        " was married in family " + family.ID + " after death.\n"
-    if flag:
-        output += "All individuals were married before death.\n"
-    return (flag, output)
-
-
-def divorce_before_death(individuals, families):
+        for individual in index.spouses_by_family[family]:
+            if not individual.alive and individual.death_ordinal is not None:
+                if family.married_ordinal > individual.death_ordinal:
+                    findings.append(Finding("US05", ERROR, "Error: {0.ID} was married in family {1.ID} after death.\n",
+                                            individual, family))
+    return CheckResult("US05", findings, "All individuals were married before death.\n")
+
+
+@check("US06", "Divorce Before Death", BOTH,
+       reads=("individual.alive", "individual.death", "family.husband_ID", "family.wife_ID",
+              "family.divorced"))
+def divorce_before_death(individuals, families, index=None):
     """US 06
 
     Args:
         individuals (list): A list of individuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if all divorces happen before death of
+        CheckResult: Unpacks to (bool, output). Bool is True if all divorces happen before death of
         each spouse, False otherwise. Output is a string that describes any divorces that occur after death.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for family in families:
-        for individual in individuals:
-            if (family.husband_ID == individual.ID or family.wife_ID == individual.ID) and not individual.alive and family.divorced != None:
-                divorce_date = datetime.strptime(family.divorced, "%d %b %Y")
-                death_date = datetime.strptime(individual.death, "%d %b %Y")
-                if divorce_date > death_date:
-                    flag = False
-                    output += "Error: " + individual.ID + \
-                        " was divorced in family " + family.ID + " after death.\n"
-    if flag:
-        output += "All individuals were divorced before death.\n"
-    return (flag, output)
+        for individual in index.spouses_by_family[family]:
+            if not individual.alive and individual.death_ordinal is not None and family.divorced_ordinal is not None:
+                if family.divorced_ordinal > individual.death_ordinal:
+                    findings.append(Finding("US06", ERROR, "Error: {0.ID} was divorced in family {1.ID} after death.\n",
+                                            individual, family))
+    return CheckResult("US06", findings, "All individuals were divorced before death.\n")
 
 
-def order_siblings_by_age(individuals, families):
+@check("US28", "Order siblings by age", BOTH, LOG_LINEAR,
+       reads=("individual.age", "family.children"))
+def order_siblings_by_age(individuals, families, index=None):
     """US 28: Order siblings by age
 
     Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if there are no siblings to sort by age
+        CheckResult: Unpacks to (bool, output). Bool is True if there are no siblings to sort by age
         False otherwise. Output is a string that lists siblings sorted by age.
     """
+    index = _get_index(individuals, families, index)
     flag = True
-    output = ""
+    findings = []
     for family in families:
         sibling_IDs = family.children
         siblings = []
         for ID in sibling_IDs:
-            siblings.append(
-                next((indi for indi in individuals if indi.ID == ID), False))
+            siblings.append(index.individuals_by_ID.get(ID, False))
         siblings.sort(key=lambda x: x.age, reverse=True)
         # sort sibilings
-        output += "Printing family: " + str(family.ID) + "\n"
+        findings.append(Finding("US28", INFO, "Printing family: {0.ID}\n", family))
         for sib in siblings:
             if sib:
                 flag = False
-                output += str(sib) + " \n"
+                findings.append(Finding("US28", INFO, "{0} \n", sib))
     if flag:
-        output = "No siblings to print.\n"
-    return (flag, output)
+        # the family headings are only printed when there is a sibling to list
+        findings = []
+    return CheckResult("US28", findings, "No siblings to print.\n", flag)
 
 
-def parents_too_old(individuals, families):
+@check("US12", "Parents too old", BOTH,
+       reads=("individual.birthday", "family.husband_ID", "family.wife_ID", "family.children"))
+def parents_too_old(individuals, families, index=None):
     """US 12: Parents too old
 
     Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if no parents are too old
+        CheckResult: Unpacks to (bool, output). Bool is True if no parents are too old
         False otherwise. Output is a string that lists parents that are too old.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for fam in families:
-        husband = next(
-            (indi for indi in individuals if indi.ID == fam.husband_ID), False)
-        wife = next(
-            (indi for indi in individuals if indi.ID == fam.wife_ID), False)
+        husband = index.individuals_by_ID.get(fam.husband_ID, False)
+        wife = index.individuals_by_ID.get(fam.wife_ID, False)
         if (husband and wife):
-            husband_born = datetime.strptime(husband.birthday, "%d %b %Y")
-            wife_born = datetime.strptime(wife.birthday, "%d %b %Y")
             for child in fam.children:
-                c = next((indi for indi in individuals if indi.ID == child), False)
+                c = index.individuals_by_ID.get(child, False)
                 if c:
-                    child_born = datetime.strptime(c.birthday, "%d %b %Y")
-                    dad_delta = relativedelta(child_born, husband_born)
-                    if dad_delta.years >= 80:
-                        flag = False
-                        output += "Error: Father " + \
-                            str(husband.ID) + " is too old for child " + \
-                            str(c.ID) + "\n"
-                    mom_delta = relativedelta(child_born, wife_born)
-                    if mom_delta.years >= 60:
-                        flag = False
-                        output += "Error: Mother " + \
-                            str(wife.ID) + " is too old for child " + \
-                            str(c.ID) + "\n"
+                    if years_between(husband.birth_ordinal, c.birth_ordinal) >= 80:
+                        findings.append(Finding("US12", ERROR, "Error: Father {0.ID} is too old for child {1.ID}\n",
+                                                husband, c))
+                    if years_between(wife.birth_ordinal, c.birth_ordinal) >= 60:
+                        findings.append(Finding("US12", ERROR, "Error: Mother {0.ID} is too old for child {1.ID}\n",
+                                                wife, c))
 
-    if flag:
-        output = "No parents are too old for their children.\n"
-    return (flag, output)
+    return CheckResult("US12", findings, "No parents are too old for their children.\n")
 
 
-def list_orphans(individuals, families):
+@check("US33", "List orphans", BOTH,
+       reads=("individual.alive", "individual.age", "family.husband_ID", "family.wife_ID", "family.children"))
+def list_orphans(individuals, families, index=None):
     """US 33: Lists orphans
 
     Args:
         individuals (list): A list of inidividuals
         families (list): A list of families
+        index (GenealogyIndex): Shared index over individuals and families, built if not given
 
     Returns:
-        tuple: Tuple of the form (bool, output). Bool is True if no orphans (younger than 18 and both parents dead)
+        CheckResult: Unpacks to (bool, output). Bool is True if no orphans (younger than 18 and both parents dead)
         False otherwise. Output is a string that lists orphans.
     """
-    flag = True
-    output = ""
+    index = _get_index(individuals, families, index)
+    findings = []
     for fam in families:
-        husband = next(
-            (indi for indi in individuals if indi.ID == fam.husband_ID), False)
-        wife = next(
-            (indi for indi in individuals if indi.ID == fam.wife_ID), False)
+        husband = index.individuals_by_ID.get(fam.husband_ID, False)
+        wife = index.individuals_by_ID.get(fam.wife_ID, False)
         if not wife.alive and not husband.alive:
-            kids = get_children(husband, individuals, families)
+            kids = index.children_by_family[fam]
             if len(kids) != 0:
                 for k in kids:
                     if k.age < 18:
-                        flag = False
-                        output += str(k) + "\n"
-    if flag:
-        output = "No orphans found.\n"
-    return (flag, output)
+                        findings.append(Finding("US33", INFO, "{0}\n", k))
+    return CheckResult("US33", findings, "No orphans found.\n")
@@ -0,0 +1,103 @@
+# Columnar copy of the parsed individuals so the per individual checks can run as array
+# operations instead of Python loops. numpy is optional, without it the checks loop over the
+# Individuals like they always have
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# gender codes used in the gender column
+UNKNOWN = 0
+MALE = 1
+FEMALE = 2
+
+
+def build_table(individuals):
+    """Builds an IndividualTable if numpy is installed
+
+    Args:
+        individuals (list): List of Individual objects
+
+    Returns:
+        IndividualTable: The table over individuals or None if numpy is not installed
+    """
+    if numpy is None:
+        return None
+    return IndividualTable(individuals)
+
+
+class IndividualTable(object):
+    """A snapshot of the individuals with one numpy array per field, row i is individuals[i]
+
+    Build it once after parsing (and after any sorting) and pass it to the checks that accept
+    a table. Changing an Individual afterwards is not reflected in the table.
+
+    Attributes:
+        individuals (list): The Individuals the rows were built from
+        birth (numpy.ndarray): Birthdays as day ordinals, 0 where missing or unreadable
+        death (numpy.ndarray): Deaths as day ordinals, 0 where missing or unreadable
+        has_birth (numpy.ndarray): True where the birthday could be read
+        has_death_date (numpy.ndarray): True where the death could be read
+        has_death (numpy.ndarray): True where a death is recorded at all, readable or not
+        alive (numpy.ndarray): The alive flags
+        gender (numpy.ndarray): MALE, FEMALE or UNKNOWN
+        spouses (numpy.ndarray): Number of families each individual is a spouse in
+        age (numpy.ndarray): Ages in years, 0 where unknown
+        has_age (numpy.ndarray): True where the age is known
+        all_births (boolean): True if every birthday could be read
+        all_ages (boolean): True if every age is known
+    """
+
+    def __init__(self, individuals):
+        """Constructor for IndividualTable
+
+        Args:
+            individuals (list): List of Individual objects
+        """
+        super(IndividualTable, self).__init__()
+        count = len(individuals)
+        self.individuals = individuals
+
+        def column(values, dtype):
+            return numpy.fromiter(values, dtype=dtype, count=count)
+
+        # ordinals start at 1 so 0 is free to mark a missing date
+        self.birth = column((indi.birth_ordinal or 0 for indi in individuals), numpy.int64)
+        self.death = column((indi.death_ordinal or 0 for indi in individuals), numpy.int64)
+        self.has_birth = self.birth != 0
+        self.has_death_date = self.death != 0
+        self.has_death = column((indi.death is not None for indi in individuals), numpy.bool_)
+        self.alive = column((bool(indi.alive) for indi in individuals), numpy.bool_)
+        self.gender = column((MALE if indi.gender == "M" else FEMALE if indi.gender == "F" else UNKNOWN
+                              for indi in individuals), numpy.int8)
+        self.spouses = column((len(indi.spouse) for indi in individuals), numpy.int32)
+        self.has_age = column((indi.age is not None for indi in individuals), numpy.bool_)
+        self.age = column((indi.age or 0 for indi in individuals), numpy.int32)
+
+        self.all_births = bool(self.has_birth.all())
+        self.all_ages = bool(self.has_age.all())
+
+    def covers(self, individuals):
+        """Checks if the table was built from this list of individuals
+
+        Args:
+            individuals (list): List of Individual objects a check was called with
+
+        Returns:
+            boolean: True if the table can stand in for individuals
+        """
+        return self.individuals is individuals and len(self.birth) == len(individuals)
+
+    def select(self, mask):
+        """Gets the Individuals for the rows where mask is True
+
+        Args:
+            mask (numpy.ndarray): One boolean per row
+
+        Returns:
+            list: list of Individuals in row order
+        """
+        return [self.individuals[row] for row in numpy.flatnonzero(mask)]
+
+    def __len__(self):
+        return len(self.individuals)
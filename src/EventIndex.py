@@ -0,0 +1,183 @@
+# Calendars of the births, deaths and marriages of a tree, sorted so the questions "what happened
+# between these two days" and "whose anniversary falls between these two days" are answered with
+# bisect in O(log N + k) instead of a scan over every record. Build one per tree and ask it as
+# many questions as needed, each calendar is sorted the first time it is asked
+import datetime
+from bisect import bisect_left, bisect_right
+from Utils import DAYS_BEFORE_MONTH
+
+# day of the year of 29 February, counted in a leap year
+LEAP_DAY = 60
+
+
+def day_of_year(month, day):
+    """Numbers the days of the year 1 to 366 as in a leap year, so 29 February has its own
+    number in every year and the other days keep theirs
+
+    Args:
+        month (int): Month number, 1 to 12
+        day (int): Day of the month
+
+    Returns:
+        int: The day of the year
+    """
+    return DAYS_BEFORE_MONTH[month] + (month > 2) + day
+
+
+def is_leap(year):
+    """Checks if a year has a 29 February
+
+    Args:
+        year (int): The year
+
+    Returns:
+        boolean: True for leap years
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+class Calendar(object):
+    """Records sorted by the day their event happened and by the day of the year it comes back on
+
+    Attributes:
+        records (list): The records that have the event, in the order they were given
+        ordinals (list): Day ordinal of the event of each record in records
+    """
+
+    def __init__(self, records, ordinals):
+        """Constructor for Calendar
+
+        Args:
+            records (list): The records that have the event
+            ordinals (list): Day ordinal of the event of each record
+        """
+        super(Calendar, self).__init__()
+        self.records = records
+        self.ordinals = ordinals
+        # (sorted keys, positions in records in the same order), made on first use
+        self._by_ordinal = None
+        self._by_day = None
+
+    def between(self, start, end):
+        """Finds the records whose event happened between two days
+
+        Args:
+            start (int): Day ordinal of the first day, included
+            end (int): Day ordinal of the last day, included
+
+        Returns:
+            list: The records, in the order they were given
+        """
+        if self._by_ordinal is None:
+            self._by_ordinal = self._sort(self.ordinals)
+        keys, positions = self._by_ordinal
+        return self._pick(positions[bisect_left(keys, start):bisect_right(keys, end)])
+
+    def recurring(self, start, end):
+        """Finds the records whose event comes back, like a birthday or an anniversary, between
+        two days. A window can run over the end of a year. Events on 29 February come back on
+        1 March in other years, the day Utils.years_between counts the year as passed
+
+        Args:
+            start (int): Day ordinal of the first day, included
+            end (int): Day ordinal of the last day, included
+
+        Returns:
+            list: The records, in the order they were given
+        """
+        if self._by_day is None:
+            days = []
+            for ordinal in self.ordinals:
+                date = datetime.date.fromordinal(ordinal)
+                days.append(day_of_year(date.month, date.day))
+            self._by_day = self._sort(days)
+        keys, positions = self._by_day
+
+        first = datetime.date.fromordinal(start)
+        last = datetime.date.fromordinal(end)
+        found = []
+        # one slice of the calendar for each year the window touches
+        for year in range(first.year, last.year + 1):
+            low = first if year == first.year else datetime.date(year, 1, 1)
+            high = last if year == last.year else datetime.date(year, 12, 31)
+            low_day = day_of_year(low.month, low.day)
+            if low_day == LEAP_DAY + 1 and not is_leap(year):
+                low_day = LEAP_DAY
+            found += positions[bisect_left(keys, low_day):bisect_right(keys, day_of_year(high.month, high.day))]
+        if last.year > first.year:
+            # a window longer than a year sees some days twice
+            found = set(found)
+        return self._pick(found)
+
+    def _sort(self, keys):
+        """Sorts positions in records by their keys, records with the same key stay in order
+
+        Args:
+            keys (list): Key of each record
+
+        Returns:
+            tuple: (sorted keys, positions in records in the same order)
+        """
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        return ([keys[position] for position in order], order)
+
+    def _pick(self, positions):
+        """Looks up the records at positions, in the order they were given
+
+        Args:
+            positions (iterable): Positions in records
+
+        Returns:
+            list: The records
+        """
+        return [self.records[position] for position in sorted(positions)]
+
+    def __len__(self):
+        return len(self.records)
+
+
+class EventIndex(object):
+    """Calendars of the events of a tree, shared by the checks that list events near a date
+
+    Build it once after parsing (and after any sorting, since answers keep the order of the
+    lists it was built from) and pass it to every check that accepts one. Changing a record
+    afterwards is not reflected in the index.
+
+    Attributes:
+        individuals (list): The Individuals it was built from
+        families (list): The Families it was built from
+        births (Calendar): Individuals with a readable birthday
+        deaths (Calendar): Individuals that are not alive and have a readable death date
+        marriages (Calendar): Families with a readable marriage date
+    """
+
+    def __init__(self, individuals, families):
+        """Constructor for EventIndex
+
+        Args:
+            individuals (list): List of Individual objects
+            families (list): List of Family objects
+        """
+        super(EventIndex, self).__init__()
+        self.individuals = individuals
+        self.families = families
+
+        born = [indi for indi in individuals if indi.birth_ordinal is not None]
+        self.births = Calendar(born, [indi.birth_ordinal for indi in born])
+        dead = [indi for indi in individuals if not indi.alive and indi.death_ordinal is not None]
+        self.deaths = Calendar(dead, [indi.death_ordinal for indi in dead])
+        married = [fam for fam in families if fam.married_ordinal is not None]
+        self.marriages = Calendar(married, [fam.married_ordinal for fam in married])
+
+    def covers(self, individuals, families=None):
+        """Checks if the index was built from these lists
+
+        Args:
+            individuals (list): List of Individual objects a check was called with
+            families (list): List of Family objects a check was called with, None if it was
+            only called with individuals
+
+        Returns:
+            boolean: True if the index can answer for these lists
+        """
+        return self.individuals is individuals and (families is None or self.families is families)
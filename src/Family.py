@@ -1,20 +1,27 @@
-from Utils import parse_line, check_date
+from sys import intern
+from Utils import parse_line, check_date, date_ordinal
 
 
 class Family(object):
     """Class for the family object in gedcom
 
     Attributes:
-        children (list): A list of strings that are the IDs of the children of the family
+        children (tuple): A tuple of strings that are the IDs of the children of the family
         divorced (string): String of date of divorced in the format %d %b %Y or None if not divorced
+        divorced_ordinal (int): divorced as a day ordinal or None, kept in sync whenever divorced is set
         husband_ID (string): ID of the husband individual
         husband_name (string): name of the husband individual
         ID (string): Unique identifier of the family
         married (string): String of marriage date in the format %d %b %Y (from here http://strftime.org/)
+        married_ordinal (int): married as a day ordinal, kept in sync whenever married is set
         wife_ID (string): ID of the wife individual
         wife_name (string): name of the wife individual
     """
 
+    # no per instance __dict__, so a Family only takes the space of these fields
+    __slots__ = ("ID", "_married", "married_ordinal", "_divorced", "divorced_ordinal", "husband_ID",
+                 "husband_name", "wife_ID", "wife_name", "children")
+
     def __init__(self, tag_list):
         """Constructor for Family
 
@@ -22,39 +29,83 @@ class Family(object):
             tag_list (list): A list of all the lines of the GEDCOM file relating to this Family
         """
         super(Family, self).__init__()
+        self._load([parse_line(line) for line in tag_list])
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """Builds a Family from lines that have already been tokenized
+
+        Args:
+            tokens (list): A list of (level, tag, args, valid) tuples from parse_line
+
+        Returns:
+            Family: The parsed Family
+        """
+        fam = cls.__new__(cls)
+        fam._load(tokens)
+        return fam
+
+    def _load(self, tokens):
+        """Fills in the Family from its tokenized GEDCOM lines
+
+        Args:
+            tokens (list): A list of (level, tag, args, valid) tuples from parse_line
+        """
         # default values
         self.divorced = None
-        self.children = []
+        children = []
         self.husband_name = None
         self.wife_name = None
 
         # look at all the lines we have
-        for i in range(len(tag_list)):
-            level, tag, args, valid = parse_line(tag_list[i])
+        for i in range(len(tokens)):
+            level, tag, args, valid = tokens[i]
 
             # ignore invalid lines and get data from the correct tags
             if valid:
+                # IDs and dates repeat across records so share one copy of each
                 if tag == "FAM":
-                    self.ID = args
+                    self.ID = intern(args)
                 elif tag == "HUSB":
-                    self.husband_ID = args
+                    self.husband_ID = intern(args)
                 elif tag == "WIFE":
-                    self.wife_ID = args
+                    self.wife_ID = intern(args)
                 elif tag == "MARR":
                     # skip a line to get the actual date
-                    level, tag, args, valid = parse_line(tag_list[i + 1])
-                    self.married = args
+                    level, tag, args, valid = tokens[i + 1]
+                    self.married = intern(args)
                     # check_date(self.married)
                 elif tag == "CHIL":
-                    self.children.append(args)
+                    children.append(intern(args))
                 elif tag == "DIV":
                     # skip a line to get the actual date
-                    level, tag, args, valid = parse_line(tag_list[i + 1])
-                    self.divorced = args
+                    level, tag, args, valid = tokens[i + 1]
+                    self.divorced = intern(args)
+
+        self.children = tuple(children)
 
         #check dates
         dates = [self.married, self.divorced]
-        check_date(self.ID, dates)
+        check_date(self.ID, dates, [self.married_ordinal, self.divorced_ordinal])
+
+    @property
+    def married(self):
+        return self._married
+
+    @married.setter
+    def married(self, value):
+        # parse the date once here so the checks can compare ordinals
+        self._married = value
+        self.married_ordinal = date_ordinal(value)
+
+    @property
+    def divorced(self):
+        return self._divorced
+
+    @divorced.setter
+    def divorced(self, value):
+        self._divorced = value
+        self.divorced_ordinal = date_ordinal(value)
 
     def __str__(self):
         return "{ID: " + str(self.ID) + \
@@ -64,7 +115,7 @@ class Family(object):
             "| Husband Name: " + str(self.husband_name) + \
             "| Wife ID: " + str(self.wife_ID) + \
             "| Wife Name: " + str(self.wife_name) + \
-            "| Children: " + str(self.children) + "}"
+            "| Children: " + str(list(self.children)) + "}"
 
     def __repr__(self):
         return self.__str__()
@@ -0,0 +1,608 @@
+# Writes synthetic GEDCOM files for measuring how the parser and the checks behave on large
+# trees. The same seed always gives the same file. The tree is built one clan at a time (a
+# founding couple, their descendants and everyone who married into the family) and each clan
+# is written out and forgotten before the next one starts, so memory stays bounded by the
+# size of a clan no matter how many people are written.
+#
+# To write a file, type
+#     python Generator.py <output file> --people 100000 --seed 1 --rate US11=0.01
+# in the src directory
+import argparse
+import datetime
+import random
+from Utils import MONTHS, today_ordinal
+
+# the user stories an anomaly can be injected for and what is changed to trip each one. An
+# anomaly is aimed at one story but can show up in related ones too, e.g. a spouse born after
+# the wedding (US02) is also married before 14 (US10)
+ANOMALIES = {
+    "US01": "a living person gets a death date in the future",
+    "US02": "a husband is born after his wedding",
+    "US03": "a dead person dies before they were born",
+    "US04": "a family is divorced before the wedding",
+    "US05": "a spouse dies before the wedding",
+    "US06": "a spouse dies between the wedding and the divorce",
+    "US07": "a living person is born more than 150 years ago",
+    "US09": "a mother dies before her last child is born",
+    "US10": "a husband marries before he turns 14",
+    "US11": "a second marriage starts before the first one ended",
+    "US12": "a mother is born more than 60 years before a child",
+    "US13": "a second child is born a few months after the first",
+    "US15": "a family has 15 or more children",
+    "US18": "a brother and sister marry each other",
+    "US20": "an aunt or uncle marries their niece or nephew",
+    "US21": "a husband is not male",
+    "US22": "an extra person reuses someone's ID",
+    "US23": "an extra person has someone's name and birthday",
+    "US24": "a couple is recorded as married twice on the same day",
+    "US25": "two children in a family share a first name and birthday",
+    "US42": "an extra person has a birthday that does not exist",
+}
+
+MONTH_NAMES = dict((number, name) for name, number in MONTHS.items())
+
+MALE_NAMES = ["James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas",
+              "Charles", "Daniel", "Matthew", "Anthony", "Mark", "Paul", "Steven", "Andrew", "Joshua",
+              "Kevin", "Brian", "George", "Edward", "Ronald", "Timothy", "Jason", "Jeffrey", "Ryan",
+              "Jacob", "Gary", "Nicholas", "Eric", "Jonathan", "Stephen", "Larry", "Justin", "Scott"]
+FEMALE_NAMES = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica",
+                "Sarah", "Karen", "Nancy", "Lisa", "Betty", "Margaret", "Sandra", "Ashley", "Kimberly",
+                "Emily", "Donna", "Michelle", "Dorothy", "Carol", "Amanda", "Melissa", "Deborah",
+                "Stephanie", "Rebecca", "Sharon", "Laura", "Cynthia", "Kathleen", "Amy", "Angela",
+                "Shirley", "Anna", "Brenda"]
+
+# surnames are made of these, one surname per number, so no two families ever share one
+SYLLABLES = ["al", "ben", "cor", "dal", "er", "fen", "gar", "hol", "is", "kel", "lan", "mor", "nor",
+             "os", "par", "quin", "ros", "sel", "tor", "var", "wes", "yor", "zan", "bri"]
+
+# how likely a couple is to have each number of children, the long tail makes a few large sibships
+CHILDREN_WEIGHTS = [10, 14, 24, 20, 12, 8, 5, 3, 2, 1, 0.5, 0.3, 0.2]
+
+# chances of the life events that shape the tree
+MARRIAGE_CHANCE = 0.85
+DIVORCE_CHANCE = 0.15
+REMARRIAGE_CHANCE = 0.4
+TWINS_CHANCE = 0.015
+EARLY_DEATH_CHANCE = 0.04
+
+YEAR = 365.2425
+
+
+class _Person(object):
+    """One person of the clan being built"""
+
+    __slots__ = ("number", "given", "surname", "sex", "birth", "death", "famc", "fams", "ID")
+
+    def __init__(self, number, given, surname, sex, birth, death):
+        self.number = number
+        self.ID = "@I" + str(number) + "@"
+        self.given = given
+        self.surname = surname
+        self.sex = sex
+        self.birth = birth
+        self.death = death
+        self.famc = []
+        self.fams = []
+
+    @property
+    def name(self):
+        return self.given + " /" + self.surname + "/"
+
+
+class _Family(object):
+    """One marriage of the clan being built"""
+
+    __slots__ = ("ID", "husband", "wife", "married", "divorced", "children")
+
+    def __init__(self, number, husband, wife, married):
+        self.ID = "@F" + str(number) + "@"
+        self.husband = husband
+        self.wife = wife
+        self.married = married
+        self.divorced = None
+        self.children = []
+
+
+def surname(number):
+    """Makes up a surname that no other number gets
+
+    Args:
+        number (int): Which surname to make
+
+    Returns:
+        string: e.g. Dalnor
+    """
+    parts = []
+    while True:
+        number, digit = divmod(number, len(SYLLABLES))
+        parts.append(SYLLABLES[digit])
+        if number == 0 and len(parts) >= 2:
+            break
+    return "".join(parts).capitalize()
+
+
+def format_date(ordinal):
+    """Writes a day ordinal as a GEDCOM date
+
+    Args:
+        ordinal (int): Proleptic Gregorian ordinal of the date
+
+    Returns:
+        string: e.g. 7 JUL 1996
+    """
+    date = datetime.date.fromordinal(ordinal)
+    return str(date.day) + " " + MONTH_NAMES[date.month] + " " + str(date.year)
+
+
+def years(count):
+    """Number of days in a number of years, rounded up so age limits are always met"""
+    return int(count * YEAR) + 1
+
+
+class TreeGenerator(object):
+    """Writes random but realistic family trees, one clan at a time
+
+    Clean trees pass every error check: dates are in order, nobody marries before 18 or while
+    still married, children are born at least two calendar years apart (or as twins) while
+    both parents are alive, and names and birthdays never repeat. No day is after the 28th so
+    every birthday and anniversary exists in every year. Anomalies are injected at the given
+    rate per chance to inject them, e.g. per family for US04 or per living person for US01
+
+    Attributes:
+        seed (int): Seed of the random numbers
+        rates (dict): Chance of each anomaly in ANOMALIES, by user story
+        start_year (int): Founders are born in the 50 years from this year
+        end_year (int): No date is after this year, except for injected US01 deaths
+        as_of (int): Day ordinal the checks take as the current date, injected US01 deaths are
+        after it
+        generations (int): How many generations a clan has at most
+        clan_size (int): How many people a clan has at most
+        individuals (int): How many individuals were written, including injected ones
+        families (int): How many families were written, including injected ones
+        injected (dict): How many anomalies were injected for each user story
+    """
+
+    def __init__(self, seed=0, rates=None, start_year=1800, end_year=2020, generations=6, clan_size=500,
+                 as_of=None):
+        """Constructor for TreeGenerator
+
+        Args:
+            seed (int): Seed of the random numbers
+            rates (dict): Chance of each anomaly by user story, e.g. {"US11": 0.01}, none if not given
+            start_year (int): Founders are born in the 50 years from this year
+            end_year (int): No date is after this year
+            generations (int): How many generations a clan has at most
+            clan_size (int): How many people a clan has at most
+            as_of (int): Day ordinal the checks take as the current date, today if not given
+        """
+        super(TreeGenerator, self).__init__()
+        rates = dict(rates or {})
+        unknown = sorted(set(rates) - set(ANOMALIES))
+        if unknown:
+            raise ValueError("No anomaly for user stories: " + ", ".join(unknown))
+        self.seed = seed
+        self.rates = rates
+        self.start_year = start_year
+        self.end_year = end_year
+        self.generations = generations
+        self.clan_size = clan_size
+        self.as_of = today_ordinal() if as_of is None else as_of
+        self.end = datetime.date(end_year, 12, 28).toordinal()
+
+    def write(self, path, people):
+        """Writes a tree to a file
+
+        Args:
+            path (string): Where to write the GEDCOM file
+            people (int): How many people to generate, not counting injected extra records
+        """
+        with open(path, "w") as file:
+            for chunk in self.chunks(people):
+                file.write(chunk)
+
+    def chunks(self, people):
+        """Generates a tree as text, one clan at a time
+
+        Args:
+            people (int): How many people to generate, not counting injected extra records
+
+        Yields:
+            string: The next part of the GEDCOM file
+        """
+        self.rng = random.Random(self.seed)
+        self.individuals = 0
+        self.families = 0
+        self.injected = dict((story, 0) for story in self.rates)
+        self.surnames = 0
+        self.people_left = people
+
+        yield "0 HEAD\n"
+        while self.people_left > 0:
+            persons, families, extras = self._clan()
+            yield self._render(persons, families, extras)
+        yield "0 TRLR\n"
+
+    def _inject_here(self, story):
+        """Decides whether to inject an anomaly at this chance, and counts it if so"""
+        rate = self.rates.get(story, 0)
+        if rate > 0 and self.rng.random() < rate:
+            self.injected[story] += 1
+            return True
+        return False
+
+    def _date_between(self, low, high):
+        """Picks a day between two day ordinals, never after the 28th of a month"""
+        for _ in range(20):
+            ordinal = self.rng.randint(low, high)
+            if datetime.date.fromordinal(ordinal).day <= 28:
+                return ordinal
+        return low
+
+    def _lifespan(self, birth, adult=False):
+        """Picks the day someone born on birth dies, or None if they are alive at the end
+
+        Args:
+            birth (int): Day ordinal of the birth
+            adult (boolean): True if the person has to live to be at least 20
+        """
+        if not adult and self.rng.random() < EARLY_DEATH_CHANCE:
+            age = self.rng.randint(0, years(15))
+        else:
+            age = years(min(100, max(20, self.rng.gauss(74, 12)))) + self.rng.randint(0, 364)
+        death = birth + age
+        return None if death >= self.end else self._date_between(death, death + 30)
+
+    def _person(self, persons, taken, sex, surname, birth, death):
+        """Adds a person to the clan with a first name nobody else in it has on that birthday"""
+        names = MALE_NAMES if sex == "M" else FEMALE_NAMES
+        given = self.rng.choice(names)
+        tries = 0
+        while (given, surname, birth) in taken:
+            tries += 1
+            given = self.rng.choice(names) if tries < 10 else names[0] + str(tries)
+        taken.add((given, surname, birth))
+        self.individuals += 1
+        self.people_left -= 1
+        self.clan_left -= 1
+        person = _Person(self.individuals, given, surname, sex, birth, death)
+        persons.append(person)
+        return person
+
+    def _marry(self, person, after, persons, families, taken):
+        """Marries someone in the clan to a new person from outside it
+
+        Args:
+            person (_Person): The person from the clan
+            after (int): The marriage has to start after this day ordinal
+
+        Returns:
+            _Family: The new family or None if the marriage can't happen
+        """
+        if self.clan_left < 1:
+            return None
+        spouse_birth = self._date_between(person.birth - years(5), person.birth + years(5))
+        spouse_death = self._lifespan(spouse_birth, adult=True)
+        low = max(person.birth, spouse_birth) + years(18)
+        low = max(low, after + 30)
+        high = min(low + years(17), self.end)
+        for death in (person.death, spouse_death):
+            if death is not None:
+                high = min(high, death - 1)
+        if high - low < 60:
+            return None
+
+        self.surnames += 1
+        sex = "F" if person.sex == "M" else "M"
+        spouse = self._person(persons, taken, sex, surname(self.surnames), spouse_birth, spouse_death)
+        husband, wife = (person, spouse) if person.sex == "M" else (spouse, person)
+        self.families += 1
+        family = _Family(self.families, husband, wife, self._date_between(low, high))
+        husband.fams.append(family)
+        wife.fams.append(family)
+        families.append(family)
+
+        ends = [death for death in (husband.death, wife.death) if death is not None]
+        if self.rng.random() < DIVORCE_CHANCE and len(ends) < 2:
+            last = min(ends + [self.end])
+            if last - family.married > years(1) + 60:
+                family.divorced = self._date_between(family.married + years(1), last - 1)
+        return family
+
+    def _have_children(self, family, persons, taken, generation, queue):
+        """Adds the children of a family to the clan"""
+        husband, wife = family.husband, family.wife
+        low = family.married + 270
+        high = min(wife.birth + years(45), self.end)
+        for end in (husband.death, wife.death, family.divorced):
+            if end is not None:
+                high = min(high, end - 1)
+
+        count = self.rng.choices(range(len(CHILDREN_WEIGHTS)), CHILDREN_WEIGHTS)[0]
+        first = low + years(3)
+        yearly = False
+        if high - low > years(18) and self.clan_left >= 17 and self._inject_here("US15"):
+            # too many children to fit two years apart, so they come a year apart to the day,
+            # which keeps them more than 8 months apart (US13) and all of them within the mother's
+            # childbearing years (US12) and while both parents are alive (US09)
+            count = self.rng.randint(15, 17)
+            first = low + years(1)
+            yearly = True
+
+        birth = None
+        for _ in range(count):
+            if self.clan_left < 1:
+                return
+            if birth is None:
+                birth = self._date_between(low, first)
+            elif yearly:
+                date = datetime.date.fromordinal(birth)
+                birth = datetime.date(date.year + 1, date.month, date.day).toordinal()
+            elif self.rng.random() >= TWINS_CHANCE:
+                year = datetime.date.fromordinal(birth).year + self.rng.randint(2, 4)
+                birth = datetime.date(year, self.rng.randint(1, 12), self.rng.randint(1, 28)).toordinal()
+            if birth > high:
+                return
+            sex = self.rng.choice("MF")
+            child = self._person(persons, taken, sex, husband.surname, birth, self._lifespan(birth))
+            child.famc.append(family)
+            family.children.append(child)
+            if generation + 1 < self.generations:
+                queue.append((child, generation + 1))
+
+    def _clan(self):
+        """Builds the next clan
+
+        Returns:
+            tuple: (persons, families, extras) where extras are injected records that stand alone
+        """
+        persons = []
+        families = []
+        taken = set()
+        self.clan_left = min(self.clan_size, self.people_left)
+
+        self.surnames += 1
+        year = self.start_year + self.rng.randint(0, 49)
+        birth = datetime.date(year, self.rng.randint(1, 12), self.rng.randint(1, 28)).toordinal()
+        founder = self._person(persons, taken, self.rng.choice("MF"), surname(self.surnames),
+                               birth, self._lifespan(birth, adult=True))
+        queue = [(founder, 0)]
+        position = 0
+        while position < len(queue) and self.clan_left > 0:
+            person, generation = queue[position]
+            position += 1
+            if self.rng.random() >= MARRIAGE_CHANCE and generation > 0:
+                continue
+            after = person.birth
+            for _ in range(3):
+                family = self._marry(person, after, persons, families, taken)
+                if family is None:
+                    break
+                self._have_children(family, persons, taken, generation, queue)
+                # marriages end on the later of the divorce and the spouse's death
+                spouse = family.wife if family.husband is person else family.husband
+                ends = [end for end in (family.divorced, spouse.death) if end is not None]
+                if family.divorced is None and spouse.death is None:
+                    break
+                if self.rng.random() >= REMARRIAGE_CHANCE:
+                    break
+                after = max(ends)
+
+        extras = self._inject(persons, families)
+        return persons, families, extras
+
+    def _inject(self, persons, families):
+        """Changes the finished clan to add the anomalies
+
+        Returns:
+            list: Extra _Person records that stand alone, outside every family
+        """
+        extras = []
+        for person in list(persons):
+            if person.death is None:
+                if self._inject_here("US01"):
+                    # after the day the checks are run at, not after end_year, which may be past
+                    person.death = self._date_between(self.as_of + years(1), self.as_of + years(20))
+                elif self._inject_here("US07"):
+                    person.birth = self._date_between(self.end - years(170), self.end - years(152))
+            elif self._inject_here("US03"):
+                person.death = self._date_between(person.birth - years(10), person.birth - 30)
+            if self._inject_here("US22"):
+                extras.append(self._extra(person.ID, "Duplicate", person.surname, "M", person.birth, person.death))
+            if self._inject_here("US23"):
+                extras.append(self._extra(None, person.given, person.surname, person.sex, person.birth, person.death))
+            if self._inject_here("US42"):
+                extras.append(self._extra(None, "Bad", "Date", "F", "30 FEB " + str(self.end_year - 30)))
+
+        for family in list(families):
+            husband, wife = family.husband, family.wife
+            if self._inject_here("US04"):
+                family.divorced = self._date_between(family.married - years(5), family.married - 30)
+            if self._inject_here("US02"):
+                husband.birth = self._date_between(family.married + 30, family.married + years(5))
+            elif self._inject_here("US10"):
+                husband.birth = self._date_between(family.married - years(13), family.married - years(10))
+            if family.married - husband.birth > 60 and self._inject_here("US05"):
+                husband.death = self._date_between(husband.birth + 1, family.married - 30)
+            if family.divorced is not None and family.divorced > family.married + 60 and self._inject_here("US06"):
+                wife.death = self._date_between(family.married + 1, family.divorced - 30)
+            if self._inject_here("US21"):
+                husband.sex = "F"
+            if self._inject_here("US24"):
+                self.families += 1
+                copy = _Family(self.families, husband, wife, family.married)
+                husband.fams.append(copy)
+                wife.fams.append(copy)
+                families.append(copy)
+
+            children = family.children
+            if len(children) > 0:
+                if self._inject_here("US09"):
+                    last = max(child.birth for child in children)
+                    wife.death = self._date_between(max(family.married, last - 365), last - 1)
+                if self._inject_here("US12"):
+                    wife.birth = self._date_between(children[0].birth - years(65), children[0].birth - years(61))
+            if len(children) > 1:
+                if self._inject_here("US13"):
+                    children[1].birth = self._date_between(children[0].birth + 90, children[0].birth + 200)
+                elif self._inject_here("US25"):
+                    children[1].given = children[0].given
+                    children[1].birth = children[0].birth
+            brothers = [child for child in children if child.sex == "M"]
+            sisters = [child for child in children if child.sex == "F"]
+            if brothers and sisters and self._inject_here("US18"):
+                brother, sister = self.rng.choice(brothers), self.rng.choice(sisters)
+                low = max(brother.birth, sister.birth) + years(18)
+                married = self._date_between(low, max(low, min(low + years(10), self.end)))
+                self.families += 1
+                incest = _Family(self.families, brother, sister, married)
+                brother.fams.append(incest)
+                sister.fams.append(incest)
+                families.append(incest)
+
+            # an unmarried brother or sister of a parent who can marry one of the unmarried children
+            # while both are alive, so the marriage trips nothing else like bigamy
+            couples = []
+            for parent in (husband, wife):
+                for birth_family in parent.famc:
+                    for sibling in birth_family.children:
+                        for child in children:
+                            if sibling is not parent and sibling.sex != child.sex and not sibling.fams \
+                                    and not child.fams:
+                                low = max(sibling.birth, child.birth) + years(18)
+                                high = min([low + years(10), self.end] +
+                                           [death - 1 for death in (sibling.death, child.death) if death is not None])
+                                if high - low > 60:
+                                    couples.append((sibling, child, low, high))
+            if couples and self._inject_here("US20"):
+                sibling, child, low, high = self.rng.choice(couples)
+                man, woman = (sibling, child) if sibling.sex == "M" else (child, sibling)
+                self.families += 1
+                uncle = _Family(self.families, man, woman, self._date_between(low, high))
+                man.fams.append(uncle)
+                woman.fams.append(uncle)
+                families.append(uncle)
+
+        for person in persons:
+            families_in_order = sorted(person.fams, key=lambda family: family.married)
+            for first, second in zip(families_in_order, families_in_order[1:]):
+                # the first marriage ends on the later of the divorce and the spouse's death
+                first_spouse = first.wife if first.husband is person else first.husband
+                ends = [end for end in (first.divorced, first_spouse.death) if end is not None]
+                other = second.wife if second.husband is person else second.husband
+                low = max(first.married, other.birth + years(18)) + 1
+                high = min([second.married] + ends) - 1
+                if high - low > 1 and self._inject_here("US11"):
+                    second.married = self._date_between(low, high)
+        return extras
+
+    def _extra(self, ID, given, surname, sex, birth, death=None):
+        """Makes a record that stands alone, outside every family
+
+        Args:
+            ID (string): ID to give the record, a new one if None
+            birth (int): Day ordinal of the birthday, or the text to write if it is not a real date
+            death (int): Day ordinal of the death, None if alive
+
+        Returns:
+            tuple: (ID, name, sex, birthday, death) with the dates as they are written to the file
+        """
+        self.individuals += 1
+        if ID is None:
+            ID = "@I" + str(self.individuals) + "@"
+        birthday = birth if isinstance(birth, str) else format_date(birth)
+        return (ID, given + " /" + surname + "/", sex, birthday, None if death is None else format_date(death))
+
+    def _render(self, persons, families, extras):
+        """Writes the records of a clan
+
+        Returns:
+            string: The GEDCOM lines of every individual and family in the clan
+        """
+        lines = []
+        for person in persons:
+            lines += ["0 " + person.ID + " INDI", "1 NAME " + person.name, "1 SEX " + person.sex,
+                      "1 BIRT", "2 DATE " + format_date(person.birth)]
+            if person.death is not None:
+                lines += ["1 DEAT Y", "2 DATE " + format_date(person.death)]
+            lines += ["1 FAMC " + family.ID for family in person.famc]
+            lines += ["1 FAMS " + family.ID for family in person.fams]
+        for ID, name, sex, birthday, death in extras:
+            lines += ["0 " + ID + " INDI", "1 NAME " + name, "1 SEX " + sex, "1 BIRT", "2 DATE " + birthday]
+            if death is not None:
+                lines += ["1 DEAT Y", "2 DATE " + death]
+        for family in families:
+            lines += ["0 " + family.ID + " FAM", "1 HUSB " + family.husband.ID, "1 WIFE " + family.wife.ID]
+            lines += ["1 CHIL " + child.ID for child in family.children]
+            lines += ["1 MARR", "2 DATE " + format_date(family.married)]
+            if family.divorced is not None:
+                lines += ["1 DIV", "2 DATE " + format_date(family.divorced)]
+        return "\n".join(lines) + "\n"
+
+
+def generate(path, people, seed=0, rates=None, **options):
+    """Writes a synthetic GEDCOM file
+
+    Args:
+        path (string): Where to write the file
+        people (int): How many people to generate, not counting injected extra records
+        seed (int): Seed of the random numbers
+        rates (dict): Chance of each anomaly by user story, e.g. {"US11": 0.01}
+        **options: Other arguments of TreeGenerator
+
+    Returns:
+        TreeGenerator: The generator, with the counts of what it wrote
+    """
+    generator = TreeGenerator(seed, rates, **options)
+    generator.write(path, people)
+    return generator
+
+
+def parse_rates(values, everything=None):
+    """Reads anomaly rates given on the command line
+
+    Args:
+        values (list): Strings like US11=0.01
+        everything (float): Rate for every anomaly not given in values
+
+    Returns:
+        dict: Rate of each anomaly by user story
+    """
+    rates = dict((story, everything) for story in ANOMALIES) if everything else {}
+    for value in values or []:
+        story, _, rate = value.partition("=")
+        rates[story.upper()] = float(rate)
+    return rates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Writes a synthetic GEDCOM file for scale testing")
+    parser.add_argument("path", nargs="?", help="where to write the file")
+    parser.add_argument("--people", type=int, default=10000, help="how many people to generate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random numbers")
+    parser.add_argument("--rate", action="append", metavar="USxx=RATE",
+                        help="chance of injecting the anomaly for a user story, can be given more than once")
+    parser.add_argument("--all-rates", type=float, metavar="RATE", help="chance of injecting every anomaly")
+    parser.add_argument("--list", action="store_true", help="list the anomalies that can be injected and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for story, description in sorted(ANOMALIES.items()):
+            print(story + " | " + description)
+        return
+
+    if args.path is None:
+        print("Usage: python Generator.py <output file> [--people N] [--seed N] [--rate US11=0.01] [--all-rates RATE]")
+        return
+
+    try:
+        generator = generate(args.path, args.people, args.seed, parse_rates(args.rate, args.all_rates))
+    except ValueError as e:
+        print(e)
+        return
+    print("Wrote " + str(generator.individuals) + " individuals and " + str(generator.families) + " families")
+    for story, count in sorted(generator.injected.items()):
+        print(story + ": " + str(count) + " injected")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,746 @@
+# Incremental runs of the checks. The hash of every record and the result of every check are
+# remembered between runs on a file, so after an edit only the records whose text changed are
+# parsed again and only the checks those changes can affect are run again. The parsed records
+# are stored in a records file that is only rewritten once many of them changed, and each run
+# writes a small journal on top of it with the records that changed since. State files are
+# pickles, so only point this at a directory you trust
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+from array import array
+import Cache
+import Registry
+from Family import Family
+from Index import GenealogyIndex
+from Individual import Individual
+from Parser import parse_record, scan_records
+from Results import Group
+from Utils import today_ordinal
+
+# bump when the layout of a state file changes
+STATE_VERSION = 3
+
+# the state holds parsed records and check results, so changing any of these invalidates it
+SOURCES = Cache.SOURCES + ["Checks.py", "Incremental.py", "Registry.py", "Results.py"]
+
+# size in bytes of the hash kept for each record
+DIGEST_SIZE = 16
+
+# the records file is written again once more than one record in this many is kept in the journal
+JOURNAL_SHARE = 4
+
+# the fields that are compared when a record changes, as named in CheckSpec.reads
+FIELDS = {
+    "INDI": ("individual", ("ID", "name", "gender", "birthday", "death", "alive", "age", "child", "spouse")),
+    "FAM": ("family", ("ID", "married", "divorced", "husband_ID", "husband_name", "wife_ID", "wife_name",
+                       "children")),
+}
+
+# the fields the GenealogyIndex links records by, the index is built again when one changes
+LINKS = frozenset(["individual.ID", "individual.child", "family.ID", "family.husband_ID", "family.wife_ID",
+                   "family.children"])
+
+# stands in for a field that was never set on a record
+_MISSING = object()
+
+
+class Changes(object):
+    """What differs between the tree of the last run and this one
+
+    Attributes:
+        everything (boolean): True if there is no usable last run, so every check has to run
+        fields (set): Fields like "individual.death" that differ on at least one record, plus
+        "today" if the last run was measured at another as-of date
+        inputs (set): Registry.INDIVIDUALS and Registry.FAMILIES if records of that kind were
+        added or removed, or records of that kind that share an ID came in another order, which
+        changes what every check given that list loops over
+        replaced (dict): Maps the Individuals and Families of the last run that were parsed
+        again or removed to their new version, None if they were removed
+        reparsed (int): How many records were parsed again
+    """
+
+    def __init__(self, everything=False):
+        """Constructor for Changes
+
+        Args:
+            everything (boolean): True if every check has to run
+        """
+        super(Changes, self).__init__()
+        self.everything = everything
+        self.fields = set()
+        self.inputs = set()
+        self.replaced = {}
+        self.reparsed = 0
+
+    def affects(self, spec, result):
+        """Checks if a check's result from the last run could differ from running it now
+
+        Args:
+            spec (CheckSpec): The check
+            result (CheckResult): What it returned last run
+
+        Returns:
+            boolean: True if the check has to run again
+        """
+        if self.everything or spec.reads is None or not self.fields.isdisjoint(spec.reads):
+            return True
+        if spec.inputs == Registry.BOTH:
+            return bool(self.inputs)
+        return spec.inputs in self.inputs
+
+    def renew(self, result):
+        """Points the findings of a result the changes do not affect at the new version of the
+        records that were parsed again. None of the fields the check reads changed, so it would
+        find the same things, only the records it reports are out of date
+
+        Args:
+            result (CheckResult): What the check returned last run, changed in place
+
+        Returns:
+            CheckResult: The result, or None if a finding reports a record that was removed
+        """
+        if not self.replaced:
+            return result
+        for finding in result.findings:
+            if not any(self._stale(record) for record in finding.records):
+                continue
+            if any(self.replaced.get(member, member) is None for member in finding.members
+                   if isinstance(member, (Individual, Family))):
+                return None
+            finding.records = tuple(self._renewed(record) for record in finding.records)
+        return result
+
+    def _stale(self, record):
+        """Checks if a record that fills a finding, or a member of a Group, was parsed again or removed"""
+        if isinstance(record, Group):
+            return any(self._stale(member) for member in record.records)
+        return isinstance(record, (Individual, Family)) and record in self.replaced
+
+    def _renewed(self, record):
+        """Gets the new version of a record that fills a finding, with a Group's members renewed"""
+        if isinstance(record, Group):
+            return Group([self._renewed(member) for member in record.records], record.separator)
+        if isinstance(record, (Individual, Family)):
+            return self.replaced.get(record, record)
+        return record
+
+    def __bool__(self):
+        return self.everything or bool(self.fields or self.inputs or self.replaced)
+
+
+class IncrementalRun(object):
+    """Reads a GEDCOM file using what is known from the last run on it
+
+    Build it, print or check individuals and families, then get the check results from
+    run_checks and call save to remember this run for the next one.
+
+    The INDI and FAM records of the file are kept as parallel lists in file order, which
+    pickle much faster than an object per record. Each record also has a number that stays the
+    same from run to run, an edited record keeps the number of the record it replaces. The
+    stored state is a records file with every record at the position of its number, written
+    again only when there is none yet or much of it is out of date, and a journal written by
+    every run with the records that differ from the records file and the pickled results,
+    which point at records by their number so they stay valid when those records are edited.
+
+    Attributes:
+        path (string): Path to the GEDCOM file
+        state_dir (string): Directory the state of each file is kept in
+        file_digest (string): Hash of the whole file
+        tags (list): "INDI" or "FAM" for each record
+        xrefs (list): The ID on each record's level 0 line
+        digests (list): Hash of each record's bytes
+        values (list): The Individual or Family of each record, None if it could not be parsed
+        numbers (list): The number of each record
+        next_number (int): The number the next added record gets
+        messages (dict): Maps the position of a record that printed parse errors to the lines
+        individuals (list): Individuals sorted by ID, like main.load_tree
+        families (list): Families sorted by ID
+        index (GenealogyIndex): Index over individuals and families
+        as_of (int): Day ordinal the ages and date relative checks of this run are measured at
+        changes (Changes): What differs from the last run
+        results (dict): Maps a story to its CheckResult for every check whose result is up to date
+        rerun (int): How many checks run_checks ran again, the rest were reused
+        base (string): Token of the records file the stored state builds on, None if there is none
+        dirty (set): Numbers of the records that differ from their version in the records file
+        pickled (dict): Maps a story to its result as stored in the journal, for the results
+        that did not change since
+    """
+
+    def __init__(self, path, state_dir=None, as_of=None):
+        """Constructor for IncrementalRun, reads the file and prints the parse errors in file order
+
+        Args:
+            path (string): Path to the GEDCOM file
+            state_dir (string): Directory the state of each file is kept in, None to start
+            from nothing and only keep the state in memory for refresh
+            as_of (int): Day ordinal to measure at, today if not given
+        """
+        super(IncrementalRun, self).__init__()
+        self.path = path
+        self.state_dir = state_dir
+        self.rerun = 0
+
+        state = None if state_dir is None else load_state(state_dir, path)
+        if state is None:
+            state = {"base": None, "file_digest": None, "as_of": None, "tags": [], "xrefs": [], "digests": b"",
+                     "values": [], "numbers": [], "next_number": 0, "dirty": set(), "messages": {},
+                     "results": {}, "pickled": {}}
+        self.base = state["base"]
+        self.file_digest = state["file_digest"]
+        self.as_of = state["as_of"]
+        self.tags = state["tags"]
+        self.xrefs = state["xrefs"]
+        self.digests = _split_digests(state["digests"])
+        self.values = state["values"]
+        self.numbers = state["numbers"]
+        self.next_number = state["next_number"]
+        self.dirty = state["dirty"]
+        self.messages = state["messages"]
+        self.results = state["results"]
+        self.pickled = state["pickled"]
+        self.index = None
+
+        self._update(Changes(everything=self.file_digest is None), as_of)
+
+    def refresh(self, as_of=None):
+        """Reads the file again, building on this run instead of a stored state
+
+        This skips loading and saving the state, so a program that keeps the run around can
+        check a file after every edit much faster than starting a new run
+
+        Args:
+            as_of (int): Day ordinal to measure at, today if not given
+
+        Returns:
+            Changes: What differs from the last time the file was read
+        """
+        self._update(Changes(), as_of)
+        return self.changes
+
+    def _update(self, changes, as_of):
+        """Brings the records, lists and index up to date with the file
+
+        Args:
+            changes (Changes): Where to note what differs from the last time the file was read
+            as_of (int): Day ordinal to measure at, today if None
+        """
+        self.changes = changes
+        if as_of is None:
+            as_of = today_ordinal()
+        if self.as_of is not None and self.as_of != as_of:
+            changes.fields.add("today")
+        self.as_of = as_of
+
+        file_digest = Cache.file_digest(self.path)
+        last_tags, last_values = self.tags, self.values
+        if file_digest == self.file_digest:
+            # nothing in the file changed so every record is reused as it is
+            edits = []
+        else:
+            edits = self._read()
+            self.file_digest = file_digest
+
+        for position in sorted(self.messages):
+            for message in self.messages[position]:
+                print(message)
+
+        individuals = []
+        families = []
+        for tag, value in zip(self.tags, self.values):
+            if value is None:
+                continue
+            elif tag == "INDI":
+                individuals.append(value)
+            else:
+                families.append(value)
+
+        parsed = set(after for tag, before, after in edits)
+        if "today" in changes.fields:
+            self._update_ages([indi for indi in individuals if indi not in parsed])
+        renamed = self._link_names(individuals, families, parsed)
+        if renamed:
+            self.dirty.update(number for value, number in zip(self.values, self.numbers) if value in renamed)
+
+        # compare once the names are linked so new families are compared with their names
+        for tag, before, after in edits:
+            self._compare(tag, before, after)
+
+        # same order as main.load_tree
+        individuals.sort(key=lambda x: x.ID)
+        families.sort(key=lambda x: x.ID)
+        if edits:
+            self._note_reordered(last_tags, last_values, individuals, families)
+
+        # results that the changes can affect have to be worked out again, the others only
+        # have to point at the new version of the records they report
+        specs = dict((spec.story, spec) for spec in Registry.CHECKS)
+        results = {}
+        for story, result in self.results.items():
+            if story in specs and not changes.affects(specs[story], result):
+                result = changes.renew(result)
+                if result is not None:
+                    results[story] = result
+        self.results = results
+        self.pickled = dict((story, pickled) for story, pickled in self.pickled.items() if story in results)
+
+        if self._links_unchanged(individuals, families):
+            # the records link to each other as before, so the index only needs the new versions
+            for before, after in changes.replaced.items():
+                self.index.replace(before, after)
+        else:
+            self.index = GenealogyIndex(individuals, families)
+        self.individuals = individuals
+        self.families = families
+
+    def _note_reordered(self, tags, values, individuals, families):
+        """Notes the records that share an ID and come in another order than last read
+
+        Only their order tells records with the same ID apart, so checks that report them, like
+        US22, would list them in another order than a full run. The kinds of records this happens
+        to are noted in inputs, so the checks given them are run again
+
+        Args:
+            tags (list): The tag of each record of the last read, in file order
+            values (list): The Individual or Family of each record of the last read, in file order
+            individuals (list): This read's Individuals sorted by ID
+            families (list): This read's Families sorted by ID
+        """
+        changes = self.changes
+        for tag, records, kind in [("INDI", individuals, Registry.INDIVIDUALS), ("FAM", families, Registry.FAMILIES)]:
+            if kind in changes.inputs:
+                continue
+            shared = set(first.ID for first, second in zip(records, records[1:]) if first.ID == second.ID)
+            if not shared:
+                continue
+            # no record of this kind was removed, so each one of the last read has a version now
+            last = [changes.replaced.get(value, value) for value_tag, value in zip(tags, values)
+                    if value_tag == tag and value is not None and value.ID in shared]
+            last.sort(key=lambda x: x.ID)
+            if last != [record for record in records if record.ID in shared]:
+                changes.inputs.add(kind)
+
+    def _links_unchanged(self, individuals, families):
+        """Checks if the index of the last read can be kept by putting in the records that were
+        parsed again
+
+        Args:
+            individuals (list): This read's Individuals sorted by ID
+            families (list): This read's Families sorted by ID
+
+        Returns:
+            boolean: True if no record was added or removed, none of the fields the index is
+            built from changed and the records are in the same order as last read
+        """
+        changes = self.changes
+        if self.index is None or changes.everything or changes.inputs or not changes.fields.isdisjoint(LINKS):
+            return False
+        return ([changes.replaced.get(indi, indi) for indi in self.individuals] == individuals and
+                [changes.replaced.get(fam, fam) for fam in self.families] == families)
+
+    def _read(self):
+        """Matches the records in the file with the last read's and parses the ones that changed
+
+        A record whose bytes hash the same as a record of the last read reuses that record's
+        Individual or Family and number, wherever it moved in the file. A record that changed
+        is compared with a record of the last read with the same tag and xref that was not
+        reused, if there is one, to find out which fields changed, and takes over its number
+
+        Returns:
+            list: (tag, before, after) for every record that was parsed again or removed, with
+            the last read's and this read's Individual or Family or None
+        """
+        state = {"tags": self.tags, "xrefs": self.xrefs, "values": self.values, "numbers": self.numbers,
+                 "messages": self.messages}
+        # the first position of each hash, and the later ones of hashes several records share
+        count = len(self.digests)
+        unused = dict(zip(reversed(self.digests), range(count - 1, -1, -1)))
+        repeated = {}
+        if len(unused) < count:
+            for position, digest in enumerate(self.digests):
+                if unused[digest] != position:
+                    repeated.setdefault(digest, []).append(position)
+
+        self.tags = []
+        self.xrefs = []
+        self.digests = []
+        self.values = []
+        self.numbers = []
+        self.messages = {}
+        changed = []
+        for tag, xref, raw in scan_records(self.path):
+            digest = hashlib.blake2b(raw, digest_size=DIGEST_SIZE).digest()
+            position = unused.pop(digest, None)
+            if position is not None:
+                if digest in repeated:
+                    unused[digest] = repeated[digest].pop(0)
+                    if not repeated[digest]:
+                        del repeated[digest]
+                value = state["values"][position]
+                number = state["numbers"][position]
+                if position in state["messages"]:
+                    self.messages[len(self.values)] = state["messages"][position]
+            else:
+                messages = []
+                value = parse_record(raw, lambda message: messages.append(str(message)), self.as_of)
+                # numbered once it is known which record it replaces
+                number = None
+                if messages:
+                    self.messages[len(self.values)] = messages
+                changed.append((len(self.values), tag, xref, value))
+
+            self.tags.append(tag)
+            self.xrefs.append(xref)
+            self.digests.append(digest)
+            self.values.append(value)
+            self.numbers.append(number)
+        self.changes.reparsed = len(changed)
+
+        # records of the last read that were not reused were either edited or removed
+        before = {}
+        for position in sorted(list(unused.values()) + [position for positions in repeated.values()
+                                                        for position in positions]):
+            before.setdefault((state["tags"][position], state["xrefs"][position]), []).append(position)
+
+        edits = []
+        for position, tag, xref, value in changed:
+            positions = before.get((tag, xref))
+            if positions:
+                replaced = positions.pop(0)
+                self.numbers[position] = state["numbers"][replaced]
+                edits.append((tag, state["values"][replaced], value))
+            else:
+                self.numbers[position] = self.next_number
+                self.next_number += 1
+                edits.append((tag, None, value))
+            self.dirty.add(self.numbers[position])
+        for positions in before.values():
+            edits += [(state["tags"][position], state["values"][position], None) for position in positions]
+        return edits
+
+    def _update_ages(self, individuals):
+        """Brings the ages of Individuals from the last run up to the as-of date
+
+        Args:
+            individuals (list): Individuals that were not parsed again
+        """
+        for indi in individuals:
+            age = indi.age
+            indi.update_age(self.as_of)
+            if indi.age != age:
+                self.changes.fields.add("individual.age")
+
+    def _compare(self, tag, before, after):
+        """Notes what changed between the old and new version of one record
+
+        Args:
+            tag (string): "INDI" or "FAM"
+            before (object): The last run's Individual or Family, None if there was none
+            after (object): This run's Individual or Family, None if there is none
+        """
+        if before is None and after is None:
+            return
+        if before is not None:
+            self.changes.replaced[before] = after
+        if before is None or after is None:
+            self.changes.inputs.add(Registry.INDIVIDUALS if tag == "INDI" else Registry.FAMILIES)
+            return
+
+        kind, fields = FIELDS[tag]
+        for field in fields:
+            if getattr(before, field, _MISSING) != getattr(after, field, _MISSING):
+                self.changes.fields.add(kind + "." + field)
+
+    def _link_names(self, individuals, families, parsed):
+        """Fills in the husband and wife names of the families, like Parser.parse
+
+        Families from the last run keep their object, so a name that changed on them is noted
+        as a changed field
+
+        Args:
+            individuals (list): Individuals in file order
+            families (list): Families in file order
+            parsed (set): Individuals and Families parsed in this run, which are compared later
+
+        Returns:
+            set: Families from the last run whose names changed
+        """
+        individuals_by_ID = {}
+        for indi in individuals:
+            individuals_by_ID.setdefault(indi.ID, indi)
+
+        renamed = set()
+        for fam in families:
+            names = (fam.husband_name, fam.wife_name)
+            husband = individuals_by_ID.get(fam.husband_ID)
+            wife = individuals_by_ID.get(fam.wife_ID)
+            fam.wife_name = None if wife is None else wife.name
+            fam.husband_name = None if husband is None else husband.name
+
+            if fam in parsed or (fam.husband_name, fam.wife_name) == names:
+                continue
+            renamed.add(fam)
+            if fam.husband_name != names[0]:
+                self.changes.fields.add("family.husband_name")
+            if fam.wife_name != names[1]:
+                self.changes.fields.add("family.wife_name")
+        return renamed
+
+    def run_checks(self, specs, table=None, jobs=1, events=None):
+        """Runs the checks whose results are out of date and reuses the others
+
+        Args:
+            specs (list): CheckSpecs to run
+            table (IndividualTable): Columns over individuals, passed on to checks that accept one
+            jobs (int): How many processes to run checks in
+            events (EventIndex): Calendars of the events, passed on to checks that accept one
+
+        Yields:
+            tuple: (spec, result) for each check in the order given
+        """
+        stale = [spec for spec in specs if spec.story not in self.results]
+        fresh = Registry.run_checks(stale, self.individuals, self.families, self.index, jobs, table, self.as_of,
+                                    events)
+
+        # stale is in the same order as specs so the fresh results come in the order they are needed
+        stale = set(spec.story for spec in stale)
+        self.rerun = len(stale)
+        for spec in specs:
+            if spec.story in stale:
+                spec, result = next(fresh)
+                self.results[spec.story] = result
+            yield (spec, self.results[spec.story])
+
+    def save(self):
+        """Stores this run in state_dir so the next run on the file can build on it"""
+        if not self.changes and self.rerun == 0:
+            # the stored state already describes this run
+            return
+
+        if self.base is None or len(self.dirty) * JOURNAL_SHARE > len(self.values):
+            # number the records by their position for a new records file, which makes every
+            # pickled result out of date
+            self.base = None
+            self.numbers = list(range(len(self.values)))
+            self.next_number = len(self.values)
+            self.dirty = set()
+            self.pickled = {}
+
+        self.base = save_state(self.state_dir, self.path, {
+            "base": self.base, "file_digest": self.file_digest, "as_of": self.as_of, "tags": self.tags,
+            "xrefs": self.xrefs, "digests": b"".join(self.digests), "values": self.values, "numbers": self.numbers,
+            "next_number": self.next_number, "dirty": self.dirty, "messages": self.messages,
+            "results": self.results, "pickled": self.pickled})
+
+
+def _split_digests(digests):
+    """Splits the record hashes of a state back into one hash per record
+
+    Args:
+        digests (bytes): The hashes one after another
+
+    Returns:
+        list: The hash of each record
+    """
+    return [digests[i:i + DIGEST_SIZE] for i in range(0, len(digests), DIGEST_SIZE)]
+
+
+def _state_key():
+    """Builds the key a state file has to match to be used
+
+    Returns:
+        tuple: (state version, fingerprint of the sources)
+    """
+    return (STATE_VERSION, Cache.source_fingerprint(SOURCES))
+
+
+def _record(number):
+    """Stands in for the record with a number in a pickled result, _ResultUnpickler looks the
+    record up instead of calling this"""
+    raise pickle.UnpicklingError("record " + str(number) + " can only be loaded with its records")
+
+
+class _ResultPickler(pickle.Pickler):
+    """Pickles a CheckResult with the records it reports as their number
+
+    Attributes:
+        numbers (dict): Maps id() of each record to its number
+    """
+
+    def __init__(self, file, numbers):
+        super(_ResultPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.numbers = numbers
+
+    def reducer_override(self, obj):
+        # only called for objects that are not of a builtin type, so this is cheap
+        number = self.numbers.get(id(obj)) if isinstance(obj, (Individual, Family)) else None
+        if number is None:
+            return NotImplemented
+        return (_record, (number,))
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    """Unpickles a CheckResult, putting the records back in place of their numbers
+
+    Attributes:
+        records (list): The record of each number
+    """
+
+    def __init__(self, file, records):
+        super(_ResultUnpickler, self).__init__(file)
+        self.records = records
+
+    def find_class(self, module, name):
+        if module == __name__ and name == "_record":
+            return self.records.__getitem__
+        return super(_ResultUnpickler, self).find_class(module, name)
+
+
+def _paused_gc(function, *args):
+    """Calls a function with the cyclic garbage collector paused, for pickling and unpickling
+    the state, which only creates objects without reference cycles
+
+    Args:
+        function (function): The function to call
+        *args: Its arguments
+
+    Returns:
+        object: What the function returned
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return function(*args)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _write(entry, base, payload):
+    """Writes a state file through a temporary file so a crash never leaves half of one behind
+
+    Args:
+        entry (string): Path of the state file
+        base (string): Token of the records file
+        payload (object): The content
+    """
+    temporary = entry + "." + str(os.getpid()) + ".tmp"
+    with open(temporary, "wb") as file:
+        pickle.dump(_state_key(), file, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(base, file, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(payload, file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, entry)
+
+
+def _load_results(pickled, records):
+    """Unpickles the results of a journal
+
+    Args:
+        pickled (dict): Maps a story to its pickled result
+        records (list): The record of each number
+
+    Returns:
+        dict: Maps a story to its CheckResult
+    """
+    return dict((story, _ResultUnpickler(io.BytesIO(result), records).load())
+                for story, result in pickled.items())
+
+
+def load_state(state_dir, path):
+    """Loads the state of the last run on a file
+
+    Args:
+        state_dir (string): Directory the state of each file is kept in
+        path (string): Path to the GEDCOM file
+
+    Returns:
+        dict: The state of the last run, or None if there is no usable state
+    """
+    key = _state_key()
+    try:
+        with open(Cache.entry_path(state_dir, path, ".state"), "rb") as file:
+            if pickle.load(file) != key:
+                return None
+            base = pickle.load(file)
+            with open(Cache.entry_path(state_dir, path, ".records"), "rb") as records_file:
+                if pickle.load(records_file) != key or pickle.load(records_file) != base:
+                    # the journal was written on top of another records file
+                    return None
+                stored = Cache.load_payload(records_file)
+            state = Cache.load_payload(file)
+
+        numbers = array("q")
+        numbers.frombytes(state["numbers"])
+        state["numbers"] = numbers.tolist()
+        # the record of each number, as stored in the records file unless the journal has it
+        tags = stored["tags"] + [None] * (state["next_number"] - len(stored["tags"]))
+        xrefs = stored["xrefs"] + [None] * (state["next_number"] - len(stored["xrefs"]))
+        records = stored["values"] + [None] * (state["next_number"] - len(stored["values"]))
+        if stored["as_of"] != state["as_of"]:
+            # the journal was measured at another day than the records file
+            for value in stored["values"]:
+                if isinstance(value, Individual):
+                    value.update_age(state["as_of"])
+        state["dirty"] = set(state["records"])
+        for number, (tag, xref, value) in state.pop("records").items():
+            tags[number], xrefs[number], records[number] = tag, xref, value
+        state["results"] = _paused_gc(_load_results, state["pickled"], records)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, IndexError,
+            KeyError):
+        # missing, unreadable or outdated state means starting over
+        return None
+
+    state["base"] = base
+    state["tags"] = [tags[number] for number in state["numbers"]]
+    state["xrefs"] = [xrefs[number] for number in state["numbers"]]
+    state["values"] = [records[number] for number in state["numbers"]]
+    return state
+
+
+def save_state(state_dir, path, state):
+    """Stores the state of a run on a file
+
+    Writes a new records file first if the state builds on none, then the journal with the
+    records in dirty and the results, pickling the ones that are not in pickled yet
+
+    Args:
+        state_dir (string): Directory the state of each file is kept in, created if needed
+        path (string): Path to the GEDCOM file
+        state (dict): The state of the run. A base of None asks for a new records file, which
+        needs every record numbered by its position. Results pickled here are added to pickled
+
+    Returns:
+        string: Token of the records file the stored state builds on, None if there is none
+    """
+    base = state["base"]
+    numbers = state["numbers"]
+    values = state["values"]
+    pickled = state["pickled"]
+    try:
+        os.makedirs(state_dir, exist_ok=True)
+        if base is None:
+            token = os.urandom(16).hex()
+            _paused_gc(_write, Cache.entry_path(state_dir, path, ".records"), token,
+                       {"as_of": state["as_of"], "tags": state["tags"], "xrefs": state["xrefs"], "values": values})
+            base = token
+
+        stale = [story for story in state["results"] if story not in pickled]
+        if stale:
+            by_id = dict((id(value), number) for value, number in zip(values, numbers) if value is not None)
+            for story in stale:
+                file = io.BytesIO()
+                _paused_gc(_ResultPickler(file, by_id).dump, state["results"][story])
+                pickled[story] = file.getvalue()
+
+        dirty = state["dirty"]
+        records = dict((number, (tag, xref, value)) for tag, xref, value, number
+                       in zip(state["tags"], state["xrefs"], values, numbers) if number in dirty)
+        _paused_gc(_write, Cache.entry_path(state_dir, path, ".state"), base, {
+            "file_digest": state["file_digest"], "as_of": state["as_of"], "digests": state["digests"],
+            "numbers": array("q", numbers).tobytes(), "next_number": state["next_number"], "records": records,
+            "messages": state["messages"], "pickled": pickled})
+    except OSError as e:
+        print("Could not write incremental state: " + str(e), file=sys.stderr)
+    return base
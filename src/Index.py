@@ -0,0 +1,318 @@
+import gc
+
+
+class XrefTable(object):
+    """Gives each GEDCOM xref like @I12@ a dense integer 0, 1, 2, ... and maps it back for display
+
+    Attributes:
+        numbers (dict): Maps an xref to its number
+        xrefs (list): Maps a number back to its xref
+    """
+
+    def __init__(self):
+        """Constructor for XrefTable"""
+        super(XrefTable, self).__init__()
+        self.numbers = {}
+        self.xrefs = []
+
+    def number(self, xref):
+        """Gets the number of an xref, giving it the next free number the first time it is seen
+
+        Args:
+            xref (string): The xref, e.g. @I12@
+
+        Returns:
+            int: The number of the xref
+        """
+        number = self.numbers.get(xref)
+        if number is None:
+            number = self.numbers[xref] = len(self.xrefs)
+            self.xrefs.append(xref)
+        return number
+
+    def get(self, xref):
+        """Gets the number of an xref without adding it
+
+        Args:
+            xref (string): The xref, e.g. @I12@
+
+        Returns:
+            int: The number of the xref or None if it has not been seen
+        """
+        return self.numbers.get(xref)
+
+    def xref(self, number):
+        """Gets the xref a number stands for
+
+        Args:
+            number (int): A number handed out by this table
+
+        Returns:
+            string: The xref, e.g. @I12@
+        """
+        return self.xrefs[number]
+
+    def __contains__(self, xref):
+        return xref in self.numbers
+
+    def __len__(self):
+        return len(self.xrefs)
+
+
+class GenealogyIndex(object):
+    """Lookup tables over a parsed tree so checks can find related records in constant time
+
+    Build it once after parsing (and after any sorting, since the per-family lists keep the
+    order of the individuals list) and pass it to every check.
+
+    Every individual xref, including ones a family links to but that are not in the tree, gets
+    a dense number from individual_xrefs, and every family is a row in the families list. The
+    links between them are stored as lists of those integers, so walking the tree only indexes
+    into lists and hashes small ints.
+
+    Families are used directly as dictionary keys, so two families that share a duplicated
+    ID still get their own entries.
+
+    Attributes:
+        individual_xrefs (XrefTable): Numbers for individual IDs
+        family_xrefs (XrefTable): Numbers for family IDs
+        individuals_by_number (list): Maps an individual number to the first Individual with that
+        ID, or None if no Individual has it
+        families (list): The Families, a family's row is its position in this list
+        family_rows (dict): Maps a Family to its row
+        husbands (list): Maps a family row to the number of its husband
+        wives (list): Maps a family row to the number of its wife
+        children_numbers (list): Maps a family row to the numbers of its children, each listed once
+        spouse_rows (list): Maps an individual number to the rows of the families they are a
+        husband or wife in, in families order
+        child_rows (list): Maps an individual number to the rows of the families that list them
+        as a child, in families order
+        birth_families (list): Maps an individual number to the set of family numbers their FAMC
+        tags point to
+        individuals_by_ID (dict): Maps an individual ID to the first Individual with that ID
+        families_by_ID (dict): Maps a family ID to the first Family with that ID
+        children_by_family (dict): Maps a Family to the list of Individuals that are its
+        children, in individuals order
+        spouses_by_family (dict): Maps a Family to the list of Individuals that are its husband
+        or wife, in individuals order
+    """
+
+    def __init__(self, individuals, families):
+        """Constructor for GenealogyIndex
+
+        Args:
+            individuals (list): List of Individual objects
+            families (list): List of Family objects
+        """
+        super(GenealogyIndex, self).__init__()
+
+        # the index is hundreds of thousands of small lists and sets without reference cycles,
+        # so the cyclic garbage collector is paused instead of scanning the tree over and over
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._build(individuals, families)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _build(self, individuals, families):
+        """Fills in the lookup tables
+
+        Args:
+            individuals (list): List of Individual objects
+            families (list): List of Family objects
+        """
+        self.individual_xrefs = XrefTable()
+        self.family_xrefs = XrefTable()
+        self.individuals_by_ID = {}
+        self.families_by_ID = {}
+        self.families = list(families)
+        self.family_rows = {}
+        self.husbands = []
+        self.wives = []
+        self.children_numbers = []
+
+        # number the individuals first so their numbers follow the individuals order
+        numbers = [self.individual_xrefs.number(indi.ID) for indi in individuals]
+
+        number = self.individual_xrefs.number
+        for row, fam in enumerate(self.families):
+            self.family_xrefs.number(fam.ID)
+            self.families_by_ID.setdefault(fam.ID, fam)
+            self.family_rows[fam] = row
+            self.husbands.append(number(fam.husband_ID))
+            self.wives.append(number(fam.wife_ID))
+            # dict.fromkeys drops repeated children and keeps the order they are listed in
+            self.children_numbers.append(tuple(dict.fromkeys(number(ID) for ID in fam.children)))
+
+        count = len(self.individual_xrefs)
+        self.individuals_by_number = [None] * count
+        self.spouse_rows = [[] for _ in range(count)]
+        self.child_rows = [[] for _ in range(count)]
+        self.birth_families = [frozenset()] * count
+
+        for row in range(len(self.families)):
+            self.spouse_rows[self.husbands[row]].append(row)
+            if self.wives[row] != self.husbands[row]:
+                self.spouse_rows[self.wives[row]].append(row)
+            for child in self.children_numbers[row]:
+                self.child_rows[child].append(row)
+
+        self.children_by_family = dict((fam, []) for fam in self.families)
+        self.spouses_by_family = dict((fam, []) for fam in self.families)
+
+        # walk the individuals last so the per family lists come out in individuals order
+        for indi, indi_number in zip(individuals, numbers):
+            if self.individuals_by_number[indi_number] is None:
+                self.individuals_by_number[indi_number] = indi
+                self.individuals_by_ID[indi.ID] = indi
+                self.birth_families[indi_number] = frozenset(
+                    self.family_xrefs.number(ID) for ID in indi.child)
+
+            for row in self.child_rows[indi_number]:
+                self.children_by_family[self.families[row]].append(indi)
+
+            for row in self.spouse_rows[indi_number]:
+                self.spouses_by_family[self.families[row]].append(indi)
+
+    def replace(self, old, new):
+        """Puts a new version of a record in place of the old one, e.g. after it was parsed again,
+        without building the index again. The new version has to have the same ID and link to
+        the same records: the same FAMC tags, or the same husband, wife and children
+
+        Args:
+            old (object): The Individual or Family in the index
+            new (object): Its new version
+        """
+        if old in self.family_rows:
+            row = self.family_rows.pop(old)
+            self.family_rows[new] = row
+            self.families[row] = new
+            if self.families_by_ID.get(old.ID) is old:
+                self.families_by_ID[old.ID] = new
+            self.children_by_family[new] = self.children_by_family.pop(old)
+            self.spouses_by_family[new] = self.spouses_by_family.pop(old)
+            return
+
+        number = self.individual_xrefs.get(old.ID)
+        if number is None:
+            return
+        if self.individuals_by_number[number] is old:
+            self.individuals_by_number[number] = new
+            self.individuals_by_ID[old.ID] = new
+        for rows, by_family in [(self.child_rows, self.children_by_family),
+                                (self.spouse_rows, self.spouses_by_family)]:
+            for row in rows[number]:
+                members = by_family[self.families[row]]
+                members[:] = [new if member is old else member for member in members]
+
+    def _rows(self, rows, indi):
+        """Looks up the family rows of an individual in spouse_rows or child_rows
+
+        Args:
+            rows (list): spouse_rows or child_rows
+            indi (Individual): The individual to look up
+
+        Returns:
+            list: The family rows, empty if the individual is not in the index
+        """
+        number = self.individual_xrefs.get(indi.ID)
+        if number is None:
+            return []
+        return rows[number]
+
+    def children(self, indi):
+        """Gets the children of an individual from every family they are a spouse in
+
+        Args:
+            indi (Individual): The parent to look up
+
+        Returns:
+            list: list of Individuals, each child listed once
+        """
+        return self._unique(self.children_by_family[self.families[row]]
+                            for row in self._rows(self.spouse_rows, indi))
+
+    def siblings(self, indi):
+        """Gets the siblings of an individual from every family they are a child in
+
+        Args:
+            indi (Individual): The individual to look up
+
+        Returns:
+            list: list of Individuals, each sibling listed once. This includes indi
+        """
+        return self._unique(self.children_by_family[self.families[row]]
+                            for row in self._rows(self.child_rows, indi))
+
+    def spouses(self, indi):
+        """Gets everyone an individual is married to
+
+        Args:
+            indi (Individual): The individual to look up
+
+        Returns:
+            list: list of Individuals, each spouse listed once
+        """
+        spouses = self._unique(self.spouses_by_family[self.families[row]]
+                               for row in self._rows(self.spouse_rows, indi))
+        # each family's spouse list holds both partners so drop indi itself
+        return [spouse for spouse in spouses if spouse.ID != indi.ID]
+
+    def share_birth_family(self, first, second):
+        """Checks if two individuals' FAMC tags point to a common family
+
+        Args:
+            first (Individual): One individual
+            second (Individual): The other individual
+
+        Returns:
+            boolean: True if they list a child family in common
+        """
+        first = self.individual_xrefs.get(first.ID)
+        second = self.individual_xrefs.get(second.ID)
+        if first is None or second is None:
+            return False
+        return not self.birth_families[first].isdisjoint(self.birth_families[second])
+
+    @staticmethod
+    def _unique(groups):
+        """Flattens lists of Individuals keeping the first time each one appears
+
+        Args:
+            groups (iterable): lists of Individuals
+
+        Returns:
+            list: list of Individuals with no repeats
+        """
+        seen = set()
+        result = []
+        for group in groups:
+            for indi in group:
+                if indi not in seen:
+                    seen.add(indi)
+                    result.append(indi)
+        return result
+
+    def husband(self, family):
+        """Gets the husband of a family
+
+        Args:
+            family (Family): The family to look up
+
+        Returns:
+            Individual: The husband or None if they are not in the tree
+        """
+        return self.individuals_by_number[self.husbands[self.family_rows[family]]]
+
+    def wife(self, family):
+        """Gets the wife of a family
+
+        Args:
+            family (Family): The family to look up
+
+        Returns:
+            Individual: The wife or None if they are not in the tree
+        """
+        return self.individuals_by_number[self.wives[self.family_rows[family]]]
@@ -1,68 +1,146 @@
-from Utils import parse_line, calculate_age, check_date
+from sys import intern
+from Utils import parse_line, check_date, date_ordinal, today_ordinal, years_between
 
 
 class Individual(object):
     """Class for an Individual that holds the data of an INDI in gedcom files
 
     Attributes:
-        age (int): Age (in years)
+        age (int): Age (in years) at the as-of date, None without a birthday. Worked out the
+        first time it is read
+        as_of (int): Day ordinal the age is measured at
         alive (boolean): true/false if the individual is alive
         birthday (string): String of date in the format %d %b %Y (from here http://strftime.org/)
-        child (list): list of strings that match the ID of another family
+        birth_ordinal (int): birthday as a day ordinal, kept in sync whenever birthday is set
+        child (tuple): tuple of strings that match the ID of another family
         death (string): Either the date of death (same format as birthday) or None if the individual is alive
+        death_ordinal (int): death as a day ordinal or None, kept in sync whenever death is set
         gender (string): F/M depending on the gender of the individual
         ID (string): ID of the individual
         name (string): Name of the individual in the format Firstname /Lastname/
-        spouse (list): List of strings that match the ID of another family
+        spouse (tuple): tuple of strings that match the ID of another family
     """
 
-    def __init__(self, tag_list):
+    # no per instance __dict__, so an Individual only takes the space of these fields
+    __slots__ = ("ID", "name", "gender", "_birthday", "birth_ordinal", "_death", "death_ordinal",
+                 "alive", "_age", "as_of", "child", "spouse")
+
+    def __init__(self, tag_list, as_of=None):
         """Constructor for Individual
 
         Args:
             tag_list (list): A list of all the lines of the GEDCOM file relating to this Individual
+            as_of (int): Day ordinal to measure the age at, today if not given
         """
         super(Individual, self).__init__()
+        self._load([parse_line(line) for line in tag_list], as_of)
+
+    @classmethod
+    def from_tokens(cls, tokens, as_of=None):
+        """Builds an Individual from lines that have already been tokenized
+
+        Args:
+            tokens (list): A list of (level, tag, args, valid) tuples from parse_line
+            as_of (int): Day ordinal to measure the age at, today if not given
+
+        Returns:
+            Individual: The parsed Individual
+        """
+        indi = cls.__new__(cls)
+        indi._load(tokens, as_of)
+        return indi
+
+    def _load(self, tokens, as_of):
+        """Fills in the Individual from its tokenized GEDCOM lines
+
+        Args:
+            tokens (list): A list of (level, tag, args, valid) tuples from parse_line
+            as_of (int): Day ordinal to measure the age at, today if None
+        """
         # default values
+        self.as_of = today_ordinal() if as_of is None else as_of
         self.alive = True
-        self.child = []
-        self.spouse = []
         self.death = None
+        child = []
+        spouse = []
 
         # look at all lines we have
-        for i in range(len(tag_list)):
-            level, tag, args, valid = parse_line(tag_list[i])
+        for i in range(len(tokens)):
+            level, tag, args, valid = tokens[i]
 
             # only look at valid tags and get data from tags
             if valid:
+                # IDs, genders and dates repeat across records so share one copy of each
                 if tag == "NAME":
                     self.name = args
                 elif tag == "SEX":
-                    self.gender = args
+                    self.gender = intern(args)
                 elif tag == "BIRT":
                     # skip a line to get the actual date
-                    level, tag, args, valid = parse_line(tag_list[i + 1])
-                    self.birthday = args
+                    level, tag, args, valid = tokens[i + 1]
+                    self.birthday = intern(args)
                 elif tag == "DEAT":
                     self.alive = False
                     # skip a line to get the actual date
-                    level, tag, args, valid = parse_line(tag_list[i + 1])
-                    self.death = args
+                    level, tag, args, valid = tokens[i + 1]
+                    self.death = intern(args)
                 elif tag == "INDI":
-                    self.ID = args
+                    self.ID = intern(args)
                 elif tag == "FAMC":
-                    self.child.append(args)
+                    child.append(intern(args))
                 elif tag == "FAMS":
-                    self.spouse.append(args)
+                    spouse.append(intern(args))
+
+        self.child = tuple(child)
+        self.spouse = tuple(spouse)
 
         #check dates
         dates = [self.birthday, self.death]
-        check_date(self.ID, dates)
+        check_date(self.ID, dates, [self.birth_ordinal, self.death_ordinal])
+
+    @property
+    def age(self):
+        try:
+            return self._age
+        except AttributeError:
+            # not worked out yet, or the as-of date moved since
+            self._age = years_between(self.birth_ordinal, self.as_of) if hasattr(self, "birth_ordinal") else None
+            return self._age
+
+    @age.setter
+    def age(self, value):
+        self._age = value
+
+    def update_age(self, as_of):
+        """Measures the age at another date from now on, e.g. after loading a cached Individual
+
+        Args:
+            as_of (int): Day ordinal to measure the age at
+        """
+        self.as_of = as_of
+        try:
+            del self._age
+        except AttributeError:
+            pass
+
+    @property
+    def birthday(self):
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, value):
+        # parse the date once here so the checks can compare ordinals
+        self._birthday = value
+        self.birth_ordinal = date_ordinal(value)
+
+    @property
+    def death(self):
+        return self._death
 
-        if hasattr(self, "birthday"):
-            self.age = calculate_age(self.birthday)
-        else:
-            self.age = None
+    @death.setter
+    def death(self, value):
+        self._death = value
+        self.death_ordinal = date_ordinal(value)
 
     def __str__(self):
         return "{ID: " + str(self.ID) + \
@@ -72,8 +150,8 @@ class Individual(object):
             "| Age: " + str(self.age) + \
             "| Alive: " + str(self.alive) + \
             "| Death: " + str(self.death) + \
-            "| Child: " + str(self.child) + \
-            "| Spouse: " + str(self.spouse) + "}"
+            "| Child: " + str(list(self.child)) + \
+            "| Spouse: " + str(list(self.spouse)) + "}"
 
     def __repr__(self):
         return self.__str__()
@@ -2,95 +2,415 @@
 # CS 555
 # Project 3
 
+import gc
+import locale
+import mmap
+import multiprocessing
+import os
 from Family import Family
 from Individual import Individual
-from Utils import parse_line
+from Profiler import DISABLED
+from Utils import parse_line, is_valid, today_ordinal
 
+# tags whose value is read from the line after them, see Individual._load and Family._load
+EVENT_TAGS = ("BIRT", "DEAT", "MARR", "DIV")
+
+# tags Individual._load and Family._load read at any level, whether or not the tag is valid there
+READ_TAGS = frozenset(["INDI", "NAME", "SEX", "FAMC", "FAMS", "FAM", "HUSB", "WIFE", "CHIL"] + list(EVENT_TAGS))
+
+
+class ParseResult(tuple):
+    """The (individuals, families) tuple returned by parse, plus an ID lookup
+
+    It still unpacks like a plain tuple, so existing callers keep working
+
+    Attributes:
+        individuals (list): List of Individual objects
+        families (list): List of Family objects
+        individuals_by_ID (dict): Maps each individual ID to its Individual. If an ID is
+        duplicated the first Individual in the file wins
+    """
+
+    def __new__(cls, individuals, families, individuals_by_ID):
+        result = super(ParseResult, cls).__new__(cls, (individuals, families))
+        result.individuals = individuals
+        result.families = families
+        result.individuals_by_ID = individuals_by_ID
+        return result
+
+    def __getnewargs__(self):
+        return (self.individuals, self.families, self.individuals_by_ID)
+
+
+def tokenize(path):
+    """Reads a GEDCOM file one line at a time and tokenizes each line exactly once
 
-def parse(path):
-    """Parses a GEDCOM file and returns all individuals and families
     Args:
         path (string): Path to the GEDCOM file
-    Returns:
-        tuple: A tuple in the form (individuals, families) where all individuals and
-        families are parsed into their respective objects and stored in an array
+
+    Yields:
+        tuple: (level, tag, args, valid) for every non-blank line, as returned by parse_line
     """
-    # get the info from the gedcom file
     with open(path, 'r') as file:
-        lines = [line.rstrip() for line in file]
+        for line in file:
+            line = line.rstrip()
 
-    # stores various data
-    individuals_data = []
-    families_data = []
-    indexes = []
+            # blank lines carry no data
+            if line:
+                yield parse_line(line)
 
-    # grab the indexes of INDI or FAM tags
-    for i in range(len(lines)):
-        level, tag, args, valid = parse_line(lines[i])
 
-        if tag == "INDI":
-            indexes.append((i, "INDI"))
-        elif tag == "FAM":
-            indexes.append((i, "FAM"))
+def iter_records(path):
+    """Streams the INDI and FAM records of a GEDCOM file
 
-    # make sure to also get stuff if there is only one object
-    if len(indexes) == 1:
-        index, tag = indexes[0]
+    A record starts at its level 0 INDI/FAM line and ends at the next level 0 line,
+    so a record is emitted as soon as the following level 0 line is read and only one
+    record's tokens are held in memory at a time
 
-        if tag == "INDI":
-            individuals_data.append(lines[index:])
+    Args:
+        path (string): Path to the GEDCOM file
 
-        if tag == "FAM":
-            families_data.append(lines[index:])
+    Yields:
+        tuple: (tag, tokens) where tag is "INDI" or "FAM" and tokens is the list of
+        tokenized lines belonging to that record
+    """
+    tag = None
+    tokens = []
+
+    for token in tokenize(path):
+        if token[0] == "0":
+            # a new level 0 line closes whatever record we were building
+            if tag is not None:
+                yield (tag, tokens)
+
+            if token[1] == "INDI" or token[1] == "FAM":
+                tag = token[1]
+                tokens = [token]
+            else:
+                tag = None
+                tokens = []
+        elif tag is not None:
+            tokens.append(token)
+
+    # make sure to also emit the last record in the file
+    if tag is not None:
+        yield (tag, tokens)
+
+
+def map_records(path, start=0, end=None):
+    """Streams the INDI and FAM records of a GEDCOM file straight from a memory map
+
+    Record and line boundaries are found on the raw bytes, so records that are not INDI or FAM
+    are skipped without being decoded, and inside a record only the lines Individual and Family
+    read are decoded: lines with a valid tag and the date line after each event. The tokens
+    are the same as iter_records gives for those lines
 
-    # grab the lines that correspond to the INDIs and FAMs
-    for i in range(len(indexes) - 1):
-        index, tag = indexes[i]
-        next_index, next_tag = indexes[i + 1]
+    Args:
+        path (string): Path to the GEDCOM file
+        start (int): Byte offset to start reading at, reading begins at the first record that
+        starts at or after it
+        end (int): Byte offset to stop at, records that start before it are read to their end
+
+    Yields:
+        tuple: (tag, tokens) where tag is "INDI" or "FAM" and tokens is the list of
+        tokenized lines of that record that the objects use
+    """
+    encoding = locale.getpreferredencoding(False)
+    for data, start, line_end, stop, header in _map_headers(path, start, end, encoding):
+        if header[1] == "INDI" or header[1] == "FAM":
+            yield (header[1], [header] + _record_tokens(data[line_end + 1:stop], encoding))
 
-        if tag == "INDI":
-            individuals_data.append(lines[index:next_index])
 
-        if tag == "FAM":
-            families_data.append(lines[index:next_index])
+def scan_records(path):
+    """Streams the raw bytes of the INDI and FAM records of a GEDCOM file
 
-        # make sure to grab the last set of data if we are at the end
-        if i == (len(indexes) - 2):
-            if next_tag == "INDI":
-                individuals_data.append(lines[next_index:])
+    Only the level 0 line of each record is decoded, so this is much cheaper than tokenizing
+    the records and is meant for finding which records changed between two versions of a file
+
+    Args:
+        path (string): Path to the GEDCOM file
 
-            if next_tag == "FAM":
-                families_data.append(lines[next_index:])
+    Yields:
+        tuple: (tag, xref, raw) where tag is "INDI" or "FAM", xref is the record's ID and raw
+        is every byte of the record including its level 0 line
+    """
+    encoding = locale.getpreferredencoding(False)
+    for data, start, line_end, stop, header in _map_headers(path, 0, None, encoding):
+        if header[1] == "INDI" or header[1] == "FAM":
+            yield (header[1], header[2], data[start:stop])
+
+
+def parse_record(raw, report=print, as_of=None):
+    """Builds the Individual or Family for one record from scan_records
+
+    Args:
+        raw (bytes): The bytes of the record including its level 0 line
+        report (function): Called with each line of the error message if the record is invalid
+        as_of (int): Day ordinal to measure ages at, today if not given
+
+    Returns:
+        Individual or Family: The parsed record, None if it could not be parsed
+    """
+    encoding = locale.getpreferredencoding(False)
+    line_end = raw.find(b"\n")
+    line_end = len(raw) if line_end == -1 else line_end
+    header = parse_line(raw[:line_end].rstrip().decode(encoding))
+    return _build(header[1], [header] + _record_tokens(raw[line_end + 1:], encoding), report,
+                  today_ordinal() if as_of is None else as_of)
+
+
+def _map_headers(path, start, end, encoding):
+    """Finds the records of a GEDCOM file in a memory map and decodes their level 0 lines
+
+    Args:
+        path (string): Path to the GEDCOM file
+        start (int): Byte offset to start reading at, reading begins at the first record that
+        starts at or after it
+        end (int): Byte offset to stop at, records that start before it are read to their end
+        encoding (string): Encoding of the file
+
+    Yields:
+        tuple: (data, start, line_end, stop, header) where data is the map, the record is
+        data[start:stop], its level 0 line ends at line_end and header is that line tokenized
+    """
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped and have no records anyway
+            return
+
+    with data:
+        if end is None or end > len(data):
+            end = len(data)
+
+        # find the first level 0 line, so ranges that split the file anywhere still give
+        # each record to exactly one of them
+        if start > 0 or data[:2] != b"0 ":
+            start = data.find(b"\n0 ", max(start - 1, 0))
+            start = -1 if start == -1 else start + 1
+
+        while start != -1 and start < end:
+            # a record runs from its level 0 line to the next one
+            stop = data.find(b"\n0 ", start)
+            stop = len(data) if stop == -1 else stop + 1
+            line_end = data.find(b"\n", start, stop)
+            line_end = stop if line_end == -1 else line_end
+
+            yield (data, start, line_end, stop, parse_line(data[start:line_end].rstrip().decode(encoding)))
+
+            start = stop if stop < len(data) else -1
+
+
+def _record_tokens(body, encoding):
+    """Tokenizes the lines of one record that Individual and Family read
+
+    Args:
+        body (bytes): The record's lines after its level 0 line
+        encoding (string): Encoding of the file
+
+    Returns:
+        list: (level, tag, args, valid) tuples like parse_line gives
+    """
+    tokens = []
+    after_event = False
+    for line in body.split(b"\n"):
+        line = line.rstrip()
 
-    # Creating the actual objects
+        # blank lines carry no data
+        if not line:
+            continue
+
+        fields = line.split(b" ", 2)
+        key = (fields[0], fields[1])
+        kind = _line_kinds.get(key)
+        if kind is None:
+            kind = _line_kinds[key] = _line_kind(fields[0], fields[1], encoding)
+        level, tag, valid, read, event = kind
+
+        # other lines are skipped by the objects, unless an event reads its date from them
+        if read or after_event:
+            args = fields[2].decode(encoding) if len(fields) == 3 else ""
+            tokens.append((level, tag, args, valid))
+        after_event = event
+    return tokens
+
+
+# maps the raw (level, tag) of a line to what _line_kind made of it, there are only a few
+# dozen distinct pairs so every line after the first few is a single lookup
+_line_kinds = {}
+
+
+def _line_kind(level, tag, encoding):
+    """Decodes and validates the level and tag of a line
+
+    Args:
+        level (bytes): The level from the line
+        tag (bytes): The tag from the line
+        encoding (string): Encoding of the file
+
+    Returns:
+        tuple: (level, tag, valid, read, event) where read is True if the objects read the
+        line and event is True if the line after this one holds the event's date
+    """
+    level = level.decode(encoding)
+    tag = tag.decode(encoding)
+    return (level, tag, is_valid(level, tag), tag in READ_TAGS, tag in EVENT_TAGS)
+
+
+def parse(path, workers=1, profiler=None, as_of=None):
+    """Parses a GEDCOM file and returns all individuals and families
+    Args:
+        path (string): Path to the GEDCOM file
+        workers (int): How many processes to parse in. With more than one the file is cut into
+        byte ranges on record boundaries and each range is parsed in its own process. The
+        result is the same as parsing in one process
+        profiler (Profiler): Measures reading the records and linking the names, if given
+        as_of (int): Day ordinal to measure ages at, today if not given
+    Returns:
+        ParseResult: A tuple in the form (individuals, families) where all individuals and
+        families are parsed into their respective objects and stored in an array. The
+        individuals_by_ID attribute maps individual IDs to their objects
+    """
+    if profiler is None:
+        profiler = DISABLED
+    if as_of is None:
+        as_of = today_ordinal()
+
+    with profiler.stage("parse records"):
+        if workers <= 1:
+            individuals, families = _parse_range(path, 0, None, print, as_of)
+        else:
+            individuals = []
+            families = []
+            for chunk_individuals, chunk_families, messages in _parse_in_pool(path, workers, as_of):
+                # errors come out in file order, like in a single process
+                for message in messages:
+                    print(message)
+                individuals.extend(chunk_individuals)
+                families.extend(chunk_families)
+
+    with profiler.stage("link spouse names"):
+        # the first individual with an ID wins, whichever range it came from
+        individuals_by_ID = {}
+        for indi in individuals:
+            individuals_by_ID.setdefault(indi.ID, indi)
+
+        # get the husband and wife names which are linked from Individuals
+        for fam in families:
+            husband = individuals_by_ID.get(fam.husband_ID)
+            wife = individuals_by_ID.get(fam.wife_ID)
+
+            if wife is not None:
+                fam.wife_name = wife.name
+
+            if husband is not None:
+                fam.husband_name = husband.name
+
+    return ParseResult(individuals, families, individuals_by_ID)
+
+
+def _parse_range(path, start, end, report, as_of):
+    """Builds the Individuals and Families whose records start in a byte range of the file
+
+    Args:
+        path (string): Path to the GEDCOM file
+        start (int): Byte offset the range starts at
+        end (int): Byte offset the range ends at, None for the end of the file
+        report (function): Called with each line of the error messages
+        as_of (int): Day ordinal to measure ages at
+
+    Returns:
+        tuple: (individuals, families) in file order
+    """
     individuals = []
     families = []
 
-    for data in individuals_data:
+    # build the objects as the records stream in
+    for tag, tokens in map_records(path, start, end):
+        record = _build(tag, tokens, report, as_of)
+        if record is None:
+            continue
+        elif tag == "INDI":
+            individuals.append(record)
+        else:
+            families.append(record)
+
+    return (individuals, families)
+
+
+def _build(tag, tokens, report, as_of):
+    """Builds the Individual or Family for one record's tokens
+
+    Args:
+        tag (string): "INDI" or "FAM"
+        tokens (list): The record's tokens from map_records
+        report (function): Called with each line of the error message if the record is invalid
+        as_of (int): Day ordinal to measure the Individual's age at
+
+    Returns:
+        Individual or Family: The parsed record, None if it could not be parsed
+    """
+    if tag == "INDI":
         try:
-            indi = Individual(data)
-            individuals.append(indi)
+            return Individual.from_tokens(tokens, as_of)
         except ValueError as e:
-            print(e)
-            print("Error Individual will not be parsed")
-
-    for data in families_data:
+            report(e)
+            report("Error Individual will not be parsed")
+    else:
         try:
-            fam = Family(data)
+            return Family.from_tokens(tokens)
+        except ValueError as e:
+            report(e)
+            report("Error Family will not be parsed")
+    return None
 
-            # get the husband and wife names which are linked from Individuals
-            husband = [man for man in individuals if man.ID == fam.husband_ID]
-            wife = [woman for woman in individuals if woman.ID == fam.wife_ID]
 
-            if len(wife) > 0:
-                fam.wife_name = wife[0].name
+def _parse_in_pool(path, workers, as_of):
+    """Parses byte ranges of a file in a pool of processes
 
-            if len(husband) > 0:
-                fam.husband_name = husband[0].name
+    Args:
+        path (string): Path to the GEDCOM file
+        workers (int): How many processes to use, one range each
+        as_of (int): Day ordinal to measure ages at
 
-            families.append(fam)
-        except ValueError as e:
-            print(e)
-            print("Error Family will not be parsed")
+    Yields:
+        tuple: (individuals, families, messages) for each range in file order, where messages
+        are the error lines the range would have printed
+    """
+    size = os.path.getsize(path)
+    bounds = [size * k // workers for k in range(workers + 1)]
+    ranges = [(path, bounds[k], bounds[k + 1], as_of) for k in range(workers)]
 
-    return (individuals, families)
+    if "fork" in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context("fork").Pool(workers)
+    else:
+        pool = multiprocessing.Pool(workers)
+
+    # unpickling the results creates objects without reference cycles, so the cyclic garbage
+    # collector is paused instead of scanning them over and over
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with pool:
+            # imap hands the ranges back in file order
+            for result in pool.imap(_parse_range_in_worker, ranges):
+                yield result
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _parse_range_in_worker(task):
+    """Parses one byte range in a worker process
+
+    Args:
+        task (tuple): (path, start, end, as_of)
+
+    Returns:
+        tuple: (individuals, families, messages)
+    """
+    path, start, end, as_of = task
+    messages = []
+    individuals, families = _parse_range(path, start, end, messages.append, as_of)
+    return (individuals, families, [str(message) for message in messages])
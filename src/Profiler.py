@@ -0,0 +1,191 @@
+# Measures where a run spends its time and memory, for --profile. Stages are timed with
+# Profiler.stage, which costs next to nothing when profiling is off because DISABLED hands
+# back the same empty context manager every time
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+from Table import write_table
+
+
+class Stage(object):
+    """What was measured for one named stage, summed over every time it ran
+
+    Attributes:
+        name (string): Name of the stage, e.g. parse records or US11
+        calls (int): How many times the stage ran
+        wall (float): Wall clock seconds
+        cpu (float): CPU seconds of this process
+        peak (int): Most bytes the stage had allocated at once on top of what was allocated
+        when it started, None if memory was not traced
+    """
+
+    __slots__ = ("name", "calls", "wall", "cpu", "peak")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = None
+
+    def to_dict(self):
+        return {"stage": self.name, "calls": self.calls, "wall_seconds": self.wall,
+                "cpu_seconds": self.cpu, "peak_bytes": self.peak}
+
+
+class Profiler(object):
+    """Records the wall time, CPU time and tracemalloc peak of named stages
+
+    Stages can nest, e.g. parsing runs inside the stage that loads the cache when the file
+    was not cached yet, so the times of all stages can add up to more than the total
+
+    Attributes:
+        stages (dict): Stage by name, in the order they first ran
+        memory (boolean): True if allocations are traced for the peak memory of each stage
+    """
+
+    def __init__(self, memory=True):
+        """Constructor for Profiler, starts the clock for the whole run
+
+        Args:
+            memory (boolean): Trace allocations with tracemalloc, which makes everything slower
+        """
+        super(Profiler, self).__init__()
+        self.stages = {}
+        self.memory = memory
+        # (wall, cpu, traced bytes, highest peak seen) at the start of each running stage
+        self._running = []
+        self._tracing = memory and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time())
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Measures the code inside a with block as the stage name
+
+        Args:
+            name (string): Name of the stage, times add up when the same name runs again
+        """
+        self._start()
+        try:
+            yield
+        finally:
+            self._stop(name)
+
+    def items(self, iterable, name):
+        """Measures how long each item of an iterable takes to produce, e.g. a check in
+        Registry.run_checks, as a stage named after the item
+
+        Args:
+            iterable (iterable): The items
+            name (function): Takes an item and returns the name of its stage
+
+        Yields:
+            object: The items of iterable
+        """
+        iterator = iter(iterable)
+        while True:
+            self._start()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._running.pop()
+                return
+            self._stop(name(item))
+            yield item
+
+    def _start(self):
+        traced = peak = 0
+        if self.memory:
+            traced, peak = tracemalloc.get_traced_memory()
+            if self._running:
+                # the peak is about to be reset, so keep the outer stage's peak so far
+                self._running[-1][3] = max(self._running[-1][3], peak)
+            tracemalloc.reset_peak()
+        self._running.append([time.perf_counter(), time.process_time(), traced, 0])
+
+    def _stop(self, name):
+        wall, cpu, traced, highest = self._running.pop()
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage(name)
+        stage.calls += 1
+        stage.wall += time.perf_counter() - wall
+        stage.cpu += time.process_time() - cpu
+        if self.memory:
+            highest = max(highest, tracemalloc.get_traced_memory()[1])
+            stage.peak = max(stage.peak or 0, highest - traced)
+            if self._running:
+                self._running[-1][3] = max(self._running[-1][3], highest)
+
+    def total(self):
+        """Wall and CPU seconds since the profiler was made
+
+        Returns:
+            tuple: (wall, cpu)
+        """
+        return time.perf_counter() - self._started[0], time.process_time() - self._started[1]
+
+    def summary(self):
+        """Lists the stages, slowest first
+
+        Returns:
+            list: Stages sorted by wall time
+        """
+        return sorted(self.stages.values(), key=lambda stage: stage.wall, reverse=True)
+
+    def print_summary(self, file=None):
+        """Prints a table of the stages, slowest first
+
+        Args:
+            file (file): Where to print the table, defaults to sys.stderr
+        """
+        if file is None:
+            file = sys.stderr
+        wall, cpu = self.total()
+
+        def row(stage):
+            return [stage.name, str(stage.calls), "{:.4f}".format(stage.wall), "{:.4f}".format(stage.cpu),
+                    "-" if stage.peak is None else "{:.1f}".format(stage.peak / 2 ** 20),
+                    "{:.1f}".format(100 * stage.wall / wall if wall else 0)]
+
+        file.write("==============================Profile===============================\n")
+        write_table(["Stage", "Calls", "Wall s", "CPU s", "Peak MB", "% of run"], self.summary(), row, file=file)
+        file.write("Total: {:.4f} s wall, {:.4f} s CPU".format(wall, cpu) +
+                   (" (memory tracing slows everything down)" if self.memory else "") + "\n")
+
+    def write_json(self, path):
+        """Writes the stages and totals as JSON
+
+        Args:
+            path (string): Where to write the file
+        """
+        wall, cpu = self.total()
+        with open(path, "w") as file:
+            json.dump({"wall_seconds": wall, "cpu_seconds": cpu, "memory_traced": self.memory,
+                       "stages": [stage.to_dict() for stage in self.summary()]}, file, indent=1)
+
+    def close(self):
+        """Stops tracing allocations if the profiler started it"""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+
+class DisabledProfiler(object):
+    """Stands in for a Profiler when profiling is off and measures nothing"""
+
+    _nothing = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._nothing
+
+    def items(self, iterable, name):
+        return iterable
+
+
+# used wherever a profiler is optional and none was given
+DISABLED = DisabledProfiler()
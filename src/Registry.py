@@ -0,0 +1,309 @@
+# Registry of the user story checks so they can be selected, ordered and run without
+# hard coding each one in main
+import inspect
+import multiprocessing
+from Results import Group
+
+# what a check needs to be called with
+INDIVIDUALS = "individuals"
+FAMILIES = "families"
+BOTH = "both"
+
+# rough cost of a check in the size of the tree
+LINEAR = "linear"
+LOG_LINEAR = "n log n"
+QUADRATIC = "quadratic"
+
+# every registered check in the order they were declared, which is the order they run in
+CHECKS = []
+
+# the (individuals, families, index, table, as_of, events) a worker process runs its checks against
+_tree = None
+
+# maps id() of each Individual and Family in _tree to its _Reference, made by a worker on first use
+_references = None
+
+
+class CheckSpec(object):
+    """Describes one registered check
+
+    Attributes:
+        story (string): User story ID, e.g. US11
+        title (string): Title printed above the check's output
+        function (function): The check itself
+        inputs (string): INDIVIDUALS, FAMILIES or BOTH depending on what the check is called with
+        cost (string): LINEAR, LOG_LINEAR or QUADRATIC
+        takes_index (boolean): True if the check accepts a shared GenealogyIndex
+        takes_table (boolean): True if the check accepts a columnar IndividualTable
+        takes_as_of (boolean): True if the check accepts the day ordinal of the as-of date
+        takes_events (boolean): True if the check accepts a shared EventIndex
+        reads (frozenset): Fields like "individual.death" or "family.married" that decide what
+        the check finds, plus "today" if it compares against the as-of date, or None if
+        unknown. Which records are in its inputs and the records it reports are not listed,
+        see Incremental.Changes
+    """
+
+    def __init__(self, story, title, function, inputs, cost, reads=None):
+        """Constructor for CheckSpec
+
+        Args:
+            story (string): User story ID, e.g. US11
+            title (string): Title printed above the check's output
+            function (function): The check itself
+            inputs (string): INDIVIDUALS, FAMILIES or BOTH
+            cost (string): LINEAR, LOG_LINEAR or QUADRATIC
+            reads (iterable): Fields that decide what the check finds, None if unknown
+        """
+        super(CheckSpec, self).__init__()
+        self.story = story
+        self.title = title
+        self.function = function
+        self.inputs = inputs
+        self.cost = cost
+        self.reads = None if reads is None else frozenset(reads)
+        parameters = inspect.signature(function).parameters
+        self.takes_index = "index" in parameters
+        self.takes_table = "table" in parameters
+        self.takes_as_of = "as_of" in parameters
+        self.takes_events = "events" in parameters
+
+    def header(self):
+        """Builds the line printed above the check's output
+
+        Returns:
+            string: e.g. User Story 11: No bigamy
+        """
+        return "User Story " + self.story[2:] + ": " + self.title
+
+    def __str__(self):
+        return self.story + " | " + self.title + " | " + self.inputs + " | " + self.cost
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def check(story, title, inputs, cost=LINEAR, reads=None):
+    """Decorator that registers a function in Checks.py as a user story check
+
+    Args:
+        story (string): User story ID, e.g. US11
+        title (string): Title printed above the check's output
+        inputs (string): INDIVIDUALS, FAMILIES or BOTH
+        cost (string): LINEAR, LOG_LINEAR or QUADRATIC
+        reads (iterable): Fields like "individual.death" that decide what the check finds,
+        None if unknown
+
+    Returns:
+        function: decorator that returns the function unchanged
+    """
+    def register(function):
+        CHECKS.append(CheckSpec(story, title, function, inputs, cost, reads))
+        return function
+    return register
+
+
+def normalize_story(story):
+    """Turns user input like 11, us11 or US11 into a registered story ID
+
+    Args:
+        story (string): The story the user typed
+
+    Returns:
+        string: The story ID in the form US<number>
+
+    Throws: ValueError, if no check is registered for the story
+    """
+    story = story.strip().upper()
+    if not story.startswith("US"):
+        story = "US" + story
+    if story[2:].isdigit():
+        story = "US" + story[2:].zfill(2)
+    if story not in [spec.story for spec in CHECKS]:
+        raise ValueError("Unknown user story: " + story)
+    return story
+
+
+def get_checks(only=None, skip=None):
+    """Selects which checks to run
+
+    Args:
+        only (list): Stories to run, or None to run everything
+        skip (list): Stories to leave out, or None
+
+    Returns:
+        list: list of CheckSpecs in registration order
+
+    Throws: ValueError, if an unknown story is given
+    """
+    only = None if only is None else set(normalize_story(story) for story in only)
+    skip = set() if skip is None else set(normalize_story(story) for story in skip)
+    return [spec for spec in CHECKS
+            if (only is None or spec.story in only) and spec.story not in skip]
+
+
+def run_check(spec, individuals, families, index=None, table=None, as_of=None, events=None):
+    """Runs one check with the inputs it asks for
+
+    Args:
+        spec (CheckSpec): The check to run
+        individuals (list): List of Individual objects
+        families (list): List of Family objects
+        index (GenealogyIndex): Shared index, passed on to checks that accept one
+        table (IndividualTable): Columns over individuals, passed on to checks that accept one
+        as_of (int): Day ordinal of the as-of date, passed on to checks that accept one
+        events (EventIndex): Calendars of the events, passed on to checks that accept one
+
+    Returns:
+        CheckResult: whatever the check returns, which unpacks to (result, output)
+    """
+    if spec.inputs == INDIVIDUALS:
+        args = [individuals]
+    elif spec.inputs == FAMILIES:
+        args = [families]
+    else:
+        args = [individuals, families]
+
+    shared = {}
+    if spec.takes_index and index is not None:
+        shared["index"] = index
+    if spec.takes_table and table is not None:
+        shared["table"] = table
+    if spec.takes_as_of and as_of is not None:
+        shared["as_of"] = as_of
+    if spec.takes_events and events is not None:
+        shared["events"] = events
+    return spec.function(*args, **shared)
+
+
+def run_checks(specs, individuals, families, index=None, jobs=1, table=None, as_of=None, events=None):
+    """Runs checks, either one after another or spread across a pool of processes
+
+    With more than one job the tree is handed to the workers once, by forking where the
+    platform supports it or by pickling it once per worker otherwise, and each worker
+    runs whole checks. Results still come back in the order of specs.
+
+    Args:
+        specs (list): CheckSpecs to run
+        individuals (list): List of Individual objects
+        families (list): List of Family objects
+        index (GenealogyIndex): Shared index, passed on to checks that accept one
+        jobs (int): How many processes to run checks in
+        table (IndividualTable): Columns over individuals, passed on to checks that accept one
+        as_of (int): Day ordinal of the as-of date, passed on to checks that accept one
+        events (EventIndex): Calendars of the events, passed on to checks that accept one
+
+    Yields:
+        tuple: (spec, result) for each check in the order given
+    """
+    if jobs <= 1 or len(specs) <= 1:
+        for spec in specs:
+            yield (spec, run_check(spec, individuals, families, index, table, as_of, events))
+        return
+
+    global _tree
+    tree = (individuals, families, index, table, as_of, events)
+    jobs = min(jobs, len(specs))
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # forked workers inherit the tree without copying or pickling it
+        _tree = tree
+        pool = multiprocessing.get_context("fork").Pool(jobs)
+    else:
+        pool = multiprocessing.Pool(jobs, _init_worker, (tree,))
+
+    try:
+        with pool:
+            # imap hands results back in the order the specs were given
+            for spec, result in zip(specs, pool.imap(_run_in_worker, specs)):
+                yield (spec, _attach(result, individuals, families))
+    finally:
+        _tree = None
+
+
+class _Reference(object):
+    """Stands in for a record of the tree in a result sent back from a worker process
+
+    Attributes:
+        families (boolean): True for a Family, False for an Individual
+        position (int): Where the record is in the list of families or individuals
+    """
+
+    __slots__ = ("families", "position")
+
+    def __init__(self, families, position):
+        self.families = families
+        self.position = position
+
+
+def _detach(result):
+    """Swaps the records of the tree in a result's findings for _References, so the result
+    pickles without copies of them
+
+    Args:
+        result (CheckResult): A result made in a worker process
+
+    Returns:
+        CheckResult: The same result, changed in place
+    """
+    global _references
+    if _references is None:
+        individuals, families = _tree[0], _tree[1]
+        _references = dict((id(record), _Reference(False, position)) for position, record in enumerate(individuals))
+        _references.update((id(record), _Reference(True, position)) for position, record in enumerate(families))
+
+    def detach(value):
+        if isinstance(value, Group):
+            return Group([detach(record) for record in value.records], value.separator)
+        return _references.get(id(value), value)
+
+    for finding in result.findings:
+        finding.records = tuple(detach(record) for record in finding.records)
+    return result
+
+
+def _attach(result, individuals, families):
+    """Puts the records of the tree back in place of the _References of a result from a worker,
+    so its findings point at the same objects as a result made in this process would
+
+    Args:
+        result (CheckResult): A result from _run_in_worker
+        individuals (list): List of Individual objects the checks ran on
+        families (list): List of Family objects the checks ran on
+
+    Returns:
+        CheckResult: The same result, changed in place
+    """
+    def attach(value):
+        if isinstance(value, Group):
+            return Group([attach(record) for record in value.records], value.separator)
+        if isinstance(value, _Reference):
+            return (families if value.families else individuals)[value.position]
+        return value
+
+    for finding in result.findings:
+        finding.records = tuple(attach(record) for record in finding.records)
+    return result
+
+
+def _init_worker(tree):
+    """Stores the tree in a worker process that could not inherit it
+
+    Args:
+        tree (tuple): (individuals, families, index, table, as_of, events)
+    """
+    global _tree
+    _tree = tree
+
+
+def _run_in_worker(spec):
+    """Runs one check in a worker process against the tree it was given
+
+    Args:
+        spec (CheckSpec): The check to run
+
+    Returns:
+        CheckResult: whatever the check returns with the records of the tree swapped for
+        _References, see _attach
+    """
+    individuals, families, index, table, as_of, events = _tree
+    return _detach(run_check(spec, individuals, families, index, table, as_of, events))
@@ -0,0 +1,151 @@
+# Machine readable report of the check results. Every finding is written as one JSON object
+# on its own line (NDJSON) as soon as its check is done, so a pipeline can read the report of
+# a huge tree one line at a time instead of scraping the printed text
+import datetime
+import json
+import sys
+from Family import Family
+from Individual import Individual
+
+# the date fields of each kind of record, with the attribute holding each one as a day ordinal
+DATE_FIELDS = {
+    "individual": (("birthday", "birth_ordinal"), ("death", "death_ordinal")),
+    "family": (("married", "married_ordinal"), ("divorced", "divorced_ordinal")),
+}
+
+# how many bytes of the report are collected before they are written to the file
+BUFFER_SIZE = 1 << 20
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def record_kind(record):
+    """Names the kind of a record the way CheckSpec.reads does
+
+    Args:
+        record (object): A member of a finding
+
+    Returns:
+        string: "individual", "family" or None for plain values
+    """
+    if isinstance(record, Individual):
+        return "individual"
+    if isinstance(record, Family):
+        return "family"
+    return None
+
+
+def finding_dates(finding, reads=None):
+    """Lists the dates of the records in a finding that the check looked at
+
+    Args:
+        finding (Finding): The finding to describe
+        reads (frozenset): Fields the check reads, see CheckSpec.reads. Every date is listed if None
+
+    Returns:
+        list: One dict per date with the record ID, the field, the date as written in the file
+        and the same date in ISO format, or None if it could not be read
+    """
+    dates = []
+    for record in finding.members:
+        kind = record_kind(record)
+        if kind is None:
+            continue
+        for field, ordinal_field in DATE_FIELDS[kind]:
+            if reads is not None and kind + "." + field not in reads:
+                continue
+            text = getattr(record, field)
+            if text is None:
+                continue
+            ordinal = getattr(record, ordinal_field)
+            dates.append({
+                "record": record.ID,
+                "field": field,
+                "text": text,
+                "date": None if ordinal is None else datetime.date.fromordinal(ordinal).isoformat(),
+            })
+    return dates
+
+
+def finding_line(spec, finding):
+    """Builds the report line of one finding
+
+    Args:
+        spec (CheckSpec): The check that made the finding
+        finding (Finding): The finding
+
+    Returns:
+        dict: The fields of the line
+    """
+    return {
+        "type": "finding",
+        "story": finding.story,
+        "severity": finding.severity,
+        "records": finding.record_IDs,
+        "dates": finding_dates(finding, spec.reads),
+        "message": finding.render().rstrip("\n"),
+    }
+
+
+def check_line(spec, result):
+    """Builds the line written after the findings of a check
+
+    Args:
+        spec (CheckSpec): The check
+        result (CheckResult): What it returned
+
+    Returns:
+        dict: The fields of the line
+    """
+    return {
+        "type": "check",
+        "story": spec.story,
+        "title": spec.title,
+        "ok": result.ok,
+        "findings": len(result.findings),
+    }
+
+
+class ReportWriter(object):
+    """Writes check results to a file as NDJSON
+
+    Attributes:
+        file (file): Where the lines go
+        lines (int): How many lines were written so far
+    """
+
+    def __init__(self, file):
+        """Constructor for ReportWriter
+
+        Args:
+            file (file): Text file to write the lines to
+        """
+        super(ReportWriter, self).__init__()
+        self.file = file
+        self.lines = 0
+
+    def write(self, spec, result):
+        """Writes a line for every finding of a check, then one for the check itself
+
+        Args:
+            spec (CheckSpec): The check
+            result (CheckResult): What it returned
+        """
+        for finding in result.findings:
+            self.file.write(_encoder.encode(finding_line(spec, finding)) + "\n")
+        self.file.write(_encoder.encode(check_line(spec, result)) + "\n")
+        self.lines += len(result.findings) + 1
+
+
+def open_report(path):
+    """Opens the file a report is written to
+
+    Args:
+        path (string): Path of the report, or "-" for the standard output
+
+    Returns:
+        file: A buffered text file, the caller closes it unless it is sys.stdout
+    """
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", buffering=BUFFER_SIZE, encoding="utf-8")
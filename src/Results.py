@@ -0,0 +1,157 @@
+# Structured results for the user story checks. Findings keep references to the records
+# they are about and are only turned into text when the output is actually needed
+
+# how serious a finding is
+ERROR = "error"
+NOTE = "note"
+INFO = "info"
+
+
+class Group(object):
+    """Several records that fill one slot of a finding's message
+
+    Attributes:
+        records (list): The records in the group
+        separator (string): Text put between the records when rendered
+    """
+
+    __slots__ = ("records", "separator")
+
+    def __init__(self, records, separator=" "):
+        """Constructor for Group
+
+        Args:
+            records (list): The records in the group
+            separator (string): Text put between the records when rendered
+        """
+        self.records = records
+        self.separator = separator
+
+    def __str__(self):
+        return self.separator.join(str(record) for record in self.records)
+
+
+class Finding(object):
+    """One error, anomaly or listing found by a check
+
+    Attributes:
+        story (string): User story ID of the check that made the finding, e.g. US11
+        severity (string): ERROR, NOTE or INFO
+        template (string): str.format template for the message, e.g. "Error: {0} has a non-unique ID\\n"
+        records (tuple): Individuals, Families, Groups or plain values that fill the template
+    """
+
+    __slots__ = ("story", "severity", "template", "records")
+
+    def __init__(self, story, severity, template, *records):
+        """Constructor for Finding
+
+        Args:
+            story (string): User story ID of the check that made the finding
+            severity (string): ERROR, NOTE or INFO
+            template (string): str.format template for the message
+            *records: Values that fill the template, in the order of its fields
+        """
+        self.story = story
+        self.severity = severity
+        self.template = template
+        self.records = records
+
+    @property
+    def members(self):
+        """The records that fill the template with the members of each Group in their place"""
+        members = []
+        for record in self.records:
+            members += record.records if isinstance(record, Group) else [record]
+        return members
+
+    @property
+    def record_IDs(self):
+        """IDs of the Individuals and Families the finding is about, in the order they are given"""
+        return [member.ID for member in self.members if hasattr(member, "ID")]
+
+    def render(self):
+        """Builds the text of the finding
+
+        Returns:
+            string: The filled in template
+        """
+        return self.template.format(*self.records)
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return "Finding(" + self.story + ", " + self.severity + ", " + repr(self.render()) + ")"
+
+
+class CheckResult(object):
+    """What a check returns. Unpacks like the old (result, output) tuples so
+    result, output = check(...) still works, but the output is only rendered when asked for
+
+    Attributes:
+        story (string): User story ID of the check, e.g. US11
+        findings (list): The Findings in the order they were found
+        ok (boolean): True if the check passed
+        passed (string): Output used when the check passed
+    """
+
+    def __init__(self, story, findings, passed="", ok=None):
+        """Constructor for CheckResult
+
+        Args:
+            story (string): User story ID of the check
+            findings (list): Findings in the order they should be output
+            passed (string): Output used when the check passed
+            ok (boolean): Whether the check passed. Defaults to True when there are no findings
+        """
+        super(CheckResult, self).__init__()
+        self.story = story
+        self.findings = findings
+        self.passed = passed
+        self.ok = len(findings) == 0 if ok is None else ok
+
+    def lines(self):
+        """Renders the output one finding at a time
+
+        Yields:
+            string: The text of each finding, followed by the passed message if the check passed
+        """
+        for finding in self.findings:
+            yield finding.render()
+        if self.ok:
+            yield self.passed
+
+    def render(self):
+        """Builds the full output of the check
+
+        Returns:
+            string: The same text the check used to return as its output
+        """
+        return "".join(self.lines())
+
+    def __iter__(self):
+        return iter((self.ok, self.render()))
+
+    def __getitem__(self, position):
+        return (self.ok, self.render())[position]
+
+    def __len__(self):
+        return 2
+
+    def __eq__(self, other):
+        if isinstance(other, (CheckResult, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return "CheckResult(" + self.story + ", " + repr(self.ok) + ", " + str(len(self.findings)) + " findings)"
@@ -0,0 +1,103 @@
+# Writes fixed width text tables in the same layout PrettyTable prints, one row at a time,
+# so printing a million individuals never holds the whole table or its text in memory.
+# wcwidth is optional, without it every character counts as one column wide
+import itertools
+import sys
+
+try:
+    from wcwidth import wcswidth
+except ImportError:
+    wcswidth = None
+
+# how many rendered rows are collected before they are written out together
+BATCH_SIZE = 1000
+
+
+def text_width(text):
+    """Counts how many columns a string takes up on a terminal
+
+    Args:
+        text (string): Text of a cell
+
+    Returns:
+        int: Width of the text, wide East Asian characters count twice if wcwidth is installed
+    """
+    if wcswidth is None or text.isascii():
+        return len(text)
+    width = wcswidth(text)
+    # wcswidth gives -1 for control characters
+    return len(text) if width < 0 else width
+
+
+def center(text, width):
+    """Centers a cell in its column, an odd space goes on the same side PrettyTable puts it
+
+    Args:
+        text (string): Text of a cell
+        width (int): Width of the column
+
+    Returns:
+        string: The text padded with spaces to the width of the column
+    """
+    if text.isascii():
+        return text.center(width)
+    excess = width - text_width(text)
+    left = excess // 2 + (excess % 2 == 1 and text_width(text) % 2 == 0)
+    return " " * left + text + " " * (excess - left)
+
+
+def write_table(field_names, items, row, limit=None, file=None):
+    """Writes a table with one row per item
+
+    The items are gone through twice, once to find how wide every column has to be and once
+    to write the rows, so only the widths and one batch of rendered rows are kept in memory
+
+    Args:
+        field_names (list): Header of each column
+        items (list): The things to write a row for, e.g. Individuals
+        row (function): Takes an item and returns the text of its cells, one string per column
+        limit (int): Only write the first limit items, all of them if None
+        file (file): Where to write the table, defaults to sys.stdout
+
+    Returns:
+        int: How many rows were written
+    """
+    if file is None:
+        file = sys.stdout
+
+    widths = [text_width(name) for name in field_names]
+    shown = 0
+    for item in itertools.islice(items, limit):
+        cells = row(item)
+        # almost every row is plain ASCII, where the width of a cell is its length
+        measure = len if "".join(cells).isascii() else text_width
+        widths = list(map(max, widths, map(measure, cells)))
+        shown += 1
+
+    rule = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+    file.write(rule + render_row(field_names, widths) + rule)
+
+    batch = []
+    for item in itertools.islice(items, limit):
+        batch.append(render_row(row(item), widths))
+        if len(batch) == BATCH_SIZE:
+            file.write("".join(batch))
+            batch = []
+    batch.append(rule)
+    file.write("".join(batch))
+    return shown
+
+
+def render_row(cells, widths):
+    """Lays out one line of a table
+
+    Args:
+        cells (list): Text of each cell
+        widths (list): Width of each column
+
+    Returns:
+        string: The line, ending in a newline
+    """
+    # str.center breaks ties the same way PrettyTable does, but counts characters instead of columns
+    pad = str.center if "".join(cells).isascii() else center
+    return "| " + " | ".join(map(pad, cells, widths)) + " |\n"
@@ -1,5 +1,6 @@
 import datetime
-from prettytable import PrettyTable
+from Index import GenealogyIndex
+from Table import write_table
 
 # stores the valid tags for each level
 # NOTE: INDI and FAM are not included in the level 0 tags because they are a special case
@@ -10,6 +11,16 @@ valid_map = {
     "2": ["DATE"]
 }
 
+# month abbreviations used in GEDCOM dates, independent of the locale
+MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12
+}
+
+# days in each month of a non leap year and the days before each month starts, by month number
+DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+DAYS_BEFORE_MONTH = [0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+
 
 def is_valid(level, tag):
     """Function to determine if the given leve and tag combo is valid
@@ -26,20 +37,84 @@ def is_valid(level, tag):
     else:
         return "N"
 
-def check_date(id, dates):
+def date_ordinal(date_string):
+    """Parses a GEDCOM date into a day ordinal
+
+    This is a drop in replacement for strptime with "%d %b %Y" that uses a fixed month table,
+    so it is much faster and does not depend on the locale
+
+    Args:
+        date_string (string): Date in the format DD MON YYYY, e.g. 7 JUL 1996
+
+    Returns:
+        int: The proleptic Gregorian ordinal of the date (see datetime.date.toordinal)
+        or None if date_string is not a legitimate date
+    """
+    try:
+        day, month, year = date_string.split()
+        month = MONTHS[month.upper()]
+    except (AttributeError, ValueError, KeyError):
+        return None
+
+    # same widths strptime accepts for %d and %Y, and only ASCII digits since isdigit is also
+    # True for characters like "²" that int can't read
+    if not (day.isascii() and day.isdigit() and len(day) <= 2 and
+            year.isascii() and year.isdigit() and len(year) == 4):
+        return None
+
+    day = int(day)
+    year = int(year)
+    leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+    if year < 1 or day < 1 or day > DAYS_IN_MONTH[month] + (month == 2 and leap):
+        return None
+
+    # days in all the years before this one, then the months before this one
+    y = year - 1
+    return y * 365 + y // 4 - y // 100 + y // 400 + \
+        DAYS_BEFORE_MONTH[month] + (month > 2 and leap) + day
+
+
+def today_ordinal():
+    """The one clock every date relative check and age is measured against when no as-of date
+    is given, read once per run rather than once per individual or check
+
+    Returns:
+        int: Day ordinal of the current date
+    """
+    return datetime.date.today().toordinal()
+
+
+def years_between(start_ordinal, end_ordinal):
+    """Counts the whole years between two day ordinals
+
+    Args:
+        start_ordinal (int): Day ordinal of the earlier date
+        end_ordinal (int): Day ordinal of the later date
+
+    Returns:
+        int: How many full years passed between the two dates
+    """
+    start = datetime.date.fromordinal(start_ordinal)
+    end = datetime.date.fromordinal(end_ordinal)
+    return end.year - start.year - ((end.month, end.day) < (start.month, start.day))
+
+
+def check_date(id, dates, ordinals=None):
     """Checks if date is legitimate
     Args:
         id (String): id of indi or fam
         dates (List): list of dates
+        ordinals (List): day ordinals already parsed from dates, parsed here if not given
 
     Throws: ValueError,  if illegitimate dates
     """
-    for d in dates:
+    if ordinals is None:
+        ordinals = [date_ordinal(d) for d in dates]
+    for d, ordinal in zip(dates, ordinals):
         if d is None:
             continue
-        try:
-            datetime.datetime.strptime(d, "%d %b %Y").date()
-        except ValueError as err:
+        if ordinal is None:
             raise ValueError("Illegitimate date: " + d + " for ID: " + id)
 
 
@@ -73,46 +148,68 @@ def parse_line(line):
     return (level, tag, args, valid)
 
 
-def calculate_age(born_string):
+def calculate_age(born_string, as_of=None):
     """Calculate the age of a person
 
     Args:
         born_string (string): Date string of an Individuals birthday
+        as_of (int): Day ordinal to measure the age at, today if not given
 
     Returns:
         int: How many years old the person is
     """
-    today = datetime.date.today()
-    born = datetime.datetime.strptime(born_string, "%d %b %Y").date()
-    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+    return years_between(date_ordinal(born_string), today_ordinal() if as_of is None else as_of)
+
+
+INDIVIDUAL_FIELDS = ["ID", "Name", "Gender", "Birthday", "Age", "Alive", "Death", "Child", "Spouse"]
+FAMILY_FIELDS = ["ID", "Married", "Divorced", "Husband ID", "Husband Name", "Wife ID", "Wife Name", "Children"]
+
+
+def individual_row(indi):
+    """Text of each cell in an individual's row of the table
+
+    Args:
+        indi (Individual): The individual to show
+
+    Returns:
+        list: One string per column of INDIVIDUAL_FIELDS
+    """
+    return [str(indi.ID), str(indi.name), str(indi.gender), str(indi.birthday), str(indi.age),
+            str(indi.alive), str(indi.death), str(list(indi.child)), str(list(indi.spouse))]
 
 
-def pretty_print(individuals, families):
-    """Prints all individuals and families in a table using pretty table
+def family_row(fam):
+    """Text of each cell in a family's row of the table
+
+    Args:
+        fam (Family): The family to show
+
+    Returns:
+        list: One string per column of FAMILY_FIELDS
+    """
+    return [str(fam.ID), str(fam.married), str(fam.divorced), str(fam.husband_ID),
+            str(fam.husband_name), str(fam.wife_ID), str(fam.wife_name), str(list(fam.children))]
+
+
+def pretty_print(individuals, families, limit=None):
+    """Prints all individuals and families in a table
+
+    The tables are written out row by row instead of being built up as one string
 
     Args:
         individuals (list): list of Individual objects
         families (list): list of Family objects
+        limit (int): Only print the first limit rows of each table, all of them if None
     """
     print("==============================Individuals===============================")
-    i_table = PrettyTable()
-    i_table.field_names = ["ID", "Name", "Gender",
-                           "Birthday", "Age", "Alive", "Death", "Child", "Spouse"]
-    for indi in individuals:
-        i_table.add_row([indi.ID, indi.name, indi.gender, indi.birthday,
-                         indi.age, indi.alive, indi.death, indi.child, indi.spouse])
-
-    print(i_table)
+    shown = write_table(INDIVIDUAL_FIELDS, individuals, individual_row, limit)
+    if shown < len(individuals):
+        print("... " + str(len(individuals) - shown) + " more individuals not shown")
 
     print("==============================Families===============================")
-    f_table = PrettyTable()
-    f_table.field_names = ["ID", "Married", "Divorced", "Husband ID",
-                           "Husband Name", "Wife ID", "Wife Name", "Children"]
-    for fam in families:
-        f_table.add_row([fam.ID, fam.married, fam.divorced, fam.husband_ID,
-                         fam.husband_name, fam.wife_ID, fam.wife_name, fam.children])
-
-    print(f_table)
+    shown = write_table(FAMILY_FIELDS, families, family_row, limit)
+    if shown < len(families):
+        print("... " + str(len(families) - shown) + " more families not shown")
 
 
 def calculate_age_at_spec_date(born_string, date_string):
@@ -125,46 +222,46 @@ def calculate_age_at_spec_date(born_string, date_string):
     Returns:
         int: How many years old the person was at date_string
     """
-    specDate = datetime.datetime.strptime(date_string, "%d %b %Y").date()
-    born = datetime.datetime.strptime(born_string, "%d %b %Y").date()
-    return specDate.year - born.year - ((specDate.month, specDate.day) < (born.month, born.day))
+    return years_between(date_ordinal(born_string), date_ordinal(date_string))
 
-def get_siblings(indi, individuals, families):
+def get_siblings(indi, individuals, families, index=None):
     """
      Args:
         indi (individual): individual to lookup
         individuals (list): list of individuals
         families (list): list of families
+        index (GenealogyIndex): shared index over individuals and families, built if not given
     Returns:
-        list: list of siblings of indi
+        list: list of siblings of indi across all of the families indi is a child in, including indi
     """
-    siblings_ID = next((fam.children for fam  in families if indi.ID in fam.children), [])
-    return [i for i in individuals if i.ID in siblings_ID]
+    if index is None:
+        index = GenealogyIndex(individuals, families)
+    return index.siblings(indi)
 
-def get_children(indi, individuals, families):
+def get_children(indi, individuals, families, index=None):
     """
      Args:
         indi (individual): individual to lookup
         individuals (list): list of individuals
         families (list): list of families
+        index (GenealogyIndex): shared index over individuals and families, built if not given
     Returns:
-        list: list of children of indi
+        list: list of children of indi across all of the families indi is a spouse in
     """
-    children_ID =  next((fam.children for fam  in families if indi.ID == fam.husband_ID or indi.ID == fam.wife_ID), [])
-    return [i for i in individuals if i.ID in children_ID]
+    if index is None:
+        index = GenealogyIndex(individuals, families)
+    return index.children(indi)
 
-def get_spouses(indi, individuals, families):
+def get_spouses(indi, individuals, families, index=None):
     """
      Args:
         indi (individual): individual to lookup
         individuals (list): list of individuals
         families (list): list of families
+        index (GenealogyIndex): shared index over individuals and families, built if not given
     Returns:
         list: list of spouses of indi
     """
-    if(indi.gender == 'F'):
-        spouses_ID = [fam.husband_ID for fam  in families if fam.ID in indi.spouse]
-        return [i for i in individuals if i.ID in spouses_ID]
-    else:
-        spouses_ID = [fam.wife_ID for fam  in families if fam.ID in indi.spouse]
-        return [i for i in individuals if i.ID in spouses_ID]
+    if index is None:
+        index = GenealogyIndex(individuals, families)
+    return index.spouses(indi)
@@ -1,152 +1,206 @@
+import argparse
+import contextlib
+import datetime
 import sys
 from Parser import parse
+import Cache
+import Incremental
+import Profiler
+import Report
+# importing Checks registers every check with the Registry
 import Checks
-from Utils import pretty_print
-
-
-def main():
-    ''' Parses the GEDCOM file from the input and stores the Individuals and Families'''
-    # check for correct inputs
-    if len(sys.argv) != 2:
-        print("Usage: python parser.py <file_path>")
-        return
-
-    path = sys.argv[1]
-
-    individuals, families = parse(path)
+import Registry
+from Index import GenealogyIndex
+from Columns import build_table
+from EventIndex import EventIndex
+from Utils import pretty_print, today_ordinal
+
+
+def parse_args(argv=None):
+    """Reads the command line options
+
+    Args:
+        argv (list): Command line arguments, defaults to sys.argv
+
+    Returns:
+        Namespace: the parsed options
+    """
+    parser = argparse.ArgumentParser(
+        description="Parses a GEDCOM file and checks it for errors and anomalies")
+    parser.add_argument("path", nargs="?", help="path to the GEDCOM file")
+    parser.add_argument("--only", help="comma separated user stories to run, e.g. US11,US13")
+    parser.add_argument("--skip", help="comma separated user stories to leave out, e.g. US20")
+    parser.add_argument("--list", action="store_true", help="list the available checks and exit")
+    parser.add_argument("--jobs", type=int, default=1, help="number of processes to run checks in")
+    parser.add_argument("--parse-workers", type=int, default=1, metavar="N",
+                        help="number of processes to parse the file in")
+    parser.add_argument("--no-tables", action="store_true",
+                        help="leave out the tables of individuals and families")
+    parser.add_argument("--table-limit", type=int, metavar="N",
+                        help="only print the first N rows of each table")
+    parser.add_argument("--report", metavar="PATH",
+                        help="also write every finding as a line of JSON to PATH, or to the "
+                             "standard output with - (the usual output then goes to the standard error)")
+    parser.add_argument("--as-of", metavar="YYYY-MM-DD",
+                        help="measure ages and the checks against the current date at this date instead of today")
+    parser.add_argument("--profile", action="store_true",
+                        help="print how long each stage took and how much memory it needed to the standard error")
+    parser.add_argument("--profile-json", metavar="PATH", help="write the same measurements to PATH as JSON")
+    reuse = parser.add_mutually_exclusive_group()
+    reuse.add_argument("--cache", metavar="DIR", help="directory to cache the parsed file in between runs")
+    reuse.add_argument("--incremental", metavar="DIR",
+                       help="directory to remember records and results in, so the next run only "
+                            "parses changed records and reruns the checks they affect")
+    args = parser.parse_args(argv)
+    if args.table_limit is not None and args.table_limit < 0:
+        parser.error("--table-limit can't be negative")
+    if args.as_of is not None:
+        # kept as a day ordinal, like every other date once it is parsed
+        try:
+            args.as_of = datetime.date.fromisoformat(args.as_of).toordinal()
+        except ValueError:
+            parser.error("--as-of must be a date like 2019-03-01")
+    args.report_file = None
+    if args.report is not None and args.path is not None and not args.list:
+        # opened before any work is done, so a report that can't be written stops the run right away
+        try:
+            args.report_file = Report.open_report(args.report)
+        except OSError as e:
+            parser.error("--report: " + str(e))
+    return args
+
+
+def load_tree(path, workers=1, profiler=Profiler.DISABLED, as_of=None):
+    """Parses a GEDCOM file and builds everything the checks share
+
+    Args:
+        path (string): Path to the GEDCOM file
+        workers (int): How many processes to parse the file in
+        profiler (Profiler): Measures each step of loading
+        as_of (int): Day ordinal to measure ages at, today if not given
+
+    Returns:
+        tuple: (individuals, families, index) with individuals and families sorted by ID
+    """
+    individuals, families = parse(path, workers, profiler, as_of)
 
     # for project 3, print individuals and families in order
-    individuals.sort(key=lambda x: x.ID)
-    families.sort(key=lambda x: x.ID)
-
-    pretty_print(individuals, families)
+    with profiler.stage("sort"):
+        individuals.sort(key=lambda x: x.ID)
+        families.sort(key=lambda x: x.ID)
+
+    # build the lookup tables once so every check can share them
+    with profiler.stage("build index"):
+        index = GenealogyIndex(individuals, families)
+    return individuals, families, index
+
+
+def check_tree(args, specs, report=None, profiler=Profiler.DISABLED):
+    """Loads the tree, prints its tables and runs the checks on it
+
+    Args:
+        args (Namespace): The parsed command line options
+        specs (list): CheckSpecs of the checks to run
+        report (ReportWriter): Also writes the results here as NDJSON if given
+        profiler (Profiler): Measures each stage of the run
+    """
+    # the clock is read once, so every age and check in the run agrees on the date
+    as_of = today_ordinal() if args.as_of is None else args.as_of
+    if args.incremental:
+        with profiler.stage("incremental update"):
+            run = Incremental.IncrementalRun(args.path, args.incremental, as_of)
+        individuals, families, index = run.individuals, run.families, run.index
+    elif args.cache:
+        # the cached tree doesn't depend on the date, ages are measured at the as-of date when read
+        with profiler.stage("load cache"):
+            individuals, families, index = Cache.cached(
+                args.path, lambda path: load_tree(path, args.parse_workers, profiler, as_of), args.cache)
+        with profiler.stage("update ages"):
+            for indi in individuals:
+                indi.update_age(as_of)
+    else:
+        individuals, families, index = load_tree(args.path, args.parse_workers, profiler, as_of)
+    with profiler.stage("build columns"):
+        table = build_table(individuals)
+    # the calendars are only sorted once a check asks them something
+    events = EventIndex(individuals, families)
+
+    if not args.no_tables:
+        with profiler.stage("print tables"):
+            pretty_print(individuals, families, args.table_limit)
 
     print("==============Error/Anomaly Checks============")
-    print("User Story 27: Print Age")
-    if len(individuals) > 0:
-        print(individuals[0])
-    print()
-
-    print("User Story 22: Unique IDs")
-    result, output = Checks.unique_IDs(individuals, families)
-    print(output)
-
-    print("User Story 04: Marriage Before Divorce")
-    result, output = Checks.marriage_before_divorce(families)
-    print(output)
-
-    print("User Story 01: Dates Before Current Date")
-    result, output = Checks.dates_before_current_date(individuals, families)
-    print(output)
-
-    print("User Story 09: Birth Before the Death of Parents")
-    result, output = Checks.birth_before_parents_death(individuals, families)
-    print(output)
-
-    print("User Story 25: Unique First Names in Families")
-    result, output = Checks.unique_first_names(individuals, families)
-    print(output)
-
-    print("User Story 07: Less than 150 years old")
-    result, output = Checks.age_less_than_150(individuals)
-    print(output)
-
-    print("User Story 11: No bigamy")
-    result, output = Checks.no_bigamy(individuals, families)
-    print(output)
-
-    print("User Story 13: Sibling spacings")
-    result, output = Checks.sibling_spacings(individuals, families)
-    print(output)
-
-    print("User Story 15: Fewer than 15 siblings")
-    result, output = Checks.fewer_than_15_siblings(families)
-    print(output)
-
-    print("User Story 29: List deceased")
-    result, output = Checks.list_deceased(individuals)
-    print(output)
-
-    print("User Story 10: Marriage after 14")
-    result, output = Checks.marriage_after_14(individuals, families)
-    print(output)
-
-    print("User Story 03: Birth before Death")
-    result, output = Checks.birth_before_death(individuals, families)
-    print(output)
-
-    print("User Story 02: Birth before Marriage")
-    result, output = Checks.birth_before_marriage(individuals, families)
-    print(output)
-
-    print("User Story 24: Unique family by spouses")
-    result, output = Checks.unique_family_by_spouses(families)
-    print(output)
-
-    print("User Story 34: List large age difference")
-    result, output = Checks.list_large_age_difference(individuals, families)
-    print(output)
-
-    print("User Story 35: List recent births")
-    result, output = Checks.list_recent_births(individuals)
-    print(output)
-
-    print("User Story 36: List recent deaths")
-    result, output = Checks.list_recent_deaths(individuals)
-    print(output)
-
-    print("User Story 18: Siblings should not marry")
-    result, output = Checks.siblings_should_not_marry(individuals, families)
-    print(output)
-
-    print("User Story 39: List upcoming anniversaries")
-    result, output = Checks.list_upcoming_anniversaries(individuals, families)
-    print(output)
-
-    print("User Story 30: List living married")
-    result, output = Checks.list_living_married(individuals, families)
-    print(output)
-
-    print("User Story 23: Unique name and birth date")
-    result, output = Checks.unique_name_birth(individuals, families)
-    print(output)
-
-    print("User Story 20: Aunts and Uncles")
-    result, output = Checks.aunts_and_uncles(individuals, families)
-    print(output)
-
-    print("User Story 31: Living Single")
-    result, output = Checks.living_single(individuals)
-    print(output)
-
-    print("User Story 38: List Upcoming Birthdays")
-    result, output = Checks.list_upcoming_birthdays(individuals)
-    print(output)
-
-    print("User Story 21: Correct Gender for Role")
-    result, output = Checks.correct_gender_for_role(individuals, families)
-    print(output)
-
-    print("User Story 05: Marriage Before Death")
-    result, output = Checks.marriage_before_death(individuals, families)
-    print(output)
+    if args.incremental:
+        results = run.run_checks(specs, table, args.jobs, events)
+    else:
+        results = Registry.run_checks(specs, individuals, families, index, args.jobs, table, as_of, events)
+    # each check is measured while its result is produced, with several jobs that is the wait for it
+    for spec, result in profiler.items(results, lambda item: item[0].story):
+        if report is not None:
+            with profiler.stage("write report"):
+                report.write(spec, result)
+        with profiler.stage("print results"):
+            print(spec.header())
+            print(result.render())
+
+    if args.incremental:
+        with profiler.stage("save incremental state"):
+            run.save()
+
+
+def close_report(file):
+    """Closes the file the report was written to, unless it is the standard output
+
+    Args:
+        file (file): The file from parse_args, None if there is no report
+    """
+    if file is not None and file is not sys.stdout:
+        file.close()
+
+
+def main(argv=None):
+    ''' Parses the GEDCOM file from the input and stores the Individuals and Families'''
+    args = parse_args(argv)
 
-    print("User Story 06: Divorce Before Death")
-    result, output = Checks.divorce_before_death(individuals, families)
-    print(output)
+    if args.list:
+        for spec in Registry.CHECKS:
+            print(spec)
+        return
 
-    print("User Story 28: Order siblings by age")
-    result, output = Checks.order_siblings_by_age(individuals, families)
-    print(output)
+    # check for correct inputs
+    if args.path is None:
+        print("Usage: python main.py <file_path> [--only US11,US13] [--skip US20] [--jobs N] [--parse-workers N] [--no-tables] [--table-limit N] [--report PATH] [--as-of YYYY-MM-DD] [--profile] [--profile-json PATH] [--cache DIR | --incremental DIR]")
+        return
 
-    print("User Story 12: Parents too old")
-    result, output = Checks.parents_too_old(individuals, families)
-    print(output)
+    try:
+        specs = Registry.get_checks(
+            args.only.split(",") if args.only else None,
+            args.skip.split(",") if args.skip else None)
+    except ValueError as e:
+        print(e)
+        close_report(args.report_file)
+        return
 
-    print("User Story 33: List orphans")
-    result, output = Checks.list_orphans(individuals, families)
-    print(output)
-    
+    profiler = Profiler.DISABLED
+    if args.profile or args.profile_json:
+        profiler = Profiler.Profiler()
+
+    report = None
+    if args.report_file is not None:
+        report = Report.ReportWriter(args.report_file)
+    try:
+        # with the report on the standard output, everything else goes to the standard error
+        with contextlib.redirect_stdout(sys.stderr if args.report == "-" else sys.stdout):
+            check_tree(args, specs, report, profiler)
+    finally:
+        close_report(args.report_file)
+
+    if profiler is not Profiler.DISABLED:
+        profiler.close()
+        if args.profile:
+            profiler.print_summary()
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
 
 
 if __name__ == '__main__':
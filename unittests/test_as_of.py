@@ -0,0 +1,99 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import datetime
+import os
+import shutil
+import tempfile
+# importing Checks registers every check with the Registry
+import Checks
+import Incremental
+import main
+import Registry
+from Individual import Individual
+from Parser import parse
+
+AS_OF = datetime.date(2019, 3, 1).toordinal()
+
+
+class TestAsOf(unittest.TestCase):
+
+    def test_age_is_measured_at_as_of(self):
+        indi = Individual(["0 @I1@ INDI", "1 NAME Dan /Salerno/", "1 BIRT", "2 DATE 12 JUL 1996"], AS_OF)
+        self.assertEqual(indi.as_of, AS_OF)
+        self.assertEqual(indi.age, 22)
+        indi.update_age(datetime.date(2019, 7, 12).toordinal())
+        self.assertEqual(indi.age, 23)
+        indi.age = 7
+        self.assertEqual(indi.age, 7)
+
+    def test_checks_use_as_of(self):
+        individuals, families = parse("../testfiles/US38_test.ged", as_of=AS_OF)
+        individuals[0].birthday = "11 MAR 2000"
+        result, output = Checks.list_upcoming_birthdays(individuals, as_of=AS_OF)
+        self.assertFalse(result)
+        result, output = Checks.list_upcoming_birthdays(individuals, as_of=AS_OF + 20)
+        self.assertTrue(result)
+
+        # the registry only hands as_of to the checks that take it
+        specs = dict((spec.story, spec) for spec in Registry.CHECKS)
+        self.assertTrue(specs["US38"].takes_as_of)
+        self.assertFalse(specs["US04"].takes_as_of)
+        result, output = Registry.run_check(specs["US38"], individuals, families, as_of=AS_OF)
+        self.assertFalse(result)
+
+    def test_workers_get_as_of(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            individuals, families, index = main.load_tree("../testfiles/sprint4.ged", as_of=AS_OF)
+            in_workers, families_in_workers, index_in_workers = main.load_tree(
+                "../testfiles/sprint4.ged", 2, as_of=AS_OF)
+        self.assertEqual([indi.age for indi in in_workers], [indi.age for indi in individuals])
+
+        serial = [(spec.story, result.render()) for spec, result in
+                  Registry.run_checks(Registry.CHECKS, individuals, families, index, 1, None, AS_OF)]
+        pooled = [(spec.story, result.render()) for spec, result in
+                  Registry.run_checks(Registry.CHECKS, individuals, families, index, 2, None, AS_OF)]
+        self.assertEqual(pooled, serial)
+
+    def test_main(self):
+        first = io.StringIO()
+        with contextlib.redirect_stdout(first):
+            main.main(["../testfiles/sprint4.ged", "--as-of", "2019-03-01"])
+        today = io.StringIO()
+        with contextlib.redirect_stdout(today):
+            main.main(["../testfiles/sprint4.ged", "--as-of", datetime.date.today().isoformat()])
+        plain = io.StringIO()
+        with contextlib.redirect_stdout(plain):
+            main.main(["../testfiles/sprint4.ged"])
+
+        self.assertEqual(today.getvalue(), plain.getvalue())
+        self.assertNotEqual(first.getvalue(), plain.getvalue())
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, main.parse_args, ["../testfiles/sprint4.ged", "--as-of", "1 MAR 2019"])
+
+    def test_incremental(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run = Incremental.IncrementalRun("../testfiles/sprint4.ged", os.path.join(directory, "state"), AS_OF)
+                list(run.run_checks(Registry.CHECKS))
+                run.save()
+                run = Incremental.IncrementalRun("../testfiles/sprint4.ged", os.path.join(directory, "state"), AS_OF)
+                self.assertFalse(run.changes)
+                run = Incremental.IncrementalRun("../testfiles/sprint4.ged", os.path.join(directory, "state"),
+                                                 AS_OF + 400)
+                self.assertIn("today", run.changes.fields)
+                self.assertIn("individual.age", run.changes.fields)
+                self.assertTrue(all(indi.as_of == AS_OF + 400 for indi in run.individuals))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import os
+import shutil
+import tempfile
+import Cache
+from main import load_tree
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, "cache")
+        self.path = os.path.join(self.directory, "tree.ged")
+        shutil.copy("../testfiles/sprint4.ged", self.path)
+        self.builds = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build(self, path):
+        self.builds += 1
+        return load_tree(path)
+
+    def load(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tree = Cache.cached(self.path, self.build, self.cache_dir)
+        return tree, output.getvalue()
+
+    def test_second_run_is_cached(self):
+        first, first_output = self.load()
+        second, second_output = self.load()
+        self.assertEqual(self.builds, 1)
+        self.assertEqual([str(indi) for indi in second[0]], [str(indi) for indi in first[0]])
+        self.assertEqual([str(fam) for fam in second[1]], [str(fam) for fam in first[1]])
+        # the index comes back linked to the loaded individuals and families
+        self.assertIs(second[2].individuals_by_ID[second[0][0].ID], second[0][0])
+        self.assertIs(second[2].families[0], second[1][0])
+
+    def test_parse_errors_are_printed_again(self):
+        first, first_output = self.load()
+        second, second_output = self.load()
+        self.assertIn("will not be parsed", first_output)
+        self.assertEqual(second_output, first_output)
+
+    def test_changed_file_is_parsed_again(self):
+        self.load()
+        with open(self.path) as file:
+            text = file.read()
+        # same size, different content
+        with open(self.path, "w") as file:
+            file.write(text.replace("1 SEX M", "1 SEX F", 1))
+        tree, output = self.load()
+        self.assertEqual(self.builds, 2)
+        self.load()
+        self.assertEqual(self.builds, 2)
+
+    def test_touched_file_uses_content_hash(self):
+        self.load()
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.load()
+        self.assertEqual(self.builds, 1)
+
+    def test_broken_entry_is_rebuilt(self):
+        first, first_output = self.load()
+        with open(Cache.entry_path(self.cache_dir, self.path), "wb") as file:
+            file.write(b"not a pickle")
+        tree, output = self.load()
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(len(tree[0]), len(first[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+from Parser import parse
+import Columns
+import Checks
+import Registry
+
+
+@unittest.skipIf(Columns.numpy is None, "numpy is not installed")
+class TestColumns(unittest.TestCase):
+
+    def setUp(self):
+        individuals, families = parse("../testfiles/sprint4.ged")
+        self.individuals = individuals
+        self.families = families
+        self.table = Columns.build_table(individuals)
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), len(self.individuals))
+        for row, indi in enumerate(self.individuals):
+            self.assertEqual(self.table.birth[row], indi.birth_ordinal)
+            self.assertEqual(self.table.alive[row], indi.alive)
+            self.assertEqual(self.table.has_death[row], indi.death is not None)
+            self.assertEqual(self.table.spouses[row], len(indi.spouse))
+            self.assertEqual(self.table.age[row], indi.age)
+        self.assertEqual(self.table.all_births, True)
+
+    def test_gender_codes(self):
+        for row, indi in enumerate(self.individuals):
+            expected = Columns.MALE if indi.gender == "M" else Columns.FEMALE
+            self.assertEqual(self.table.gender[row], expected)
+
+    def test_checks_match_loops(self):
+        specs = [spec for spec in Registry.CHECKS if spec.takes_table]
+        self.assertEqual(len(specs), 7)
+        for spec in specs:
+            looped = Registry.run_check(spec, self.individuals, self.families)
+            columns = Registry.run_check(spec, self.individuals, self.families, table=self.table)
+            self.assertEqual(columns, looped)
+
+    def test_table_for_other_individuals_is_ignored(self):
+        others = self.individuals[:1]
+        self.assertEqual(self.table.covers(others), False)
+        self.assertEqual(Checks.list_deceased(others, table=self.table), Checks.list_deceased(others))
+
+    def test_missing_birthday_falls_back_to_loop(self):
+        self.individuals[0].birthday = "None"
+        table = Columns.build_table(self.individuals)
+        self.assertEqual(table.all_births, False)
+        with self.assertRaises(TypeError):
+            Checks.list_recent_births(self.individuals, table=table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import datetime
+from Parser import parse
+from Family import Family
+from Utils import check_date, date_ordinal, years_between
+
+
+class TestDates(unittest.TestCase):
+
+    def setUp(self):
+        individuals, families = parse("../testfiles/Parser_test.ged")
+        self.individuals = individuals
+        self.families = families
+
+    def test_ordinals_parsed_at_construction(self):
+        self.assertEqual(self.individuals[0].birth_ordinal, datetime.date(1950, 1, 1).toordinal())
+        self.assertEqual(self.individuals[0].death_ordinal, None)
+        self.assertEqual(self.individuals[2].death_ordinal, datetime.date(2010, 4, 4).toordinal())
+        self.assertEqual(self.families[0].married_ordinal, datetime.date(1975, 6, 1).toordinal())
+        self.assertEqual(self.families[0].divorced_ordinal, None)
+
+    def test_ordinals_follow_changes(self):
+        self.individuals[0].birthday = "2 FEB 1951"
+        self.assertEqual(self.individuals[0].birth_ordinal, datetime.date(1951, 2, 2).toordinal())
+        self.families[0].divorced = "1 Jan 1990"
+        self.assertEqual(self.families[0].divorced_ordinal, datetime.date(1990, 1, 1).toordinal())
+        self.families[0].divorced = None
+        self.assertEqual(self.families[0].divorced_ordinal, None)
+        self.individuals[0].death = "None"
+        self.assertEqual(self.individuals[0].death_ordinal, None)
+
+    def test_date_ordinal(self):
+        self.assertEqual(date_ordinal("29 FEB 2000"), datetime.date(2000, 2, 29).toordinal())
+        self.assertEqual(date_ordinal("29 FEB 2001"), None)
+        self.assertEqual(date_ordinal("7/11/2005"), None)
+        self.assertEqual(date_ordinal(None), None)
+
+    def test_date_ordinal_matches_strptime(self):
+        day = datetime.date(1899, 12, 1)
+        while day < datetime.date(2001, 3, 1):
+            text = day.strftime("%d %b %Y").upper()
+            self.assertEqual(date_ordinal(text), day.toordinal(), text)
+            day += datetime.timedelta(days=1)
+
+    def test_date_ordinal_formats(self):
+        self.assertEqual(date_ordinal("01 jan 0001"), 1)
+        self.assertEqual(date_ordinal("1 Apr 1911"), datetime.date(1911, 4, 1).toordinal())
+        self.assertEqual(date_ordinal("1 JAN 0000"), None)
+        self.assertEqual(date_ordinal("1 JAN 20000"), None)
+        self.assertEqual(date_ordinal("001 JAN 2000"), None)
+        self.assertEqual(date_ordinal("1 JANUARY 2000"), None)
+        self.assertEqual(date_ordinal("29 FEB 1900"), None)
+        # digits that are not ASCII are rejected instead of crashing int()
+        self.assertEqual(date_ordinal("1 JAN 19\u00b20"), None)
+        self.assertEqual(date_ordinal("\u00b9 JAN 1990"), None)
+
+    def test_years_between(self):
+        self.assertEqual(years_between(date_ordinal("12 JUL 1996"), date_ordinal("11 JUL 2018")), 21)
+        self.assertEqual(years_between(date_ordinal("12 JUL 1996"), date_ordinal("12 JUL 2018")), 22)
+
+    def test_illegitimate_date(self):
+        with self.assertRaises(ValueError):
+            check_date("@I1@", ["1 JAN 2000", "31 FEB 2000"])
+        with self.assertRaises(ValueError):
+            Family(["0 @F9@ FAM", "1 HUSB @I1@", "1 WIFE @I2@", "1 MARR", "2 DATE 32 JAN 2000"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import datetime
+# importing Checks registers every check with the Registry
+import Checks
+import Registry
+from EventIndex import Calendar, EventIndex, day_of_year, LEAP_DAY
+from Family import Family
+from Individual import Individual
+from main import load_tree
+
+
+def day(text):
+    return datetime.date.fromisoformat(text).toordinal()
+
+
+class TestEventIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.calendar = Calendar(["leap", "new year", "summer", "eve"],
+                                 [day("2000-02-29"), day("1990-01-02"), day("1985-07-12"), day("1970-12-31")])
+
+    def test_day_of_year(self):
+        self.assertEqual(day_of_year(1, 1), 1)
+        self.assertEqual(day_of_year(2, 29), LEAP_DAY)
+        self.assertEqual(day_of_year(3, 1), LEAP_DAY + 1)
+        self.assertEqual(day_of_year(12, 31), 366)
+
+    def test_between(self):
+        self.assertEqual(self.calendar.between(day("1985-07-12"), day("1990-01-02")), ["new year", "summer"])
+        self.assertEqual(self.calendar.between(day("1985-07-13"), day("1990-01-01")), [])
+        self.assertEqual(self.calendar.between(day("1900-01-01"), day("2100-01-01")),
+                         ["leap", "new year", "summer", "eve"])
+
+    def test_recurring_over_new_year(self):
+        self.assertEqual(self.calendar.recurring(day("2020-12-20"), day("2021-01-19")), ["new year", "eve"])
+        self.assertEqual(self.calendar.recurring(day("2021-01-03"), day("2021-02-02")), [])
+
+    def test_leap_day(self):
+        # in other years 29 February comes back on 1 March
+        self.assertEqual(self.calendar.recurring(day("2021-01-29"), day("2021-02-28")), [])
+        self.assertEqual(self.calendar.recurring(day("2021-03-01"), day("2021-03-31")), ["leap"])
+        self.assertEqual(self.calendar.recurring(day("2021-02-10"), day("2021-03-12")), ["leap"])
+        self.assertEqual(self.calendar.recurring(day("2024-02-29"), day("2024-02-29")), ["leap"])
+        self.assertEqual(self.calendar.recurring(day("2024-03-01"), day("2024-03-31")), [])
+
+    def test_window_longer_than_a_year(self):
+        self.assertEqual(self.calendar.recurring(day("2020-06-01"), day("2022-06-01")),
+                         ["leap", "new year", "summer", "eve"])
+
+    def test_covers(self):
+        individuals = []
+        families = []
+        events = EventIndex(individuals, families)
+        self.assertTrue(events.covers(individuals))
+        self.assertTrue(events.covers(individuals, families))
+        self.assertFalse(events.covers([]))
+        self.assertFalse(events.covers(individuals, []))
+
+    def test_checks_on_leap_day(self):
+        individuals = [Individual(["0 @I1@ INDI", "1 NAME Leap /Day/", "1 SEX M", "1 BIRT", "2 DATE 29 FEB 1996"]),
+                       Individual(["0 @I2@ INDI", "1 NAME New /Year/", "1 SEX F", "1 BIRT", "2 DATE 2 JAN 1997"])]
+        families = [Family(["0 @F1@ FAM", "1 HUSB @I1@", "1 WIFE @I2@", "1 MARR", "2 DATE 29 FEB 2016"])]
+
+        result, output = Checks.list_upcoming_birthdays(individuals, as_of=day("2019-02-15"))
+        self.assertEqual(output, str(individuals[0]) + " has a birthday in the next 30 days\n")
+        result, output = Checks.list_upcoming_anniversaries(individuals, families, as_of=day("2019-02-15"))
+        self.assertEqual(output, "Note: @F1@ has an upcoming anniversary on 29 FEB 2016\n")
+        result, output = Checks.list_upcoming_birthdays(individuals, as_of=day("2018-12-20"))
+        self.assertEqual(output, str(individuals[1]) + " has a birthday in the next 30 days\n")
+
+    def test_shared_index(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            individuals, families, index = load_tree("../testfiles/sprint4.ged")
+        events = EventIndex(individuals, families)
+        specs = [spec for spec in Registry.CHECKS if spec.takes_events]
+        self.assertEqual([spec.story for spec in specs], ["US35", "US36", "US39", "US38"])
+        for as_of in range(day("2018-01-01"), day("2019-01-01"), 7):
+            for spec in specs:
+                self.assertEqual(Registry.run_check(spec, individuals, families, index, as_of=as_of, events=events),
+                                 Registry.run_check(spec, individuals, families, index, as_of=as_of), spec.story)
+
+
+if __name__ == '__main__':
+    unittest.main()
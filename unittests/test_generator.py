@@ -0,0 +1,111 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import datetime
+import os
+import shutil
+import tempfile
+# importing Checks registers every check with the Registry
+import Checks
+import Generator
+import Registry
+from main import load_tree
+from Results import ERROR
+
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tree.ged")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def errors(self, output=None, as_of=None):
+        """Runs every check on the generated file and counts the errors each one finds"""
+        with contextlib.redirect_stdout(output or io.StringIO()):
+            individuals, families, index = load_tree(self.path, as_of=as_of)
+        counts = {}
+        for spec, result in Registry.run_checks(Registry.CHECKS, individuals, families, index, as_of=as_of):
+            for finding in result.findings:
+                if finding.severity == ERROR:
+                    counts[spec.story] = counts.get(spec.story, 0) + 1
+        return individuals, families, counts
+
+    def test_same_seed_same_file(self):
+        first = "".join(Generator.TreeGenerator(seed=3).chunks(500))
+        Generator.generate(self.path, 500, seed=3)
+        with open(self.path) as file:
+            self.assertEqual(file.read(), first)
+        self.assertNotEqual("".join(Generator.TreeGenerator(seed=4).chunks(500)), first)
+
+    def test_clean_tree_has_no_errors(self):
+        generator = Generator.generate(self.path, 3000, seed=1)
+        output = io.StringIO()
+        individuals, families, errors = self.errors(output)
+        self.assertEqual(errors, {})
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(len(individuals), 3000)
+        self.assertEqual(len(families), generator.families)
+        # several generations, remarriages and divorces
+        self.assertTrue(any(len(indi.spouse) > 1 for indi in individuals))
+        self.assertTrue(any(fam.divorced is not None for fam in families))
+        self.assertTrue(any(len(indi.child) == 1 and len(indi.spouse) > 0 for indi in individuals))
+
+    def test_small_clans(self):
+        Generator.generate(self.path, 1000, seed=2, clan_size=40, generations=3)
+        individuals, families, errors = self.errors()
+        self.assertEqual(errors, {})
+        self.assertEqual(len(individuals), 1000)
+
+    def test_each_anomaly_is_found(self):
+        for story in sorted(Generator.ANOMALIES):
+            generator = Generator.generate(self.path, 1500, seed=5, rates={story: 0.3})
+            output = io.StringIO()
+            individuals, families, errors = self.errors(output)
+            self.assertGreater(generator.injected[story], 0, story)
+            if story == "US42":
+                # records with dates that don't exist are left out by the parser
+                self.assertEqual(output.getvalue().count("will not be parsed"), generator.injected[story])
+            else:
+                self.assertGreater(errors.get(story, 0), 0, story)
+
+    def test_aunts_and_uncles(self):
+        generator = Generator.generate(self.path, 1500, seed=7, rates={"US20": 0.3})
+        individuals, families, errors = self.errors()
+        # only US20 trips, once for every injected marriage
+        self.assertEqual(errors, {"US20": generator.injected["US20"]})
+
+    def test_large_families(self):
+        generator = Generator.generate(self.path, 5000, seed=1, rates={"US15": 0.05})
+        individuals, families, errors = self.errors()
+        # the children are spaced so that only US15 trips, once for every injected family
+        self.assertEqual(errors, {"US15": generator.injected["US15"]})
+
+    def test_future_deaths(self):
+        # the deaths are in the future of the day the checks are run at, whatever end_year is
+        for as_of in [None, datetime.date(2100, 6, 1).toordinal()]:
+            generator = Generator.generate(self.path, 5000, seed=1, rates={"US01": 0.02}, as_of=as_of)
+            individuals, families, errors = self.errors(as_of=as_of)
+            self.assertGreater(generator.injected["US01"], 0)
+            self.assertEqual(errors.get("US01", 0), generator.injected["US01"])
+
+    def test_unknown_anomaly(self):
+        self.assertRaises(ValueError, Generator.TreeGenerator, 0, {"US99": 0.1})
+
+    def test_parse_rates(self):
+        self.assertEqual(Generator.parse_rates(["us11=0.5", "US13=0.25"]), {"US11": 0.5, "US13": 0.25})
+        rates = Generator.parse_rates(["US11=0.5"], 0.01)
+        self.assertEqual(rates["US11"], 0.5)
+        self.assertEqual(rates["US04"], 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,273 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import os
+import shutil
+import tempfile
+import Cache
+# importing Checks registers every check with the Registry
+import Checks
+import Incremental
+import Registry
+from main import load_tree
+
+
+class TestIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_dir = os.path.join(self.directory, "state")
+        self.path = os.path.join(self.directory, "tree.ged")
+        shutil.copy("../testfiles/sprint4.ged", self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_incremental(self, specs=Registry.CHECKS, jobs=1):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run = Incremental.IncrementalRun(self.path, self.state_dir)
+            results = [(spec.story, result.render()) for spec, result in run.run_checks(specs, jobs=jobs)]
+            run.save()
+        return run, results, output.getvalue()
+
+    def run_full(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            individuals, families, index = load_tree(self.path)
+            results = [(spec.story, result.render())
+                       for spec, result in Registry.run_checks(Registry.CHECKS, individuals, families, index)]
+        return results, output.getvalue()
+
+    def edit(self, old, new):
+        with open(self.path) as file:
+            text = file.read()
+        with open(self.path, "w") as file:
+            file.write(text.replace(old, new, 1))
+
+    def test_first_run_matches_full_run(self):
+        run, results, output = self.run_incremental()
+        self.assertTrue(run.changes.everything)
+        self.assertEqual(run.rerun, len(Registry.CHECKS))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_unchanged_file_reuses_everything(self):
+        first = self.run_incremental()
+        run, results, output = self.run_incremental()
+        self.assertFalse(run.changes)
+        self.assertEqual(run.changes.reparsed, 0)
+        self.assertEqual(run.rerun, 0)
+        # the parse errors are printed again
+        self.assertIn("will not be parsed", output)
+        self.assertEqual((results, output), first[1:])
+
+    def test_death_reruns_only_checks_that_read_it(self):
+        self.run_incremental()
+        self.edit("2 DATE 12 JUL 1996\n", "2 DATE 12 JUL 1996\n1 DEAT Y\n2 DATE 1 JAN 2010\n")
+        run, results, output = self.run_incremental()
+
+        self.assertEqual(run.changes.reparsed, 1)
+        self.assertEqual(run.changes.fields, set(["individual.death", "individual.alive"]))
+        self.assertEqual(run.changes.inputs, set())
+        for story in ["US03", "US05", "US06", "US09", "US29"]:
+            self.assertNotIn(story, self.stored_before_rerun(run, story))
+        self.assertLess(run.rerun, len(Registry.CHECKS))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_edit_after_checks_ran_in_workers(self):
+        # results from worker processes have to point at this run's records, or an edit to a
+        # record they report would not be noticed
+        self.run_incremental(jobs=2)
+        self.edit("1 NAME Grandpa /P/", "1 NAME Grandpapa /P/")
+        run, results, output = self.run_incremental(jobs=2)
+        self.assertIn("Grandpapa /P/", dict(results)["US29"])
+        self.assertEqual((results, output), self.run_full())
+
+    def test_reported_record_is_rebound(self):
+        # US29 does not read names, so it is not run again but has to report the new name
+        self.run_incremental()
+        self.edit("1 NAME Grandpa /P/", "1 NAME Grandpapa /P/")
+        run, results, output = self.run_incremental()
+        self.assertEqual(self.stored_before_rerun(run, "US29"), ["US29"])
+        self.assertIn("Grandpapa /P/", dict(results)["US29"])
+        self.assertEqual((results, output), self.run_full())
+
+    def stored_before_rerun(self, run, story):
+        # the stories that still had a result after reading the file, before run_checks
+        spec = [spec for spec in Registry.CHECKS if spec.story == story][0]
+        return [] if run.changes.affects(spec, run.results[story]) else [story]
+
+    def test_checks_on_families_only_are_reused(self):
+        self.run_incremental()
+        self.edit("1 NAME Dan2 /Salerno/", "1 NAME Danny /Salerno/")
+        run, results, output = self.run_incremental()
+        specs = dict((spec.story, spec) for spec in Registry.CHECKS)
+        # a name change only reaches the families through the linked spouse names
+        self.assertFalse(run.changes.affects(specs["US04"], run.results["US04"]))
+        self.assertTrue(run.changes.affects(specs["US23"], run.results["US23"]))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_added_and_removed_records_change_inputs(self):
+        self.run_incremental()
+        self.edit("0 TRLR", "0 @I99@ INDI\n1 NAME New /Person/\n1 SEX F\n1 BIRT\n2 DATE 1 JAN 1990\n0 TRLR")
+        run, results, output = self.run_incremental()
+        self.assertEqual(run.changes.inputs, set([Registry.INDIVIDUALS]))
+        self.assertEqual(run.changes.replaced, {})
+        self.assertEqual((results, output), self.run_full())
+
+        self.edit("0 @I99@ INDI", "0 @I99@ NOTE")
+        run, results, output = self.run_incremental()
+        self.assertEqual(run.changes.inputs, set([Registry.INDIVIDUALS]))
+        self.assertEqual(len(run.changes.replaced), 1)
+        self.assertEqual((results, output), self.run_full())
+
+    def test_identical_records(self):
+        # records with the same bytes are matched in file order
+        record = "0 @I21@ INDI\n1 NAME Test4 /Person/\n1 SEX F\n1 BIRT\n2 DATE 01 JUN 2000\n1 FAMC @F4@\n"
+        self.edit("0 TRLR", record + record + "0 TRLR")
+        self.run_incremental()
+        self.edit(record + "0 TRLR", "0 TRLR")
+        run, results, output = self.run_incremental()
+        self.assertEqual(run.changes.reparsed, 0)
+        self.assertEqual(len(run.changes.replaced), 1)
+        self.assertEqual(run.changes.inputs, set([Registry.INDIVIDUALS]))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_edit_to_record_with_shared_ID(self):
+        # US22 lists the records that share an ID in file order, which an edit to one of them
+        # can change as the unchanged copy takes the place of the first one of the last read
+        record = ("0 @I2@ INDI\n1 NAME Dan2 /Salerno/\n2 GIVN Dan\n2 SURN Salerno\n2 _MARNM Salerno\n1 SEX M\n"
+                  "1 BIRT\n2 DATE 12 JUL 1996\n1 FAMC @F1@\n")
+        self.edit("0 TRLR", record + "0 TRLR")
+        self.run_incremental()
+        self.edit("2 DATE 12 JUL 1996\n", "2 DATE 13 JUL 1996\n")
+        run, results, output = self.run_incremental()
+        self.assertEqual(run.changes.inputs, set([Registry.INDIVIDUALS]))
+        full = self.run_full()
+        self.assertEqual([line for story, result in results for line in result.splitlines()],
+                         [line for story, result in full[0] for line in result.splitlines()])
+        self.assertEqual(output.splitlines(), full[1].splitlines())
+
+    def test_other_day_reruns_date_checks(self):
+        self.run_incremental()
+        state = Incremental.load_state(self.state_dir, self.path)
+        state["as_of"] -= 1
+        Incremental.save_state(self.state_dir, self.path, state)
+
+        run, results, output = self.run_incremental()
+        self.assertIn("today", run.changes.fields)
+        self.assertEqual(run.changes.reparsed, 0)
+        specs = dict((spec.story, spec) for spec in Registry.CHECKS)
+        self.assertTrue(run.changes.affects(specs["US38"], run.results["US38"]))
+        self.assertFalse(run.changes.affects(specs["US04"], run.results["US04"]))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_only_some_checks(self):
+        specs = Registry.get_checks(["US03", "US29"])
+        run, results, output = self.run_incremental(specs)
+        self.assertEqual(sorted(run.results), ["US03", "US29"])
+        run, results, output = self.run_incremental()
+        self.assertEqual(run.rerun, len(Registry.CHECKS) - 2)
+        self.assertEqual((results, output), self.run_full())
+
+    def test_refresh_in_memory(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = Incremental.IncrementalRun(self.path)
+            list(run.run_checks(Registry.CHECKS))
+            self.edit("2 DATE 01 DEC 1996\n", "2 DATE 01 DEC 2001\n")
+            changes = run.refresh()
+            results = [(spec.story, result.render()) for spec, result in run.run_checks(Registry.CHECKS)]
+        self.assertEqual(changes.fields, set(["individual.birthday", "individual.age"]))
+        self.assertEqual(results, self.run_full()[0])
+        self.assertFalse(os.path.exists(self.state_dir))
+
+    def test_refresh_keeps_index_when_links_are_unchanged(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = Incremental.IncrementalRun(self.path)
+            list(run.run_checks(Registry.CHECKS))
+            index = run.index
+            self.edit("2 DATE 12 JUL 1996\n", "2 DATE 12 JUL 1996\n1 DEAT Y\n2 DATE 1 JAN 2010\n")
+            run.refresh()
+            self.assertIs(run.index, index)
+            self.assertEqual([(spec.story, result.render()) for spec, result in run.run_checks(Registry.CHECKS)],
+                             self.run_full()[0])
+
+            # a new child has to be linked
+            self.edit("1 CHIL @I2@\n", "1 CHIL @I2@\n1 CHIL @I20@\n")
+            run.refresh()
+            self.assertIsNot(run.index, index)
+            self.assertEqual([(spec.story, result.render()) for spec, result in run.run_checks(Registry.CHECKS)],
+                             self.run_full()[0])
+
+    def read_records_file(self):
+        with open(Cache.entry_path(self.state_dir, self.path, ".records"), "rb") as file:
+            return file.read()
+
+    def test_edit_only_writes_journal(self):
+        self.run_incremental()
+        records = self.read_records_file()
+        self.edit("2 DATE 12 JUL 1996\n", "2 DATE 12 JUL 1996\n1 DEAT Y\n2 DATE 1 JAN 2010\n")
+        run, results, output = self.run_incremental()
+        self.assertEqual(run.changes.reparsed, 1)
+        self.assertEqual(self.read_records_file(), records)
+
+        # the next run puts the edited record from the journal in its place
+        run, again, output_again = self.run_incremental()
+        self.assertFalse(run.changes)
+        self.assertEqual((again, output_again), (results, output))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_many_edits_write_records_file_again(self):
+        self.run_incremental()
+        records = self.read_records_file()
+        share = Incremental.JOURNAL_SHARE
+        # one edited record out of the whole file is already too many
+        Incremental.JOURNAL_SHARE = 1000
+        try:
+            self.edit("2 DATE 12 JUL 1996\n", "2 DATE 12 JUL 1996\n1 DEAT Y\n2 DATE 1 JAN 2010\n")
+            run, results, output = self.run_incremental()
+        finally:
+            Incremental.JOURNAL_SHARE = share
+        self.assertNotEqual(self.read_records_file(), records)
+        self.assertEqual(run.dirty, set())
+
+        run, again, output_again = self.run_incremental()
+        self.assertFalse(run.changes)
+        self.assertEqual((again, output_again), (results, output))
+        self.assertEqual((results, output), self.run_full())
+
+    def test_renamed_spouse_is_kept_in_journal(self):
+        # the families of the renamed individual change in place, so they are stored in the
+        # journal even though their own records did not change
+        self.run_incremental()
+        self.edit("1 NAME Uncle /P/", "1 NAME Unc /P/")
+        self.run_incremental()
+        run, results, output = self.run_incremental()
+        self.assertFalse(run.changes)
+        self.assertIn("Unc /P/", [fam.husband_name for fam in run.families])
+        self.assertEqual((results, output), self.run_full())
+
+    def test_missing_records_file_starts_over(self):
+        self.run_incremental()
+        os.remove(Cache.entry_path(self.state_dir, self.path, ".records"))
+        run, results, output = self.run_incremental()
+        self.assertTrue(run.changes.everything)
+        self.assertEqual((results, output), self.run_full())
+
+    def test_outdated_state_starts_over(self):
+        self.run_incremental()
+        with open(Cache.entry_path(self.state_dir, self.path, ".state"), "wb") as file:
+            file.write(b"not a pickle")
+        run, results, output = self.run_incremental()
+        self.assertTrue(run.changes.everything)
+        self.assertEqual((results, output), self.run_full())
+
+
+if __name__ == '__main__':
+    unittest.main()
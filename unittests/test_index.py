@@ -0,0 +1,118 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import copy
+from Parser import parse
+from Index import GenealogyIndex
+import Checks
+import Utils
+
+
+class TestIndex(unittest.TestCase):
+
+    def setUp(self):
+        individuals, families = parse("../testfiles/US20_test.ged")
+        self.individuals = individuals
+        self.families = families
+        self.index = GenealogyIndex(individuals, families)
+
+    def test_lookups_by_ID(self):
+        self.assertIs(self.index.individuals_by_ID["@<US20>I6@"], self.individuals[5])
+        self.assertIs(self.index.families_by_ID["@<US20>F2@"], self.families[1])
+        self.assertIs(self.index.husband(self.families[2]), self.individuals[5])
+        self.assertIs(self.index.wife(self.families[2]), self.individuals[6])
+
+    def test_family_rows_by_spouse_and_child(self):
+        # the uncle is a child in F2 and a husband in F3
+        uncle = self.index.individual_xrefs.get("@<US20>I6@")
+        self.assertEqual(self.index.spouse_rows[uncle], [2])
+        self.assertEqual(self.index.child_rows[uncle], [1])
+        self.assertEqual(self.index.spouse_rows[self.index.individual_xrefs.get("@<US20>I1@")], [])
+
+    def test_xref_numbers(self):
+        # individuals are numbered in order so their numbers are their positions
+        for position, indi in enumerate(self.individuals):
+            self.assertEqual(self.index.individual_xrefs.get(indi.ID), position)
+            self.assertEqual(self.index.individual_xrefs.xref(position), indi.ID)
+            self.assertIs(self.index.individuals_by_number[position], indi)
+        self.assertEqual(self.index.individual_xrefs.get("@<US20>I99@"), None)
+        self.assertEqual(self.index.husbands[2], 5)
+        self.assertEqual(self.index.wives[2], 6)
+        self.assertEqual(self.index.children_numbers[0], (0, 6))
+
+    def test_links_to_missing_individuals_get_numbers(self):
+        self.families[2].wife_ID = "@<US20>I99@"
+        index = GenealogyIndex(self.individuals, self.families)
+        missing = index.individual_xrefs.get("@<US20>I99@")
+        self.assertEqual(missing, len(self.individuals))
+        self.assertIsNone(index.individuals_by_number[missing])
+        self.assertEqual(index.spouse_rows[missing], [2])
+
+    def test_share_birth_family(self):
+        self.assertTrue(self.index.share_birth_family(self.individuals[1], self.individuals[5]))
+        self.assertFalse(self.index.share_birth_family(self.individuals[0], self.individuals[5]))
+
+    def test_children_and_spouses_by_family(self):
+        self.assertEqual(self.index.children_by_family[self.families[0]],
+                         [self.individuals[0], self.individuals[6]])
+        self.assertEqual(self.index.spouses_by_family[self.families[1]],
+                         [self.individuals[3], self.individuals[4]])
+        self.assertEqual(self.index.children_by_family[self.families[2]], [])
+
+    def test_relatives(self):
+        self.assertEqual(self.index.children(self.individuals[1]), [self.individuals[0], self.individuals[6]])
+        self.assertEqual(self.index.siblings(self.individuals[5]), [self.individuals[1], self.individuals[5]])
+        self.assertEqual(self.index.spouses(self.individuals[6]), [self.individuals[5]])
+        self.assertEqual(self.index.children(self.individuals[0]), [])
+
+    def test_relatives_across_families(self):
+        # Me is a husband in two families and only the second one has a child
+        individuals, families = parse("../testfiles/US11_test.ged")
+        me = individuals[2]
+        self.assertEqual(Utils.get_children(me, individuals, families), [individuals[9]])
+        self.assertEqual(Utils.get_spouses(me, individuals, families), [individuals[5], individuals[4]])
+        # Me and Widower are both children of F1
+        self.assertEqual(Utils.get_siblings(me, individuals, families), [individuals[2], individuals[6]])
+
+    def test_missing_spouse(self):
+        self.families[2].wife_ID = "@<US20>I99@"
+        index = GenealogyIndex(self.individuals, self.families)
+        self.assertIsNone(index.wife(self.families[2]))
+        self.assertEqual(index.spouses_by_family[self.families[2]], [self.individuals[5]])
+
+    def test_duplicate_family_IDs_stay_separate(self):
+        individuals, families = parse("../testfiles/US22_test.ged")
+        index = GenealogyIndex(individuals, families)
+        self.assertIs(index.families_by_ID[families[1].ID], families[1])
+        self.assertEqual(len(index.children_by_family), len(families))
+
+    def test_replace(self):
+        # the uncle is a child in F2 and a husband in F3
+        uncle = copy.copy(self.individuals[5])
+        self.index.replace(self.individuals[5], uncle)
+        self.assertIs(self.index.individuals_by_ID["@<US20>I6@"], uncle)
+        self.assertIs(self.index.husband(self.families[2]), uncle)
+        self.assertEqual(self.index.siblings(uncle), [self.individuals[1], uncle])
+        self.assertEqual(self.index.spouses(self.individuals[6]), [uncle])
+
+        family = copy.copy(self.families[2])
+        self.index.replace(self.families[2], family)
+        self.assertIs(self.index.families_by_ID["@<US20>F3@"], family)
+        self.assertIs(self.index.families[2], family)
+        self.assertIs(self.index.husband(family), uncle)
+        self.assertEqual(self.index.spouses_by_family[family], [uncle, self.individuals[6]])
+        self.assertNotIn(self.families[2], self.index.children_by_family)
+
+    def test_checks_accept_shared_index(self):
+        self.assertEqual(Checks.aunts_and_uncles(self.individuals, self.families, self.index),
+                         Checks.aunts_and_uncles(self.individuals, self.families))
+        self.assertEqual(Checks.list_living_married(self.individuals, self.families, self.index),
+                         Checks.list_living_married(self.individuals, self.families))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import os
+import tempfile
+from Parser import parse, iter_records, map_records, tokenize
+from Family import Family
+from Individual import Individual
+from Utils import parse_line
+
+
+class TestParser(unittest.TestCase):
+
+    def setUp(self):
+        self.path = "../testfiles/Parser_test.ged"
+
+    def test_tokenize_skips_blank_lines(self):
+        tokens = list(tokenize(self.path))
+        self.assertEqual(tokens[0], ("0", "HEAD", "", "Y"))
+        self.assertEqual(len(tokens), 32)
+
+    def test_iter_records_is_lazy(self):
+        records = iter_records(self.path)
+        tag, tokens = next(records)
+        self.assertEqual(tag, "INDI")
+        self.assertEqual(tokens[0], ("0", "INDI", "@<P>I1@", "Y"))
+        self.assertEqual(len(tokens), 6)
+
+    def test_iter_records_stop_at_level_0(self):
+        records = list(iter_records(self.path))
+        self.assertEqual([tag for tag, tokens in records], ["INDI", "FAM", "INDI", "INDI"])
+        # the NOTE record's NAME must not leak into the family before it
+        self.assertNotIn("NAME", [token[1] for token in records[1][1]])
+
+    def test_parse(self):
+        individuals, families = parse(self.path)
+        self.assertEqual([indi.ID for indi in individuals], ["@<P>I1@", "@<P>I2@", "@<P>I3@"])
+        self.assertEqual(individuals[2].death, "4 APR 2010")
+        self.assertEqual(individuals[2].alive, False)
+        self.assertEqual(len(families), 1)
+        self.assertEqual(families[0].children, ("@<P>I3@",))
+        self.assertEqual(families[0].husband_name, "Dad /P/")
+        self.assertEqual(families[0].wife_name, "Mom /P/")
+
+    def test_parse_exposes_ID_index(self):
+        result = parse(self.path)
+        self.assertIs(result.individuals_by_ID["@<P>I2@"], result.individuals[1])
+        self.assertEqual(len(result.individuals_by_ID), 3)
+        self.assertNotIn("@<P>F1@", result.individuals_by_ID)
+
+    def test_ID_index_keeps_first_duplicate(self):
+        result = parse("../testfiles/US22_test.ged")
+        self.assertIs(result.individuals_by_ID["@<US22>I2@"], result.individuals[0])
+
+    def test_constructor_matches_tokens(self):
+        lines = ["0 @<P>I9@ INDI", "1 NAME Solo /P/", "1 SEX F", "1 BIRT", "2 DATE 5 MAY 1990"]
+        indi = Individual(lines)
+        same = Individual.from_tokens([parse_line(line) for line in lines])
+        self.assertEqual(str(indi), str(same))
+
+    def build(self, records):
+        # the objects as the parser builds them, or the error that keeps a record from being parsed
+        built = []
+        for tag, tokens in records:
+            try:
+                built.append(str(Individual.from_tokens(tokens) if tag == "INDI" else Family.from_tokens(tokens)))
+            except ValueError as e:
+                built.append(str(e))
+        return built
+
+    def test_map_records_matches_iter_records(self):
+        for name in ["Parser_test.ged", "sprint4.ged"]:
+            path = "../testfiles/" + name
+            self.assertEqual([tag for tag, tokens in map_records(path)], [tag for tag, tokens in iter_records(path)])
+            self.assertEqual(self.build(map_records(path)), self.build(iter_records(path)))
+
+    def test_map_records_keeps_tags_at_other_levels(self):
+        # the objects read these tags whatever level they are at, like the lines after the events
+        lines = ["0 HEAD", "0 @I1@ INDI", "1 NAME Odd /Levels/", "1 BIRT", "2 DATE 1 JAN 1990", "2 FAMC @F9@",
+                 "3 FAMS @F8@", "1 SEX F", "0 @F9@ FAM", "2 HUSB @I2@", "1 WIFE @I1@", "1 MARR", "2 DATE 1 JUN 1980",
+                 "3 CHIL @I1@", "1 CHIL @I3@", "0 TRLR"]
+        with tempfile.NamedTemporaryFile("w", suffix=".ged", delete=False) as file:
+            file.write("\n".join(lines) + "\n")
+            path = file.name
+        try:
+            records = self.build(map_records(path))
+            self.assertEqual(records, self.build(iter_records(path)))
+            self.assertIn("Child: ['@F9@']", records[0])
+            self.assertIn("Spouse: ['@F8@']", records[0])
+            self.assertIn("Husband ID: @I2@", records[1])
+            self.assertIn("Children: ['@I1@', '@I3@']", records[1])
+        finally:
+            os.remove(path)
+
+    def test_map_records_empty_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".ged", delete=False) as file:
+            path = file.name
+        try:
+            self.assertEqual(list(map_records(path)), [])
+        finally:
+            os.remove(path)
+
+    def test_map_records_byte_range(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        # starting in the middle of a record skips to the next level 0 line and a record
+        # starting at end belongs to the next range
+        records = list(map_records(self.path, start=data.index(b"@<P>I1@"), end=data.index(b"0 @<P>I2@")))
+        self.assertEqual([tag for tag, tokens in records], ["FAM"])
+        self.assertEqual(records[0][1][-1], ("2", "DATE", "1 JUN 1975", "Y"))
+
+    def test_map_records_ranges_split_the_file(self):
+        path = "../testfiles/sprint4.ged"
+        size = os.path.getsize(path)
+        whole = list(map_records(path))
+        for pieces in [2, 3, 7, 50]:
+            bounds = [size * k // pieces for k in range(pieces + 1)]
+            split = []
+            for k in range(pieces):
+                split.extend(map_records(path, bounds[k], bounds[k + 1]))
+            self.assertEqual(split, whole)
+
+    def test_parse_in_workers_matches_one_process(self):
+        path = "../testfiles/sprint4.ged"
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            expected = parse(path)
+        for workers in [2, 3]:
+            worker_output = io.StringIO()
+            with contextlib.redirect_stdout(worker_output):
+                result = parse(path, workers=workers)
+            self.assertEqual([str(indi) for indi in result.individuals],
+                             [str(indi) for indi in expected.individuals])
+            self.assertEqual([(str(fam), fam.husband_name, fam.wife_name) for fam in result.families],
+                             [(str(fam), fam.husband_name, fam.wife_name) for fam in expected.families])
+            self.assertIs(result.individuals_by_ID["@I1@"], result.individuals[0])
+            # parse errors come out in file order
+            self.assertEqual(worker_output.getvalue(), output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
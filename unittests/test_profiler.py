@@ -0,0 +1,96 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import json
+import os
+import tempfile
+import tracemalloc
+import main
+import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_stages(self):
+        profiler = Profiler.Profiler()
+        try:
+            with profiler.stage("outer"):
+                with profiler.stage("inner"):
+                    data = [0] * 200000
+                del data
+            with profiler.stage("inner"):
+                pass
+        finally:
+            profiler.close()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(list(profiler.stages), ["inner", "outer"])
+        inner, outer = profiler.stages["inner"], profiler.stages["outer"]
+        self.assertEqual(inner.calls, 2)
+        self.assertEqual(outer.calls, 1)
+        # the list allocated by the inner stage counts towards the outer stage's peak too
+        self.assertGreaterEqual(inner.peak, 200000 * 8)
+        self.assertGreaterEqual(outer.peak, inner.peak)
+        self.assertGreaterEqual(outer.wall, profiler.stages["inner"].wall / 2)
+
+    def test_items(self):
+        profiler = Profiler.Profiler(memory=False)
+        items = list(profiler.items([("US01", 1), ("US02", 2), ("US01", 3)], lambda item: item[0]))
+        self.assertEqual(items, [("US01", 1), ("US02", 2), ("US01", 3)])
+        self.assertEqual(profiler.stages["US01"].calls, 2)
+        self.assertIsNone(profiler.stages["US02"].peak)
+        self.assertEqual(profiler._running, [])
+
+    def test_summary(self):
+        profiler = Profiler.Profiler(memory=False)
+        with profiler.stage("fast"):
+            pass
+        with profiler.stage("slow"):
+            sum(range(100000))
+        self.assertEqual([stage.name for stage in profiler.summary()], ["slow", "fast"])
+
+        output = io.StringIO()
+        profiler.print_summary(output)
+        self.assertIn("| slow |", output.getvalue().replace("  ", " ").replace("  ", " "))
+        self.assertIn("Total:", output.getvalue())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            profiler.write_json(path)
+            with open(path) as file:
+                profile = json.load(file)
+        self.assertFalse(profile["memory_traced"])
+        self.assertEqual([stage["stage"] for stage in profile["stages"]], ["slow", "fast"])
+
+    def test_disabled(self):
+        disabled = Profiler.DISABLED
+        self.assertIs(disabled.stage("a"), disabled.stage("b"))
+        items = [1, 2]
+        self.assertIs(disabled.items(items, str), items)
+        with disabled.stage("a"):
+            pass
+
+    def test_main(self):
+        output = io.StringIO()
+        errors = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            main.main(["../testfiles/sprint4.ged", "--profile"])
+        plain = io.StringIO()
+        with contextlib.redirect_stdout(plain):
+            main.main(["../testfiles/sprint4.ged"])
+
+        # the usual output is left as it is
+        self.assertEqual(output.getvalue(), plain.getvalue())
+        self.assertIn("Profile", errors.getvalue())
+        for stage in ["parse records", "build index", "print tables", "print results", "US01", "US38"]:
+            self.assertIn(" " + stage + " ", errors.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
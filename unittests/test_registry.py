@@ -0,0 +1,72 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+from Parser import parse
+from Index import GenealogyIndex
+import Checks
+import Registry
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        individuals, families = parse("../testfiles/US11_test.ged")
+        self.individuals = individuals
+        self.families = families
+
+    def test_every_check_registered_once(self):
+        stories = [spec.story for spec in Registry.CHECKS]
+        self.assertEqual(len(stories), len(set(stories)))
+        self.assertEqual(stories[:3], ["US27", "US22", "US04"])
+        self.assertIn(Checks.no_bigamy, [spec.function for spec in Registry.CHECKS])
+
+    def test_spec_details(self):
+        spec = Registry.get_checks(only=["US11"])[0]
+        self.assertEqual(spec.header(), "User Story 11: No bigamy")
+        self.assertEqual(spec.inputs, Registry.BOTH)
+        self.assertEqual(spec.cost, Registry.LOG_LINEAR)
+        self.assertEqual(spec.takes_index, True)
+        self.assertEqual(Registry.get_checks(only=["US15"])[0].takes_index, False)
+
+    def test_get_checks_only_and_skip(self):
+        specs = Registry.get_checks(only=["us13", "11", "US20"], skip=["US20"])
+        self.assertEqual([spec.story for spec in specs], ["US11", "US13"])
+        specs = Registry.get_checks(skip=["US20"])
+        self.assertEqual(len(specs), len(Registry.CHECKS) - 1)
+        self.assertEqual(len(Registry.get_checks(only=["7"])), 1)
+
+    def test_get_checks_unknown_story(self):
+        with self.assertRaises(ValueError):
+            Registry.get_checks(only=["US99"])
+        with self.assertRaises(ValueError):
+            Registry.get_checks(skip=["bigamy"])
+
+    def test_run_checks_matches_direct_calls(self):
+        index = GenealogyIndex(self.individuals, self.families)
+        specs = Registry.get_checks(only=["US11", "US15", "US29"])
+        results = list(Registry.run_checks(specs, self.individuals, self.families, index))
+        self.assertEqual([spec.story for spec, result in results], ["US11", "US15", "US29"])
+        self.assertEqual(results[0][1], Checks.no_bigamy(self.individuals, self.families))
+        self.assertEqual(results[1][1], Checks.fewer_than_15_siblings(self.families))
+        self.assertEqual(results[2][1], Checks.list_deceased(self.individuals))
+
+    def test_run_checks_in_parallel(self):
+        index = GenealogyIndex(self.individuals, self.families)
+        specs = Registry.get_checks()
+        serial = list(Registry.run_checks(specs, self.individuals, self.families, index))
+        parallel = list(Registry.run_checks(specs, self.individuals, self.families, index, jobs=4))
+        self.assertEqual([spec.story for spec, result in parallel], [spec.story for spec in specs])
+        self.assertEqual(parallel, serial)
+        self.assertEqual(Registry._tree, None)
+
+    def test_print_age(self):
+        self.assertEqual(Checks.print_age(self.individuals), (True, str(self.individuals[0]) + "\n"))
+        self.assertEqual(Checks.print_age([]), (True, ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import json
+import os
+import tempfile
+import main
+import Registry
+import Report
+from Family import Family
+from Individual import Individual
+from Results import Finding, CheckResult, Group, ERROR
+
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        self.indi = Individual(["0 @I1@ INDI", "1 NAME Dan /Salerno/", "1 BIRT", "2 DATE 12 JUL 1996",
+                                "1 DEAT Y", "2 DATE 1 JAN 1990"])
+        self.fam = Family(["0 @F1@ FAM", "1 HUSB @I1@", "1 MARR", "2 DATE 1 JUN 1975"])
+
+    def test_dates_the_check_reads(self):
+        finding = Finding("US03", ERROR, "Error: {0} has a death date before their birthday.\n", self.indi)
+        dates = Report.finding_dates(finding, frozenset(["individual.birthday", "individual.death"]))
+        self.assertEqual(dates, [
+            {"record": "@I1@", "field": "birthday", "text": "12 JUL 1996", "date": "1996-07-12"},
+            {"record": "@I1@", "field": "death", "text": "1 JAN 1990", "date": "1990-01-01"}])
+        self.assertEqual(Report.finding_dates(finding, frozenset(["individual.alive"])), [])
+
+    def test_every_date_when_reads_unknown(self):
+        finding = Finding("US99", ERROR, "{0} {1} {2}\n", Group([self.indi]), self.fam, "plain")
+        dates = Report.finding_dates(finding)
+        self.assertEqual([(date["record"], date["field"]) for date in dates],
+                         [("@I1@", "birthday"), ("@I1@", "death"), ("@F1@", "married")])
+
+    def test_writer(self):
+        spec = Registry.CheckSpec("US03", "Birth before Death", lambda individuals: None,
+                                  Registry.INDIVIDUALS, Registry.LINEAR, ["individual.death"])
+        result = CheckResult("US03", [Finding("US03", ERROR, "Error: {0.ID} is wrong\n", self.indi)])
+        output = io.StringIO()
+        writer = Report.ReportWriter(output)
+        writer.write(spec, result)
+        writer.write(spec, CheckResult("US03", [], "fine\n"))
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(writer.lines, 3)
+        self.assertEqual(lines[0], {"type": "finding", "story": "US03", "severity": "error", "records": ["@I1@"],
+                                    "dates": [{"record": "@I1@", "field": "death", "text": "1 JAN 1990",
+                                               "date": "1990-01-01"}],
+                                    "message": "Error: @I1@ is wrong"})
+        self.assertEqual(lines[1], {"type": "check", "story": "US03", "title": "Birth before Death",
+                                    "ok": False, "findings": 1})
+        self.assertTrue(lines[2]["ok"])
+
+    def test_report_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.ndjson")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                main.main(["../testfiles/sprint4.ged", "--report", path])
+            with open(path, encoding="utf-8") as file:
+                lines = [json.loads(line) for line in file]
+
+        checks = [line for line in lines if line["type"] == "check"]
+        self.assertEqual([line["story"] for line in checks], [spec.story for spec in Registry.CHECKS])
+        findings = [line for line in lines if line["type"] == "finding"]
+        self.assertEqual(len(findings), sum(line["findings"] for line in checks))
+        # the usual output is still printed
+        self.assertIn("User Story 04: Marriage Before Divorce", output.getvalue())
+        self.assertIn({"type": "finding", "story": "US04", "severity": "error", "records": ["@F4@"],
+                       "dates": [{"record": "@F4@", "field": "married", "text": "1 JUN 1975", "date": "1975-06-01"},
+                                 {"record": "@F4@", "field": "divorced", "text": "1 JUN 1974", "date": "1974-06-01"}],
+                       "message": findings[[line["story"] for line in findings].index("US04")]["message"]},
+                      findings)
+
+    def test_report_path_not_writable(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "missing", "report.ndjson")
+            output = io.StringIO()
+            errors = io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+                with self.assertRaises(SystemExit) as raised:
+                    main.main(["../testfiles/sprint4.ged", "--report", path])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("--report: ", errors.getvalue())
+        # it stops before the file is parsed or any check is run
+        self.assertEqual(output.getvalue(), "")
+
+    def test_report_on_standard_output(self):
+        output = io.StringIO()
+        errors = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            main.main(["../testfiles/sprint4.ged", "--report", "-", "--only", "US03"])
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["finding", "check"])
+        self.assertIn("will not be parsed", errors.getvalue())
+        self.assertIn("User Story 03", errors.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+from Parser import parse
+from Results import CheckResult, Finding, Group, ERROR, INFO
+import Checks
+
+
+class Unprintable(object):
+    """A record that fails the test if anything tries to render it"""
+
+    ID = "@U1@"
+
+    def __str__(self):
+        raise AssertionError("rendered a finding that was never output")
+
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        individuals, families = parse("../testfiles/US11_test.ged")
+        self.individuals = individuals
+        self.families = families
+
+    def test_finding_render(self):
+        finding = Finding("US12", ERROR, "Error: Father {0.ID} is too old for child {1.ID}\n",
+                          self.individuals[0], self.individuals[1])
+        self.assertEqual(finding.render(), "Error: Father " + self.individuals[0].ID +
+                         " is too old for child " + self.individuals[1].ID + "\n")
+        self.assertEqual(finding.record_IDs, [self.individuals[0].ID, self.individuals[1].ID])
+
+    def test_group(self):
+        group = Group(self.individuals[:2], " and ")
+        finding = Finding("US23", ERROR, "{0}\n", group)
+        self.assertEqual(finding.render(), str(self.individuals[0]) + " and " + str(self.individuals[1]) + "\n")
+        self.assertEqual(finding.record_IDs, [self.individuals[0].ID, self.individuals[1].ID])
+
+    def test_result_is_lazy(self):
+        result = CheckResult("US29", [Finding("US29", INFO, "{0}\n", Unprintable())], "No deceased individuals\n")
+        self.assertEqual(result.ok, False)
+        self.assertEqual(result.findings[0].record_IDs, ["@U1@"])
+        with self.assertRaises(AssertionError):
+            result.render()
+
+    def test_result_unpacks_like_a_tuple(self):
+        result = CheckResult("US04", [], "All families are married before they are divorced\n")
+        flag, output = result
+        self.assertEqual(flag, True)
+        self.assertEqual(output, "All families are married before they are divorced\n")
+        self.assertEqual(result, (True, "All families are married before they are divorced\n"))
+        self.assertEqual(result[0], True)
+        self.assertEqual(len(result), 2)
+
+    def test_passed_message_only_when_ok(self):
+        finding = Finding("US28", INFO, "Printing family: {0.ID}\n", self.families[0])
+        self.assertEqual(CheckResult("US28", [finding], "None\n", True).render(),
+                         "Printing family: " + self.families[0].ID + "\nNone\n")
+        self.assertEqual(CheckResult("US28", [finding], "None\n").render(),
+                         "Printing family: " + self.families[0].ID + "\n")
+
+    def test_check_returns_findings(self):
+        result = Checks.no_bigamy(self.individuals, self.families)
+        self.assertEqual(result.ok, False)
+        self.assertEqual(result.story, "US11")
+        self.assertEqual([finding.severity for finding in result.findings], [ERROR] * len(result.findings))
+        self.assertEqual(result.render(), "".join(finding.render() for finding in result.findings))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import pickle
+from Parser import parse
+from Utils import pretty_print
+
+
+class TestSlots(unittest.TestCase):
+
+    def setUp(self):
+        individuals, families = parse("../testfiles/sprint4.ged")
+        self.individuals = individuals
+        self.families = families
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.individuals[0], "__dict__"))
+        self.assertFalse(hasattr(self.families[0], "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.individuals[0].birth = "29 SEP 1996"
+
+    def test_individual_attributes(self):
+        indi = self.individuals[0]
+        for attribute in ["ID", "name", "gender", "birthday", "birth_ordinal", "age", "alive",
+                          "death", "death_ordinal", "child", "spouse"]:
+            self.assertTrue(hasattr(indi, attribute), attribute)
+
+        # the checks and tests set these directly
+        indi.birthday = "1 JAN 2000"
+        self.assertEqual(indi.birthday, "1 JAN 2000")
+        self.assertEqual(indi.birth_ordinal, 730120)
+        indi.death = None
+        self.assertEqual(indi.death_ordinal, None)
+        indi.age = 7
+        indi.alive = False
+        indi.gender = "F"
+        indi.spouse = []
+        self.assertEqual(len(indi.spouse), 0)
+
+    def test_family_attributes(self):
+        fam = self.families[0]
+        for attribute in ["ID", "married", "married_ordinal", "divorced", "divorced_ordinal", "husband_ID",
+                          "husband_name", "wife_ID", "wife_name", "children"]:
+            self.assertTrue(hasattr(fam, attribute), attribute)
+        fam.divorced = "1 JAN 2000"
+        self.assertEqual(fam.divorced_ordinal, 730120)
+        fam.children = fam.children[:1]
+        self.assertEqual(len(fam.children), 1)
+
+    def test_links_are_shared_tuples(self):
+        fam = self.families[0]
+        self.assertIsInstance(fam.children, tuple)
+        child = next(indi for indi in self.individuals if fam.ID in indi.child)
+        self.assertIsInstance(child.child, tuple)
+        self.assertIs(child.child[child.child.index(fam.ID)], fam.ID)
+
+    def test_links_print_as_lists(self):
+        fam = self.families[0]
+        self.assertIn("| Children: " + str(list(fam.children)) + "}", str(fam))
+        self.assertIn("| Child: " + str(list(self.individuals[0].child)), str(self.individuals[0]))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            pretty_print(self.individuals, self.families)
+        self.assertIn(str(list(fam.children)), output.getvalue())
+        self.assertNotIn("('", output.getvalue())
+
+    def test_pickle(self):
+        copied = pickle.loads(pickle.dumps((self.individuals, self.families)))
+        self.assertEqual(str(copied[0][0]), str(self.individuals[0]))
+        self.assertEqual(str(copied[1][0]), str(self.families[0]))
+        self.assertEqual(copied[0][0].birth_ordinal, self.individuals[0].birth_ordinal)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+# this stuff is necessary because of how annoying it is to use relative imports. Instead
+# of setting all that up just include the path to the src directory here then
+# import things like normal
+import sys
+sys.path.append("../src")
+
+import io
+import contextlib
+import main
+import Table
+from Parser import parse
+from Utils import pretty_print, INDIVIDUAL_FIELDS, individual_row
+
+try:
+    from prettytable import PrettyTable
+except ImportError:
+    PrettyTable = None
+
+
+class TestTable(unittest.TestCase):
+
+    def write(self, field_names, rows, limit=None):
+        output = io.StringIO()
+        shown = Table.write_table(field_names, rows, lambda row: row, limit, output)
+        return shown, output.getvalue()
+
+    def test_layout(self):
+        shown, text = self.write(["ID", "Name"], [["I1", "Dan"], ["I22", "Jo"]])
+        self.assertEqual(shown, 2)
+        self.assertEqual(text,
+                         "+-----+------+\n"
+                         "|  ID | Name |\n"
+                         "+-----+------+\n"
+                         "|  I1 | Dan  |\n"
+                         "| I22 |  Jo  |\n"
+                         "+-----+------+\n")
+
+    def test_empty_table(self):
+        shown, text = self.write(["ID", "Name"], [])
+        self.assertEqual(shown, 0)
+        self.assertEqual(text, "+----+------+\n| ID | Name |\n+----+------+\n+----+------+\n")
+
+    def test_limit_sizes_columns_to_shown_rows(self):
+        shown, text = self.write(["ID"], [["I1"], ["I2"], ["a much longer ID"]], limit=2)
+        self.assertEqual(shown, 2)
+        self.assertEqual(text, "+----+\n| ID |\n+----+\n| I1 |\n| I2 |\n+----+\n")
+
+    def test_rows_are_written_in_batches(self):
+        rows = [["I" + str(k)] for k in range(Table.BATCH_SIZE * 2 + 5)]
+        shown, text = self.write(["ID"], rows)
+        self.assertEqual(shown, len(rows))
+        self.assertEqual(text.count("\n"), len(rows) + 4)
+
+    @unittest.skipIf(Table.wcswidth is None, "wcwidth is not installed")
+    def test_wide_characters(self):
+        shown, text = self.write(["Name"], [["张伟"], ["Dan"]])
+        self.assertEqual(text.splitlines()[3], "| 张伟 |")
+        self.assertEqual(text.splitlines()[4], "| Dan  |")
+
+    @unittest.skipIf(PrettyTable is None, "prettytable is not installed")
+    def test_same_as_prettytable(self):
+        rows = [["I1", "Dan /Salerno/", "M"], ["I10", "Élodie /Roux/", "F"],
+                ["I100", "", "None"], ["I1000", "Al", "F"]]
+        for limit in [None, 0, 2]:
+            expected = PrettyTable()
+            expected.field_names = ["ID", "Name", "Gender"]
+            for row in rows[:limit]:
+                expected.add_row(row)
+            self.assertEqual(self.write(["ID", "Name", "Gender"], rows, limit)[1], str(expected) + "\n")
+
+    @unittest.skipIf(PrettyTable is None, "prettytable is not installed")
+    def test_pretty_print_same_as_prettytable(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            individuals, families = parse("../testfiles/sprint4.ged")
+        expected = PrettyTable()
+        expected.field_names = INDIVIDUAL_FIELDS
+        for indi in individuals:
+            expected.add_row(individual_row(indi))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            pretty_print(individuals, families)
+        self.assertIn(str(expected) + "\n", output.getvalue())
+
+    def test_pretty_print_limit(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            individuals, families = parse("../testfiles/sprint4.ged")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            pretty_print(individuals, families, 1)
+        self.assertIn("... " + str(len(individuals) - 1) + " more individuals not shown", output.getvalue())
+        self.assertIn("... " + str(len(families) - 1) + " more families not shown", output.getvalue())
+        self.assertNotIn(individuals[1].ID, output.getvalue().split("Families")[0])
+
+    def test_no_tables(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main.main(["../testfiles/sprint4.ged", "--no-tables", "--only", "US23"])
+        self.assertNotIn("Individuals===", output.getvalue())
+        self.assertIn("Error/Anomaly Checks", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ import unittest
 import sys
 sys.path.append("../src")
 
+import datetime
 from Parser import parse
 import Checks
 
@@ -84,8 +85,9 @@ class TestUS01(unittest.TestCase):
         self.individuals[6].death = "17 JAN 2015"
         self.families[1].married = "1 JAN 1960"
         self.families[0].divorced = "31 DEC 1979"
+        # the birth in 2022 is only in the future before then
         result, output = Checks.dates_before_current_date(
-            self.individuals, self.families)
+            self.individuals, self.families, as_of=datetime.date(2019, 3, 1).toordinal())
         self.assertEqual(result, False)
         self.assertEqual(
             output, "Error: " + str(self.individuals[0]) + " has a birth after current date.\n")
@@ -35,7 +35,7 @@ class TestUS07(unittest.TestCase):
         self.assertEqual(result, False)
         self.assertEqual(
             output, "Error: " + str(self.individuals[0].ID) + " is more than 150 years old.\n")
-        self.individuals[0].birth = "29 SEP 1996"
+        self.individuals[0].birthday = "29 SEP 1996"
         self.individuals[0].age = Utils.calculate_age(self.individuals[0].birthday)
 
 
@@ -70,6 +70,23 @@ class TestUS11(unittest.TestCase):
         # put things back
         self.families[3].divorced = x
 
+    def test_no_bigamy_families_out_of_order(self):
+        # the second marriage is listed first, errors still come out in family order
+        self.families.reverse()
+        result, output = Checks.no_bigamy(self.individuals, self.families)
+        self.assertEqual(result, False)
+        self.assertEqual(output, "Error: " + str(
+            self.individuals[1]) + " is/was married to multiple people at the same time\n")
+        self.families.reverse()
+
+    def test_no_bigamy_three_marriages(self):
+        # marry the cheater a third time while both earlier marriages are still going
+        self.families[3].wife_ID = self.families[0].wife_ID
+        self.families[3].divorced = None
+        result, output = Checks.no_bigamy(self.individuals, self.families)
+        self.assertEqual(result, False)
+        self.assertEqual(output.count(str(self.individuals[1])), 3)
+
     def test_no_bigamy_empty_inputs(self):
         # set up scenario
         self.families = []
@@ -8,6 +8,7 @@ sys.path.append("../src")
 from Parser import parse
 import Checks
 import Utils
+from Family import Family
 
 
 class TestUS20(unittest.TestCase):
@@ -38,6 +39,15 @@ class TestUS20(unittest.TestCase):
         self.individuals[5] = x
         self.families.append(z)
 
+    def test_aunts_and_uncles_second_family(self):
+        # Dad is also a child in another family listed first, the uncle is still found
+        self.families.insert(0, Family(["0 @<US20>F4@ FAM", "1 HUSB @<US20>I4@", "1 WIFE @<US20>I5@",
+                                        "1 CHIL @<US20>I2@", "1 MARR", "2 DATE 1 JAN 1949"]))
+        flag, output = Checks.aunts_and_uncles(self.individuals, self.families)
+        self.assertEqual(flag, False)
+        self.assertEqual(output, "Error: " + str(self.individuals[5]) + " is married to their niece or nephew.\n")
+        self.families.pop(0)
+
     def test_aunts_and_uncles_empty_input(self):
         flag, output = Checks.aunts_and_uncles([],[])
         self.assertEqual(flag, True)
@@ -5,9 +5,13 @@ import unittest
 import sys
 sys.path.append("../src")
 
+import datetime
 from Parser import parse
 from Utils import calculate_age
 
+# since this is time dependent the ages are measured at a fixed date
+AS_OF = datetime.date(2019, 3, 1).toordinal()
+
 
 class TestUS27(unittest.TestCase):
     # make sure to name the class Test<US#>
@@ -16,16 +20,17 @@ class TestUS27(unittest.TestCase):
     # data structures I need
     def setUp(self):
         individuals, families = parse(
-            "../testfiles/Dan_Salerno_Project_01.ged")
+            "../testfiles/Dan_Salerno_Project_01.ged", as_of=AS_OF)
 
         self.individuals = individuals
         self.families = families
-        # since this is time dependent I'm hard coding my age here to compare to
+        # my age on AS_OF
         self.dans_age = 22
 
     # all tests need to be named test_<name_of_function>
     def test_age_calculation(self):
-        self.assertEqual(calculate_age("12 JUL 1996"), self.dans_age)
+        self.assertEqual(calculate_age("12 JUL 1996", AS_OF), self.dans_age)
+        self.assertEqual(calculate_age("12 JUL 1996", datetime.date(2019, 7, 12).toordinal()), 23)
 
     def test_age_print(self):
         # the age field should be set correctly in the printout of an individual